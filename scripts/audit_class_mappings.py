@@ -6,11 +6,18 @@ Treat output as advisory, not authoritative.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
-from typing import Mapping, MutableMapping, Sequence
+from typing import Mapping, MutableMapping, Optional, Sequence
+
+from treebot.services.transform.infer_class import CLASS_RULES
 
 # Canonicalize class synonyms
 CANON: Mapping[str, str] = {
@@ -19,40 +26,38 @@ CANON: Mapping[str, str] = {
     "organosiloxane": "siloxane",
 }
 
-# Ordered rules: more specific patterns first
+# Rules come from the runtime rule table (src/treebot/services/transform/infer_class.py),
+# which also compiles each rule's primary class into a suffix trie + keyword scan.
+# Here every rule contributes its full set of acceptable classes: keywords match
+# anywhere in the name, suffixes match the end of the whole name.
 # Each rule: (regex, set of acceptable classes)
 RULES: Sequence[tuple[re.Pattern[str], set[str]]] = [
-    (re.compile(r"thiol$", re.I), {"thiol"}),
-    (re.compile(r"\boic acid\b", re.I), {"organic.acid"}),
-    (re.compile(r"\bacid\b", re.I), {"organic.acid"}),  # after oic acid
-    (re.compile(r"al$", re.I), {"aldehyde"}),
-    (re.compile(r"one$", re.I), {"ketone", "monoterpenoid"}),
-    (re.compile(r"ol$", re.I), {"alcohol", "monoterpenoid"}),  # after thiol$
-    (re.compile(r"yne$", re.I), {"alkyne"}),
-    (
-        re.compile(r"ene$", re.I),
-        {"alkene", "monoterpene", "sesquiterpene", "terpene", "aromatic", "monoterpenoid"},
-    ),
     (
-        re.compile(r"ane$", re.I),
-        {
-            "alkane",
-            "monoterpene",
-            "sesquiterpene",
-            "organosilicon",
-            "siloxane",
-            "epoxide",
-            "halogen",
-        },
-    ),
-    (re.compile(r"siloxane", re.I), {"siloxane"}),
-    (re.compile(r"pinene", re.I), {"monoterpene"}),
-    (re.compile(r"caryophyllene", re.I), {"sesquiterpene"}),
-    (re.compile(r"\b(fluoro|chloro|bromo|iodo)", re.I), {"halogen"}),
-    (re.compile(r"benzene", re.I), {"aromatic", "halogen", "monoterpenoid"}),
+        re.compile(rule.pattern if rule.kind == "keyword" else f"{re.escape(rule.pattern)}$", re.I),
+        set(rule.classes),
+    )
+    for rule in CLASS_RULES
 ]
 
 
+def _rules_version() -> str:
+    """Fingerprint of RULES + CANON; any rule edit invalidates cached results."""
+    h = hashlib.sha256()
+    for rx, classes in RULES:
+        h.update(f"{rx.pattern}\0{rx.flags}\0{sorted(classes)}\n".encode())
+    for k, v in sorted(CANON.items()):
+        h.update(f"canon\0{k}\0{v}\n".encode())
+    return h.hexdigest()[:16]
+
+
+RULES_VERSION = _rules_version()
+
+_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE = _ROOT / "runs" / ".cache" / "class_audit.json"
+# Below this many entries to (re)check, a process pool costs more than it saves
+_PARALLEL_MIN = 2000
+
+
 def load_mappings() -> Mapping[str, str]:
     """Load class mappings from classes.yaml."""
     p = Path(__file__).resolve().parent.parent / "configs" / "classes.yaml"
@@ -86,7 +91,118 @@ def expected_classes(name: str) -> set[str]:
     return out
 
 
-def audit_mappings() -> None:
+def entry_hash(compound: str, cls: str) -> str:
+    """Cache key of one audited entry: (key, class, rules version)."""
+    return hashlib.sha256(f"{compound}\0{cls}\0{RULES_VERSION}".encode()).hexdigest()
+
+
+def audit_entry(compound: str, cls: str) -> Optional[str]:
+    """Return the heuristic issue for one entry, or None if it looks fine."""
+    exp = expected_classes(compound.strip().lower())
+    if not exp or cls in exp:
+        return None  # no heuristic applies, or class is acceptable
+    return f"heuristics suggest {sorted(exp)}"
+
+
+def _audit_chunk(chunk: Sequence[tuple[str, str]]) -> list[Optional[str]]:
+    return [audit_entry(compound, cls) for compound, cls in chunk]
+
+
+def _load_cache(path: Path) -> MutableMapping[str, dict[str, Optional[str]]]:
+    """Previous audit entries, whatever rules version produced them.
+
+    Entry keys include the rules version, so entries from older rules are
+    never reused as results; they still describe the previous audit for the diff.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries", {}) if isinstance(data, dict) else {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def audit_incremental(
+    mappings: Mapping[str, str],
+    cache_path: Path,
+    workers: int,
+    full: bool = False,
+) -> tuple[list[tuple[str, str, str]], dict[str, object]]:
+    """Audit entries, re-checking only those added/changed since the cached run.
+
+    Returns (issues, diff) where diff is a JSON-ready summary of mapping and
+    issue changes relative to the previous audit. ``full`` re-checks every
+    entry but still diffs against the previous audit.
+    """
+    previous = _load_cache(cache_path)
+    prev_map = {str(e["compound"]): str(e["class"]) for e in previous.values()}
+    prev_issues = {str(e["compound"]) for e in previous.values() if e.get("issue")}
+    cached = {} if full else previous
+
+    results: dict[str, dict[str, Optional[str]]] = {}
+    todo: list[tuple[str, str, str]] = []
+    for compound, cls in mappings.items():
+        key = entry_hash(compound, cls)
+        hit = cached.get(key)
+        if hit is not None:
+            results[key] = hit
+        else:
+            todo.append((key, compound, cls))
+
+    pairs = [(compound, cls) for _, compound, cls in todo]
+    if len(pairs) >= _PARALLEL_MIN and workers > 1:
+        # Chunks sized so each worker gets a few batches (amortizes IPC)
+        size = max(500, len(pairs) // (workers * 4) + 1)
+        chunks = [pairs[i : i + size] for i in range(0, len(pairs), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            found = [r for chunk in pool.map(_audit_chunk, chunks) for r in chunk]
+    else:
+        found = _audit_chunk(pairs)
+    for (key, compound, cls), issue in zip(todo, found, strict=True):
+        results[key] = {"compound": compound, "class": cls, "issue": issue}
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"rules_version": RULES_VERSION, "entries": results}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp, cache_path)
+
+    issues = sorted(
+        (str(e["compound"]), str(e["class"]), str(e["issue"]))
+        for e in results.values()
+        if e.get("issue")
+    )
+    cur_issues = {compound for compound, _, _ in issues}
+    diff: dict[str, object] = {
+        "rules_version": RULES_VERSION,
+        "entries": len(mappings),
+        "rechecked": len(todo),
+        "added": sorted(set(mappings) - set(prev_map)),
+        "removed": sorted(set(prev_map) - set(mappings)),
+        "changed": [
+            {"compound": c, "from": prev_map[c], "to": mappings[c]}
+            for c in sorted(set(mappings) & set(prev_map))
+            if prev_map[c] != mappings[c]
+        ],
+        "new_issues": [
+            {"compound": c, "class": cls, "issue": why}
+            for c, cls, why in issues
+            if c not in prev_issues
+        ],
+        "resolved_issues": sorted(prev_issues - cur_issues),
+        "issue_count": len(issues),
+    }
+    return issues, diff
+
+
+def audit_mappings(
+    cache_path: Path = DEFAULT_CACHE,
+    diff_path: Optional[Path] = None,
+    workers: int = os.cpu_count() or 1,
+    full: bool = False,
+) -> None:
     """Audit mappings and report potential issues."""
     mappings = {k: canon(v) for k, v in load_mappings().items()}
 
@@ -103,14 +219,11 @@ def audit_mappings() -> None:
     for cls, compounds in sorted(by_class.items(), key=lambda x: len(x[1]), reverse=True):
         print(f"  {cls:25s} : {len(compounds):3d} compounds")
 
-    issues = []
-    for compound, cls in sorted(mappings.items()):
-        name = compound.strip().lower()
-        exp = expected_classes(name)
-        if not exp:
-            continue  # no heuristic applies
-        if cls not in exp:
-            issues.append((compound, cls, f"heuristics suggest {sorted(exp)}"))
+    issues, diff = audit_incremental(mappings, cache_path, workers, full=full)
+    print(f"\nRe-checked {diff['rechecked']} of {len(mappings)} entries (rules {RULES_VERSION})")
+    if diff_path is not None:
+        diff_path.write_text(json.dumps(diff, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Wrote audit diff: {diff_path}")
 
     if issues:
         print("\n" + "=" * 80)
@@ -154,5 +267,17 @@ def audit_mappings() -> None:
     print("=" * 80)
 
 
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Audit classes.yaml mappings (incremental)")
+    ap.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="Per-entry result cache")
+    ap.add_argument("--diff-out", type=Path, help="Write machine-readable audit diff (JSON)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument(
+        "--full", action="store_true", help="Re-audit all entries (still diffs against the cache)"
+    )
+    args = ap.parse_args()
+    audit_mappings(args.cache, args.diff_out, args.workers, args.full)
+
+
 if __name__ == "__main__":
-    audit_mappings()
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark peak memory of the per-sheet processing chain.
+
+Runs one synthetic old-schema sheet through the same steps as the
+orchestrator (header normalization + identity cleanup + dates, species fill,
+old->new transform, summary) in a fresh subprocess per mode, and reports the
+peak traced allocation (tracemalloc, includes NumPy buffers) and the peak RSS
+growth over the input frame. Modes: pandas copy-on-write on (enabled once at
+process start, as the CLI and UI entry points do) and off (pandas default).
+
+Usage: python scripts/bench_memory.py [--rows 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from treebot.app.steps.sheet_processing import process_sheet
+from treebot.services.aggregate.summary import build_summary
+from treebot.services.io_excel import InputSheet
+from treebot.services.transform_service import TransformService
+from treebot.services.validate_service import ValidateService
+from treebot.utils.pandas_mode import enable_copy_on_write
+
+_COMPOUNDS = ["Benzene", "Toluene", "alpha-Pinene", "Limonene", "Isoprene", "Octanal"]
+
+
+def make_sheet(rows: int) -> InputSheet:
+    """Old-schema sheet with object columns, as read from Excel."""
+    rng = np.random.default_rng(0)
+    # Identity columns are mostly blank below the first row of each run (forward-filled)
+    folder = np.array([f"DF{i}" for i in rng.integers(0, 99, rows)], dtype=object)
+    folder[rng.random(rows) < 0.9] = None
+    cart = np.array([str(i) for i in rng.integers(1, 40, rows)], dtype=object)
+    cart[rng.random(rows) < 0.9] = None
+    df = pd.DataFrame(
+        {
+            "DataFolderName": folder,
+            "DateRun": np.full(rows, "4/3/2025", dtype=object),
+            "CartridgeNum": cart,
+            "RetentionTime": rng.random(rows) * 30,
+            "Match1": np.array(_COMPOUNDS, dtype=object)[rng.integers(0, len(_COMPOUNDS), rows)],
+            "Match1.Quality": rng.integers(0, 99, rows),
+            "Match2": np.full(rows, "x", dtype=object),
+            "Match2.Quality": rng.integers(0, 99, rows),
+            "Match3": np.full(rows, "y", dtype=object),
+            "Match3.Quality": rng.integers(0, 99, rows),
+            "Comments": np.full(rows, "", dtype=object),
+        }
+    )
+    df.loc[0, ["DataFolderName", "CartridgeNum"]] = ["DF1", "1"]
+    return InputSheet("Lassen", df, "old", header_row_excel=1, first_data_index=0)
+
+
+def run_chain(sheet: InputSheet) -> int:
+    logger = logging.getLogger("bench_memory")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    val, tr = ValidateService(logger), TransformService(logger)
+    class_map = {"benzene": "aromatic", "toluene": "aromatic", "limonene": "monoterpene"}
+    df = process_sheet(val, sheet, logger)
+    df = val.apply_species_mapping_all({sheet.name: df}, None)[sheet.name][0]
+    df = tr.old_to_new(df, class_map).df
+    sections = build_summary({sheet.name: df}, 0, None, 1, None)
+    return len(sections)
+
+
+def _maxrss_kib() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def child(rows: int, cow: bool) -> None:
+    if cow:
+        enable_copy_on_write()
+    sheet = make_sheet(rows)
+    input_mib = sheet.df.memory_usage(deep=True).sum() / 2**20
+    rss0 = _maxrss_kib()
+    tracemalloc.start()
+    run_chain(sheet)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss1 = _maxrss_kib()
+    print(
+        json.dumps(
+            {
+                "input_mib": input_mib,
+                "traced_peak_mib": peak / 2**20,
+                "rss_growth_mib": None if rss0 is None or rss1 is None else (rss1 - rss0) / 1024,
+            }
+        )
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--child", choices=["cow", "nocow"], help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        child(args.rows, args.child == "cow")
+        return
+
+    results = {}
+    for mode in ("nocow", "cow"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--rows", str(args.rows), "--child", mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"rows: {args.rows}, input frame: {results['cow']['input_mib']:.1f} MiB")
+    for mode, label in (("nocow", "copy-on-write off"), ("cow", "copy-on-write on ")):
+        r = results[mode]
+        rss = "n/a" if r["rss_growth_mib"] is None else f"{r['rss_growth_mib']:7.1f} MiB"
+        print(f"{label}: traced peak {r['traced_peak_mib']:7.1f} MiB, peak RSS growth {rss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark per-call latency of compound normalization on the classes.yaml corpus.
+
+Compares the Unicode stage as it used to run on every value (NFKC plus one
+``str.replace`` per Greek letter) against the ASCII fast path with a single
+translate table, then reports end-to-end ``normalize_compound_name`` latency.
+
+Usage: python scripts/bench_normalize.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Sequence
+
+import yaml
+
+from treebot.utils import normalize as norm_mod
+from treebot.utils.normalize import _GREEK_MAP, _fold_unicode, normalize_compound_name
+
+
+def load_corpus() -> list[str]:
+    """Raw keys from classes.yaml (the realistic instrument-name vocabulary)."""
+    p = Path(__file__).resolve().parent.parent / "configs" / "classes.yaml"
+    data = yaml.safe_load(p.read_text(encoding="utf-8-sig")) or {}
+    return [k for k in data.get("map", {}) if isinstance(k, str)]
+
+
+def unicode_stage_reference(text: str) -> str:
+    """Previous behavior: NFKC and seven Greek replaces for every value."""
+    s = unicodedata.normalize("NFKC", text)
+    for k, v in _GREEK_MAP.items():
+        s = s.replace(k, v)
+    return s
+
+
+def per_call_ns(fn: Callable[[str], str], corpus: Sequence[str], repeat: int) -> float:
+    """Best-of-``repeat`` mean latency per call, in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for v in corpus:
+            fn(v)
+        best = min(best, (time.perf_counter_ns() - t0) / len(corpus))
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    corpus = load_corpus()
+    ascii_share = sum(v.isascii() for v in corpus) / len(corpus)
+    mismatches = sum(unicode_stage_reference(v) != _fold_unicode(v) for v in corpus)
+    ref = per_call_ns(unicode_stage_reference, corpus, args.repeat)
+    fast = per_call_ns(_fold_unicode, corpus, args.repeat)
+    full = per_call_ns(normalize_compound_name, corpus, args.repeat)
+    # Same end-to-end call with the old Unicode stage swapped back in
+    norm_mod._fold_unicode = unicode_stage_reference
+    try:
+        full_ref = per_call_ns(normalize_compound_name, corpus, args.repeat)
+    finally:
+        norm_mod._fold_unicode = _fold_unicode
+
+    print(f"corpus: {len(corpus)} names ({ascii_share:.1%} pure ASCII), mismatches: {mismatches}")
+    print(f"unicode stage (NFKC + replaces): {ref:8.0f} ns/call")
+    print(f"unicode stage (ASCII fast path): {fast:8.0f} ns/call  ({ref / fast:.1f}x)")
+    print(f"normalize_compound_name (before): {full_ref:7.0f} ns/call")
+    print(
+        f"normalize_compound_name (after):  {full:7.0f} ns/call  ({full_ref - full:.0f} ns saved)"
+    )
+
+
+if __name__ == "__main__":
+    main()
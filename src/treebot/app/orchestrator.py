@@ -1,20 +1,38 @@
 from __future__ import annotations
 
 import logging
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Mapping
 
 import pandas as pd
 
 from ..config import Config
+from ..domain.errors import IssueStore
+from ..services.transform.class_suggest import suggest_classes
+from ..services.transform.norm_dictionary import NormalizationDictionary
+from ..services.transform.synonyms import SynonymMap, load_synonym_map
 from ..services.transform_service import TransformService
 from ..services.validate_service import ValidateService
+from ..services.validation.blanks import DIAGNOSTIC_COLUMNS, BlankMasks
+from ..services.validation.species_map import SpeciesLookup
+from ..types import ManifestInputsEntry
+from ..utils.normalize import NormalizationProfiler, profile_normalization
 from .container import Container
-from .run_manager import start_run
-from .steps.sheet_processing import process_sheet
+from .run_manager import cache_dir_for, start_run
+from .steps.blocking import run_blocking_checks
+from .steps.sheet_processing import fill_species, process_sheet
 from ..services.output.manifest_writer import write_manifest
+from ..services.output.report_writer import write_csv_report, write_json_report
 from ..services.aggregate.summary import build_summary, SheetConfig
+from ..services.aggregate.rollup import (
+    ROLLUP_COLUMNS,
+    ClassHierarchy,
+    build_class_rollups,
+    load_class_hierarchy,
+)
 from ..services.output.summary_writer import write_sections_to_sheet
 
 
@@ -30,6 +48,11 @@ class Orchestrator:
         classes_path: Path,
         mapping_path: Path | None,
         out_dir: Path,
+        synonyms_path: Path | None = None,
+        class_hierarchy_path: Path | None = None,
+        class_map: Mapping[str, str] | None = None,
+        classes_sha256: str | None = None,
+        schema_input: ManifestInputsEntry | None = None,
     ) -> int:
         """
         Simple pipeline: normalize headers ÃƒÆ’Ã†â€™Ãƒâ€šÃ‚Â¢ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬Ãƒâ€šÃ‚Â ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬ÃƒÂ¢Ã¢â‚¬Å¾Ã‚Â¢ transform oldÃƒÆ’Ã†â€™Ãƒâ€šÃ‚Â¢ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬Ãƒâ€šÃ‚Â ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬ÃƒÂ¢Ã¢â‚¬Å¾Ã‚Â¢new ÃƒÆ’Ã†â€™Ãƒâ€šÃ‚Â¢ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬Ãƒâ€šÃ‚Â ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬ÃƒÂ¢Ã¢â‚¬Å¾Ã‚Â¢ write standardized.xlsx
@@ -37,6 +60,11 @@ class Orchestrator:
         run_ctx = start_run(out_dir)
         val: ValidateService = self.container.validate
         tr: TransformService = self.container.transform
+        # Profiling bypasses the cross-run dictionary so every value exercises the rules
+        profiler = NormalizationProfiler() if self.cfg.profile_normalization else None
+        norm_dict = (
+            None if profiler is not None else NormalizationDictionary(cache_dir_for(out_dir))
+        )
 
         try:
             # 1. Load workbook
@@ -49,12 +77,17 @@ class Orchestrator:
                 for sk in skipped:
                     self.logger.warning(f"  - {sk.name}: {sk.reason}")
 
-            # 2. Load class map
-            class_map = val.load_class_map(classes_path)
+            # 2. Load class map (callers holding a preloaded snapshot skip parsing)
+            if class_map is not None:
+                class_map_cache = "snapshot"
+                self.logger.info("Using preloaded classes map", extra={"entries": len(class_map)})
+            else:
+                class_map, class_map_hit = val.load_class_map_cached(
+                    classes_path, cache_dir_for(out_dir)
+                )
+                class_map_cache = "hit" if class_map_hit else "miss"
             # 2b. Load species map (optional)
-            from typing import Mapping, Tuple
-
-            species_map: Mapping[Tuple[str, str], str] | None = None
+            species_map: SpeciesLookup | None = None
             if mapping_path is not None:
                 try:
                     species_map, _amb = val.load_species_map(mapping_path)
@@ -63,22 +96,121 @@ class Orchestrator:
                         f"Failed to load species map: {e}", extra={"path": str(mapping_path)}
                     )
 
+            # 2c. Load synonym map (optional; canonical names replace synonyms)
+            synonyms: SynonymMap | None = None
+            if synonyms_path is not None:
+                try:
+                    synonyms = load_synonym_map(synonyms_path)
+                    self.logger.info(
+                        f"Loaded {len(synonyms)} synonyms",
+                        extra={"path": str(synonyms_path)},
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Failed to load synonym map: {e}", extra={"path": str(synonyms_path)}
+                    )
+
+            # 2d. Load class hierarchy (optional; enables class rollup sheets)
+            hierarchy: ClassHierarchy | None = None
+            if class_hierarchy_path is not None:
+                try:
+                    hierarchy = load_class_hierarchy(class_hierarchy_path)
+                except Exception as e:
+                    self.logger.warning(
+                        f"Failed to load class hierarchy: {e}",
+                        extra={"path": str(class_hierarchy_path)},
+                    )
+
             # 3. Process sheets: normalize headers + transform oldÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â€šÂ¬Ã‚Â ÃƒÂ¢Ã¢â€šÂ¬Ã¢â€žÂ¢new
             from typing import MutableMapping
 
             all_processed: MutableMapping[str, pd.DataFrame] = {}
+            unmapped_frames: list[pd.DataFrame] = []
+            issue_store = IssueStore()
+            consistency_frames: list[pd.DataFrame] = []
 
+            # Normalize headers + basic cleanup per sheet
+            prepared: MutableMapping[str, pd.DataFrame] = {}
+            blanks: MutableMapping[str, BlankMasks] = {}
             for sheet in sheets:
                 self.logger.info(f"Processing sheet: {sheet.name} (schema={sheet.schema})")
+                blanks[sheet.name] = BlankMasks()
+                prepared[sheet.name] = process_sheet(val, sheet, self.logger, blanks[sheet.name])
+            # Duplicate (DateRun, CartridgeNum) keys within and across sheets
+            dups = val.find_duplicate_keys(prepared)
+            if len(dups):
+                self.logger.warning(
+                    f"{len(dups)} duplicate (DateRun, CartridgeNum) keys "
+                    f"({len(dups.issues)} rows); see duplicates.csv"
+                )
+                write_csv_report(
+                    run_dir=run_ctx.run_dir,
+                    name="duplicates.csv",
+                    df=dups.report,
+                    logger=self.logger,
+                )
+                issue_store.extend(dups.issues)
 
-                # Normalize headers
-                df = process_sheet(val, sheet, self.logger, species_map)
+            # Strict mode: all blocking checks across all sheets before any transform/output
+            if self.cfg.strict_fail:
+                blocking = run_blocking_checks(
+                    sheets, skipped, prepared, class_map, dups, norm_dict, synonyms
+                )
+                if blocking.failed:
+                    found = ", ".join(f"{c}: {n}" for c, n in blocking.counts().items())
+                    self.logger.error(f"Blocking checks failed (strict_fail): {found}")
+                    for r in blocking.rows.head(10).itertuples(index=False):
+                        self.logger.error(f"  {r.Check} [{r.Sheet}] {r.Item}")
+                    write_csv_report(
+                        run_dir=run_ctx.run_dir,
+                        name="blocking_report.csv",
+                        df=blocking.rows,
+                        logger=self.logger,
+                    )
+                    # Curators still get class suggestions for the missing compounds
+                    if not blocking.curator.empty:
+                        write_csv_report(
+                            run_dir=run_ctx.run_dir,
+                            name="curator_report.csv",
+                            df=blocking.curator,
+                            logger=self.logger,
+                        )
+                    self.logger.error(
+                        "No workbook written; fix the inputs or set strict_fail: false"
+                    )
+                    return 2
+
+            # Species mapping for all sheets in one lookup (no overwrite)
+            if species_map is not None:
+                prepared = fill_species(val, prepared, self.logger, species_map, blanks)
+                # Site resolution report: how each sheet name / mapping Site value matched
+                try:
+                    sites_report = val.site_resolution_report()
+                    unresolved = sites_report.loc[
+                        sites_report["Value"].isin(list(prepared)) & sites_report["SiteKey"].isna(),
+                        "Value",
+                    ].tolist()
+                    for name in unresolved:
+                        self.logger.warning(f"Sheet '{name}': no matching site; Species not filled")
+                    write_csv_report(
+                        run_dir=run_ctx.run_dir,
+                        name="site_resolution.csv",
+                        df=sites_report,
+                        logger=self.logger,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Site resolution report failed: {e}")
+
+            for sheet in sheets:
+                df = prepared[sheet.name]
 
                 # Transform oldÃƒÆ’Ã†â€™Ãƒâ€šÃ‚Â¢ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬Ãƒâ€šÃ‚Â ÃƒÆ’Ã‚Â¢ÃƒÂ¢Ã¢â‚¬Å¡Ã‚Â¬ÃƒÂ¢Ã¢â‚¬Å¾Ã‚Â¢new if needed
                 if sheet.schema == "old":
                     self.logger.info(f"Transforming old->new for sheet: {sheet.name}")
-                    result = tr.old_to_new(df, class_map)
+                    with profile_normalization(profiler) if profiler else nullcontext():
+                        result = tr.old_to_new(df, class_map, norm_dict, synonyms)
                     df = result.df
+                    issue_store.extend(result.issues, sheet=sheet.name)
 
                     # Normalization summary: Match1 -> Compound changes
                     try:
@@ -104,6 +236,7 @@ class Orchestrator:
                         pass
 
                     if not result.unmapped_compounds.empty:
+                        unmapped_frames.append(result.unmapped_compounds)
                         self.logger.warning(
                             f"Sheet '{sheet.name}': {len(result.unmapped_compounds)} compounds missing class"
                         )
@@ -128,6 +261,24 @@ class Orchestrator:
                             f"Sheet '{sheet.name}': added empty 'Species' column (old schema)"
                         )
 
+                else:
+                    # New schema: stored Compound/Class/MatchScore are checked, not rewritten
+                    try:
+                        check = val.check_consistency(df, class_map, sheet.name, norm_dict)
+                        if len(check):
+                            found = ", ".join(f"{c}: {n}" for c, n in check.counts.items() if n)
+                            self.logger.warning(
+                                f"Sheet '{sheet.name}': consistency mismatches ({found})"
+                            )
+                            for r in check.samples.head(5).itertuples(index=False):
+                                self.logger.warning(
+                                    f"  Row {r.Row}: {r.Check} expected '{r.Expected}', got '{r.Actual}'"
+                                )
+                            issue_store.extend(check.issues)
+                            consistency_frames.append(check.samples)
+                    except Exception as e:
+                        self.logger.warning(f"Sheet '{sheet.name}': consistency check failed: {e}")
+
                 # Ensure all new schema columns exist (add empty if missing)
                 df = self._ensure_new_schema_columns(df)
 
@@ -139,55 +290,19 @@ class Orchestrator:
                     except Exception:
                         return int(idx) + 2  # fallback
 
-                # Report first five rows with empty Species (per sheet)
-                if "Species" in df.columns:
-                    s = df["Species"]
-                    empty_mask = s.isna() | (s.astype(str).str.strip() == "")
-                    if empty_mask.any():
-                        idxs = df.index[empty_mask].tolist()
-                        self.logger.warning(
-                            f"Sheet '{sheet.name}': {len(idxs)} rows with empty Species (showing first 5)"
-                        )
-                        for i in idxs[:5]:
-                            display_row = _display_row(int(i))
-                            self.logger.warning(f"  Row {display_row}: Species is empty")
-                # Report first five rows with empty CartridgeNum (per sheet)
-                if "CartridgeNum" in df.columns:
-                    s2 = df["CartridgeNum"]
-                    empty2 = s2.isna() | (s2.astype(str).str.strip() == "")
-                    if empty2.any():
-                        idxs2 = df.index[empty2].tolist()
-                        self.logger.warning(
-                            f"Sheet '{sheet.name}': {len(idxs2)} rows with empty CartridgeNum (showing first 5)"
-                        )
-                        for i in idxs2[:5]:
-                            display_row = _display_row(int(i))
-                            self.logger.warning(f"  Row {display_row}: CartridgeNum is empty")
-                # Report first five rows with empty DataFolderName (per sheet)
-                if "DataFolderName" in df.columns:
-                    s3 = df["DataFolderName"]
-                    empty3 = s3.isna() | (s3.astype(str).str.strip() == "")
-                    if empty3.any():
-                        idxs3 = df.index[empty3].tolist()
-                        self.logger.warning(
-                            f"Sheet '{sheet.name}': {len(idxs3)} rows with empty DataFolderName (showing first 5)"
-                        )
-                        for i in idxs3[:5]:
-                            display_row = _display_row(int(i))
-                            self.logger.warning(f"  Row {display_row}: DataFolderName is empty")
-                # Report first five rows with empty Quality columns (per sheet)
-                for qcol in ["Match1.Quality", "Match2.Quality", "Match3.Quality"]:
-                    if qcol in df.columns:
-                        qs = df[qcol]
-                        qempty = qs.isna() | (qs.astype(str).str.strip() == "")
-                        if qempty.any():
-                            idxsq = df.index[qempty].tolist()
-                            self.logger.warning(
-                                f"Sheet '{sheet.name}': {len(idxsq)} rows with empty {qcol} (showing first 5)"
-                            )
-                            for i in idxsq[:5]:
-                                display_row = _display_row(int(i))
-                                self.logger.warning(f"  Row {display_row}: {qcol} is empty")
+                # Report first five rows with empty Species, CartridgeNum, DataFolderName
+                # and Quality columns (per sheet), read from the shared blank masks
+                for col in DIAGNOSTIC_COLUMNS:
+                    empty_mask = blanks[sheet.name].get(df, col)
+                    if empty_mask is None or not empty_mask.any():
+                        continue
+                    idxs = df.index[empty_mask].tolist()
+                    self.logger.warning(
+                        f"Sheet '{sheet.name}': {len(idxs)} rows with empty {col} (showing first 5)"
+                    )
+                    for i in idxs[:5]:
+                        display_row = _display_row(int(i))
+                        self.logger.warning(f"  Row {display_row}: {col} is empty")
 
                 all_processed[sheet.name] = df
 
@@ -198,13 +313,96 @@ class Orchestrator:
 
             ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
             std_path = run_ctx.run_dir / f"standardized_{ts}.xlsx"
-            self.container.io.write_output(all_processed, std_path)
+            # InferredClass only feeds the curator report and summaries; it is not an output column
+            self.container.io.write_output(
+                {
+                    name: df.drop(columns=["InferredClass"], errors="ignore")
+                    for name, df in all_processed.items()
+                },
+                std_path,
+            )
             total_rows = sum(len(df) for df in all_processed.values())
             self.logger.info(
                 f"Wrote {std_path.name} ({len(all_processed)} sheets, {total_rows} rows)"
             )
             # Single output only (no duplicate stable name)
 
+            # Curator report: closest classes.yaml keys for every unmapped compound
+            if unmapped_frames:
+                try:
+                    unmapped_all = (
+                        pd.concat(unmapped_frames, ignore_index=True)
+                        .groupby("Compound", as_index=False)
+                        .agg(count=("count", "sum"), InferredClass=("InferredClass", "first"))
+                        .sort_values(["count", "Compound"], ascending=[False, True])
+                    )
+                    write_csv_report(
+                        run_dir=run_ctx.run_dir,
+                        name="curator_report.csv",
+                        df=suggest_classes(unmapped_all, class_map),
+                        logger=self.logger,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Curator report failed: {e}")
+
+            # Canonicalization report: rows folded into each canonical name
+            if synonyms is not None:
+                try:
+                    canon_report = synonyms.report()
+                    if not canon_report.empty:
+                        self.logger.info(
+                            f"Canonicalized {int(canon_report['Rows'].sum())} rows "
+                            f"({len(canon_report)} names merged)"
+                        )
+                        write_csv_report(
+                            run_dir=run_ctx.run_dir,
+                            name="canonicalization_report.csv",
+                            df=canon_report,
+                            logger=self.logger,
+                        )
+                except Exception as e:
+                    self.logger.warning(f"Canonicalization report failed: {e}")
+
+            # Consistency report for new-schema sheets (first mismatches per check)
+            if consistency_frames:
+                write_csv_report(
+                    run_dir=run_ctx.run_dir,
+                    name="consistency_report.csv",
+                    df=pd.concat(consistency_frames, ignore_index=True),
+                    logger=self.logger,
+                )
+
+            # Validation issues: counts by code; only the first max_errors are materialized
+            if len(issue_store):
+                try:
+                    counts = ", ".join(f"{c}: {n}" for c, n in issue_store.counts().items())
+                    limit = int(self.cfg.max_errors)
+                    self.logger.warning(
+                        f"{len(issue_store)} validation issues ({counts}); "
+                        f"reporting first {min(limit, len(issue_store))}"
+                    )
+                    head = issue_store.head(limit)
+                    write_csv_report(
+                        run_dir=run_ctx.run_dir,
+                        name="validation_issues.csv",
+                        df=pd.DataFrame(
+                            [
+                                {
+                                    "Sheet": (i.details or {}).get("sheet", ""),
+                                    "Category": i.category.value,
+                                    "Code": i.code,
+                                    "Message": i.message,
+                                    "RowIndex": i.row_index,
+                                }
+                                for i in head
+                            ],
+                            columns=["Sheet", "Category", "Code", "Message", "RowIndex"],
+                        ),
+                        logger=self.logger,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Validation issues report failed: {e}")
+
             # 6. Build and write summary sheets (4 sheets total)
             try:
                 q = int(self.cfg.certainty_threshold)
@@ -237,6 +435,7 @@ class Orchestrator:
                         quality_max=config.quality_max,
                         count_min=config.count_min,
                         count_max=config.count_max,
+                        show_inferred=self.cfg.show_inferred_classes,
                     )
 
                     if sections:
@@ -263,6 +462,52 @@ class Orchestrator:
             except Exception as e:
                 self.logger.warning(f"Summary sheets build failed: {e}")
 
+            # 6b. Class rollup sheets (one per hierarchy level above the leaves)
+            if hierarchy is not None:
+                try:
+                    rollups = build_class_rollups(
+                        all_processed,
+                        hierarchy,
+                        int(self.cfg.certainty_threshold),
+                        show_inferred=self.cfg.show_inferred_classes,
+                    )
+                    for level, sections in rollups.items():
+                        if not sections:
+                            continue
+                        name = f"Class Rollup L{level}"
+                        write_sections_to_sheet(std_path, sections, name, columns=ROLLUP_COLUMNS)
+                        self.logger.info(
+                            f"Added {name} sheet to {std_path.name}",
+                            extra={"sections": len(sections)},
+                        )
+                except Exception as e:
+                    self.logger.warning(f"Class rollup sheets failed: {e}")
+
+            if profiler is not None:
+                write_json_report(
+                    run_dir=run_ctx.run_dir,
+                    name="normalization_profile.json",
+                    payload=profiler.report(),
+                    logger=self.logger,
+                )
+
+            # Persist the cross-run normalization dictionary (best-effort)
+            if norm_dict is not None:
+                try:
+                    if norm_dict.save():
+                        self.logger.info(
+                            "Saved normalization dictionary",
+                            extra={
+                                "path": str(norm_dict.path),
+                                "hits": norm_dict.hits,
+                                "misses": norm_dict.misses,
+                            },
+                        )
+                    else:
+                        self.logger.warning("Normalization dictionary busy; skipped save")
+                except Exception as e:
+                    self.logger.warning(f"Normalization dictionary save failed: {e}")
+
             # 7. Write manifest
             started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
             finished = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -274,6 +519,9 @@ class Orchestrator:
                 finished_at=finished,
                 cfg=self.cfg,
                 logger=self.logger,
+                class_map_cache=class_map_cache,
+                classes_sha256=classes_sha256,
+                schema_input=schema_input,
             )
 
             self.logger.info("Pipeline completed successfully")
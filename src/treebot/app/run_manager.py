@@ -14,6 +14,11 @@ class RunContext:
     logger: logging.Logger
 
 
+def cache_dir_for(out_dir: Path) -> Path:
+    """Shared cache folder next to the run folders (reused across runs)."""
+    return out_dir / ".cache"
+
+
 def start_run(out_dir: Path, base_logger_name: str = "treebot") -> RunContext:
     run_dir = out_dir / datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     setup_logging(run_dir)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
+
+import pandas as pd
+
+from ...services.io_excel import InputSheet, SkippedSheet
+from ...services.transform.class_suggest import suggest_classes
+from ...services.transform.compound_class import missing_class_compounds
+from ...services.transform.infer_class import infer_classes
+from ...services.transform.norm_dictionary import NormalizationDictionary
+from ...services.transform.synonyms import SynonymMap
+from ...services.validation.duplicates import DuplicateKeys
+
+BLOCKING_COLUMNS = ["Check", "Sheet", "Item", "Rows", "Suggestion"]
+# Skip reasons that mean a table was found but its headers do not fit a schema
+_HEADER_REASONS = ("no_schema", "header_row_not_found")
+_READ_ERROR = "read_error"
+
+
+@dataclass(frozen=True)
+class BlockingReport:
+    """Blocking findings across all sheets (READ_ERROR, HEADERS, CLASS_MISSING, DUPLICATE_KEY).
+
+    ``curator`` holds the curator-report suggestions for the CLASS_MISSING
+    compounds, so an aborted run still tells curators what to add.
+    """
+
+    rows: pd.DataFrame
+    curator: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def failed(self) -> bool:
+        return not self.rows.empty
+
+    def counts(self) -> Mapping[str, int]:
+        return {str(k): int(v) for k, v in self.rows["Check"].value_counts(sort=False).items()}
+
+
+def run_blocking_checks(
+    sheets: Sequence[InputSheet],
+    skipped: Sequence[SkippedSheet],
+    prepared: Mapping[str, pd.DataFrame],
+    class_map: Mapping[str, str],
+    duplicates: DuplicateKeys,
+    norm_dict: NormalizationDictionary | None = None,
+    synonyms: SynonymMap | None = None,
+) -> BlockingReport:
+    """Checks that fail a strict run, evaluated before any transform or output.
+
+    - READ_ERROR: sheets that could not be read at all
+    - HEADERS: sheets with a table whose headers match neither schema
+    - CLASS_MISSING: old-schema compounds absent from classes.yaml (each
+      distinct Match1 normalized once across all sheets); ``Suggestion`` is
+      the closest classes.yaml key and its class, as in curator_report.csv
+    - DUPLICATE_KEY: keys from the duplicate detector
+    """
+    parts: list[pd.DataFrame] = []
+    unreadable = [
+        {"Check": "READ_ERROR", "Sheet": s.name, "Item": s.reason, "Rows": 0}
+        for s in skipped
+        if s.reason.startswith(_READ_ERROR)
+    ]
+    headers = [
+        {"Check": "HEADERS", "Sheet": s.name, "Item": s.reason, "Rows": 0}
+        for s in skipped
+        if s.reason.startswith(_HEADER_REASONS)
+    ]
+    for found in (unreadable, headers):
+        if found:
+            parts.append(pd.DataFrame(found).assign(Suggestion=pd.NA))
+
+    old = {s.name: prepared[s.name] for s in sheets if s.schema == "old" and s.name in prepared}
+    missing = missing_class_compounds(old, class_map, norm_dict, synonyms)
+    curator = pd.DataFrame()
+    if not missing.empty:
+        unmapped = (
+            missing.groupby("Compound", as_index=False)
+            .agg(count=("Rows", "sum"))
+            .sort_values(["count", "Compound"], ascending=[False, True])
+        )
+        unmapped = unmapped.assign(InferredClass=infer_classes(unmapped["Compound"]))
+        curator = suggest_classes(unmapped, class_map)
+        top = curator[curator["Rank"] == 1]
+        suggestion = pd.Series(
+            [
+                f"{key} -> {cls}"
+                for key, cls in zip(top["SuggestedKey"], top["SuggestedClass"], strict=True)
+            ],
+            index=top["Compound"].to_numpy(),
+            dtype=object,
+        )
+        parts.append(
+            missing.rename(columns={"Compound": "Item"}).assign(
+                Check="CLASS_MISSING", Suggestion=missing["Compound"].map(suggestion)
+            )
+        )
+
+    if len(duplicates):
+        report = duplicates.report
+        parts.append(
+            pd.DataFrame(
+                {
+                    "Check": "DUPLICATE_KEY",
+                    "Sheet": report["Sheets"],
+                    "Item": report["DateRun"] + " / " + report["CartridgeNum"],
+                    "Rows": report["Rows"],
+                    "Suggestion": pd.NA,
+                }
+            )
+        )
+
+    rows = (
+        pd.concat([p[BLOCKING_COLUMNS] for p in parts], ignore_index=True)
+        if parts
+        else pd.DataFrame(columns=BLOCKING_COLUMNS)
+    )
+    return BlockingReport(rows, curator)
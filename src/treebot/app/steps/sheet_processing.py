@@ -5,23 +5,36 @@ import logging
 import pandas as pd
 
 from ...services.io_excel import InputSheet
-from typing import Mapping, Tuple
 from ...services.validate_service import ValidateService
+from ...services.validation.blanks import DIAGNOSTIC_COLUMNS, BlankMasks
+from ...services.validation.species_map import SpeciesLookup
+from typing import Mapping, MutableMapping, Optional
 
 
 def process_sheet(
     val: ValidateService,
     sh: InputSheet,
     logger: logging.Logger,
-    species_map: Mapping[Tuple[str, str], str] | None = None,
+    masks: Optional[BlankMasks] = None,
 ) -> pd.DataFrame:
-    """Normalize headers and basic cleanup."""
-    df = val.normalize_headers(sh.df.copy(), sh.schema)
+    """Normalize headers and basic cleanup.
+
+    ``masks`` (optional) is filled with the sheet's blank masks at ingestion;
+    identity columns get theirs from the forward-fill pass.
+    """
+    # rename() returns a new frame owned by the pipeline; sh.df is never mutated
+    df = val.normalize_headers(sh.df, sh.schema)
     df["Sheet"] = sh.name
+    if masks is not None:
+        identity = ("DataFolderName", "CartridgeNum")
+        masks.compute(df, [c for c in DIAGNOSTIC_COLUMNS if c not in identity])
 
-    # Fill down identity columns within the sheet: DataFolderName, CartridgeNum (skip DateRun)
+    # Fill down identity columns within the sheet: DataFolderName, CartridgeNum (skip DateRun);
+    # CartridgeNum is trimmed in the same pass
+    trimmed = False
     try:
-        df, counts, examples, example_values = val.forward_fill_identities(df)
+        df, counts, examples, example_values = val.clean_identities(df, masks)
+        trimmed = True
         total_filled = counts["DataFolderName"] + counts["CartridgeNum"]
         if total_filled:
             parts: list[str] = []
@@ -42,25 +55,41 @@ def process_sheet(
         pass
 
     # Basic cleanup
-    if "CartridgeNum" in df.columns:
+    if "CartridgeNum" in df.columns and not trimmed:
         df = val.trim_cartridge(df)
-    # Species mapping (do not overwrite existing values)
-    if species_map is not None:
-        try:
-            df, filled, species_examples = val.apply_species_mapping(df, sh.name, species_map)
-            if filled:
-                logger.info(f"Sheet '{sh.name}': filled Species via mapping: {filled} rows")
-                if species_examples:
-                    sample = ", ".join(f"{i} '{c}' -> '{s}'" for (i, c, s) in species_examples[:5])
-                    logger.info(f"  examples: {sample}")
-        except Exception:
-            # Non-fatal: continue without species fill if any unexpected issue
-            pass
     if "DateRun" in df.columns:
         df, warnings = val.parse_dates_to_iso(df)
         if warnings:
-            logger.warning(f"Sheet '{sh.name}': {len(warnings)} date parsing issues")
-            for warning in warnings[:5]:  # Show first 5 warnings
+            c = warnings.counts
+            logger.warning(
+                f"Sheet '{sh.name}': {len(warnings)} date parsing issues "
+                f"({c['empty']} empty, {c['unparseable']} unparseable)"
+            )
+            for warning in warnings.messages(5):  # Format only the first 5
                 logger.warning(f"  {warning}")
 
     return df
+
+
+def fill_species(
+    val: ValidateService,
+    frames: Mapping[str, pd.DataFrame],
+    logger: logging.Logger,
+    species_map: SpeciesLookup,
+    masks: Optional[Mapping[str, BlankMasks]] = None,
+) -> MutableMapping[str, pd.DataFrame]:
+    """Fill missing Species across all sheets in one pass (no overwrite)."""
+    out: MutableMapping[str, pd.DataFrame] = dict(frames)
+    try:
+        results = val.apply_species_mapping_all(frames, species_map, masks)
+    except Exception:
+        # Non-fatal: continue without species fill if any unexpected issue
+        return out
+    for name, (df, filled, species_examples) in results.items():
+        out[name] = df
+        if filled:
+            logger.info(f"Sheet '{name}': filled Species via mapping: {filled} rows")
+            if species_examples:
+                sample = ", ".join(f"{i} '{c}' -> '{s}'" for (i, c, s) in species_examples[:5])
+                logger.info(f"  examples: {sample}")
+    return out
@@ -13,11 +13,16 @@ class Config:
     certainty_threshold: int = 80
     frequency_min: int = 2
     site_mode: str = "sheetname"
-    strict_fail: bool = True
+    # Opt-in: abort before any output when blocking checks fail (blocking_report.csv)
+    strict_fail: bool = False
     make_per_species_sheets: bool = True
     max_errors: int = 50
     # Pipeline stage: 'full' (default) or 'headers' for headers-only validation
     pipeline_stage: str = "full"
+    # Record per-rule hit counts/time of compound normalization (normalization_profile.json)
+    profile_normalization: bool = False
+    # Show rule-inferred classes for compounds missing from classes.yaml in summaries
+    show_inferred_classes: bool = False
 
 
 def load_config(path: Optional[Path], overrides: Optional[ConfigOverrides] = None) -> Config:
@@ -43,7 +48,12 @@ def load_config(path: Optional[Path], overrides: Optional[ConfigOverrides] = Non
         data.update(cast(YamlConfig, {k: v for k, v in overrides.items() if v is not None}))
 
     # Coerce booleans from strings if needed (Windows/CLI friendliness)
-    for key in ("strict_fail", "make_per_species_sheets"):
+    for key in (
+        "strict_fail",
+        "make_per_species_sheets",
+        "profile_normalization",
+        "show_inferred_classes",
+    ):
         if key in data:
             val = data.get(key)
             if isinstance(val, str):
@@ -62,5 +72,11 @@ def load_config(path: Optional[Path], overrides: Optional[ConfigOverrides] = Non
         ),
         max_errors=int(data.get("max_errors", defaults.max_errors)),
         pipeline_stage=str(data.get("pipeline_stage", defaults.pipeline_stage)),
+        profile_normalization=bool(
+            data.get("profile_normalization", defaults.profile_normalization)
+        ),
+        show_inferred_classes=bool(
+            data.get("show_inferred_classes", defaults.show_inferred_classes)
+        ),
     )
     return cfg
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Mapping, Optional
+from itertools import islice
+from typing import Iterator, List, Mapping, MutableMapping, Optional
+
+import numpy as np
 
 
 class ErrorCategory(str, Enum):
@@ -18,3 +21,105 @@ class ValidationIssue:
     message: str
     row_index: Optional[int] = None
     details: Optional[Mapping[str, object]] = None
+
+
+@dataclass(frozen=True)
+class _IssueBlock:
+    # One bulk append: shared category/code/message/sheet ids + row indices
+    category: int
+    code: int
+    message: int
+    sheet: int
+    rows: np.ndarray
+
+
+class IssueStore:
+    """Columnar validation issues: interned strings + row-index arrays.
+
+    - ``add_rows``/``add_mask`` append a whole block of rows in one call
+    - ``counts()`` tallies by code without building issue objects
+    - ``ValidationIssue`` objects are only materialized on iteration or
+      ``head(limit)`` (e.g. the first ``Config.max_errors`` for logs/reports)
+    """
+
+    def __init__(self) -> None:
+        self._strings: List[str] = [""]  # id 0 = no sheet
+        self._ids: MutableMapping[str, int] = {"": 0}
+        self._blocks: List[_IssueBlock] = []
+        self._len = 0
+
+    def _intern(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self._strings)
+            self._strings.append(s)
+        return i
+
+    def add_rows(
+        self,
+        rows: np.ndarray,
+        category: ErrorCategory,
+        code: str,
+        message: str,
+        sheet: str = "",
+    ) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        self._blocks.append(
+            _IssueBlock(
+                category=self._intern(category.value),
+                code=self._intern(code),
+                message=self._intern(message),
+                sheet=self._intern(sheet),
+                rows=rows,
+            )
+        )
+        self._len += len(rows)
+
+    def add_mask(
+        self,
+        mask: np.ndarray,
+        index: np.ndarray,
+        category: ErrorCategory,
+        code: str,
+        message: str,
+        sheet: str = "",
+    ) -> None:
+        """Add one issue per ``True`` in ``mask``, using row labels from ``index``."""
+        self.add_rows(
+            np.asarray(index)[np.asarray(mask, dtype=bool)], category, code, message, sheet
+        )
+
+    def extend(self, other: IssueStore, sheet: Optional[str] = None) -> None:
+        """Append another store's issues, optionally relabelled with ``sheet``."""
+        for b in other._blocks:
+            self.add_rows(
+                b.rows,
+                ErrorCategory(other._strings[b.category]),
+                other._strings[b.code],
+                other._strings[b.message],
+                other._strings[b.sheet] if sheet is None else sheet,
+            )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def counts(self) -> Mapping[str, int]:
+        out: MutableMapping[str, int] = {}
+        for b in self._blocks:
+            code = self._strings[b.code]
+            out[code] = out.get(code, 0) + len(b.rows)
+        return out
+
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        for b in self._blocks:
+            category = ErrorCategory(self._strings[b.category])
+            code, message = self._strings[b.code], self._strings[b.message]
+            details = {"sheet": self._strings[b.sheet]} if b.sheet else None
+            # Walk the array lazily: head() stops after ``limit`` rows
+            for row in b.rows:
+                yield ValidationIssue(category, code, message, int(row), details)
+
+    def head(self, limit: int) -> List[ValidationIssue]:
+        return list(islice(self, max(limit, 0)))
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import argparse
 import logging
+from multiprocessing import freeze_support
 from pathlib import Path
+from typing import Mapping
 
 from .config import Config, load_config
-from .types import ConfigOverrides
+from .types import ConfigOverrides, ManifestInputsEntry
 from .app.container import build_container
 from .app.orchestrator import Orchestrator
+from .utils.pandas_mode import enable_copy_on_write
 
 
 logger = logging.getLogger(__name__)
@@ -24,12 +27,28 @@ def run_pipeline(
     out_dir: Path,
     cfg: Config | None = None,
     mapping_path: Path | None = None,
+    synonyms_path: Path | None = None,
+    class_hierarchy_path: Path | None = None,
+    class_map: Mapping[str, str] | None = None,
+    classes_sha256: str | None = None,
+    schema_input: ManifestInputsEntry | None = None,
 ) -> int:
     orch = _make_orchestrator(cfg or Config())
-    return orch.run(input_path, classes_path, mapping_path, out_dir)
+    return orch.run(
+        input_path,
+        classes_path,
+        mapping_path,
+        out_dir,
+        synonyms_path,
+        class_hierarchy_path,
+        class_map=class_map,
+        classes_sha256=classes_sha256,
+        schema_input=schema_input,
+    )
 
 
 def main() -> int:
+    enable_copy_on_write()
     ap = argparse.ArgumentParser(description="TreeBot CLI")
     ap.add_argument("--input", required=True, type=Path, help="Path to results workbook (xlsx)")
     ap.add_argument("--classes", required=True, type=Path, help="Path to classes.yaml")
@@ -42,6 +61,18 @@ def main() -> int:
         type=Path,
         help="Optional species mapping workbook (Site, CartridgeNum -> PlantSpecies)",
     )
+    ap.add_argument(
+        "--synonyms",
+        required=False,
+        type=Path,
+        help="Optional synonyms.yaml folding synonym names into canonical compounds",
+    )
+    ap.add_argument(
+        "--class-hierarchy",
+        required=False,
+        type=Path,
+        help="Optional class_hierarchy.yaml; adds class rollup sheets per hierarchy level",
+    )
     ap.add_argument("--config", required=False, type=Path, help="Optional YAML config file")
     ap.add_argument(
         "--max-errors", required=False, type=int, default=50, help="Max errors to show in reports"
@@ -65,6 +96,21 @@ def main() -> int:
         default=None,
         help="Pipeline stage: 'headers' to validate headers only, or 'full' (default)",
     )
+    ap.add_argument(
+        "--profile-normalization",
+        action="store_true",
+        help="Write per-rule normalization hit counts/timings to normalization_profile.json",
+    )
+    ap.add_argument(
+        "--strict",
+        action="store_true",
+        help="Abort with exit code 2 and blocking_report.csv when blocking checks fail",
+    )
+    ap.add_argument(
+        "--show-inferred-classes",
+        action="store_true",
+        help="Show rule-inferred classes for compounds missing from classes.yaml in summaries",
+    )
     args = ap.parse_args()
 
     overrides: ConfigOverrides = {"max_errors": int(args.max_errors)}
@@ -75,10 +121,24 @@ def main() -> int:
         overrides["frequency_min"] = int(args.min_count)
     if args.stage:
         overrides["pipeline_stage"] = args.stage
+    if args.profile_normalization:
+        overrides["profile_normalization"] = True
+    if args.strict:
+        overrides["strict_fail"] = True
+    if args.show_inferred_classes:
+        overrides["show_inferred_classes"] = True
     cfg = load_config(args.config, overrides=overrides)
 
     try:
-        return run_pipeline(args.input, args.classes, args.out, cfg, args.mapping)
+        return run_pipeline(
+            args.input,
+            args.classes,
+            args.out,
+            cfg,
+            args.mapping,
+            args.synonyms,
+            args.class_hierarchy,
+        )
     except Exception as exc:  # pragma: no cover
         logging.basicConfig(level=logging.ERROR)
         logging.exception("Unhandled exception: %s", exc)
@@ -86,4 +146,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":  # pragma: no cover
+    # Frozen (.exe) builds: worker processes of the normalizer pool run here first
+    freeze_support()
     raise SystemExit(main())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Mapping, MutableMapping
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ...types import SectionStats
+from .summary import Section, class_labels
+
+UNCLASSIFIED = "(unclassified)"
+ROLLUP_COLUMNS = ["Class", "Compounds", "Count", "AvgMatchQuality"]
+
+
+@dataclass(frozen=True)
+class ClassHierarchy:
+    """Class taxonomy with ancestor sets precomputed as integer bitsets.
+
+    Class ``i`` owns bit ``1 << i``; ``ancestors[i]`` has the bits of ``i``
+    and every class above it. Level 0 holds the top-level families.
+    """
+
+    names: tuple[str, ...]
+    index: Mapping[str, int]  # lowercased name -> code
+    ancestors: tuple[int, ...]
+    depth: tuple[int, ...]
+
+    @property
+    def max_depth(self) -> int:
+        return max(self.depth, default=0)
+
+    def level_codes(self, level: int) -> np.ndarray:
+        """Code -> code of its ancestor at ``level`` (shallower classes map to themselves)."""
+        level_mask = 0
+        for code, d in enumerate(self.depth):
+            if d == level:
+                level_mask |= 1 << code
+        return np.array(
+            [
+                code if d <= level else (anc & level_mask).bit_length() - 1
+                for code, (anc, d) in enumerate(zip(self.ancestors, self.depth, strict=True))
+            ],
+            dtype=np.intp,
+        )
+
+
+def load_class_hierarchy(path: Path) -> ClassHierarchy:
+    """Load ``class_hierarchy.yaml`` (``parents: {child: parent}``).
+
+    Raises ValueError on cycles.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    section = raw.get("parents", {}) if isinstance(raw, dict) else {}
+    parent_of: MutableMapping[str, str] = {}
+    names: List[str] = []
+    index: MutableMapping[str, int] = {}
+
+    def _code(name: str) -> int:
+        key = name.strip().lower()
+        if key not in index:
+            index[key] = len(names)
+            names.append(name.strip())
+        return index[key]
+
+    if isinstance(section, dict):
+        for child, parent in section.items():
+            if not isinstance(child, str) or not isinstance(parent, str):
+                continue
+            if not child.strip() or not parent.strip():
+                continue
+            _code(child)
+            _code(parent)
+            parent_of[child.strip().lower()] = parent.strip().lower()
+
+    ancestors: List[int] = [0] * len(names)
+    depth: List[int] = [-1] * len(names)
+
+    def _resolve(key: str, seen: frozenset[str]) -> None:
+        code = index[key]
+        if depth[code] >= 0:
+            return
+        if key in seen:
+            raise ValueError(f"Class hierarchy cycle at '{names[code]}'")
+        parent = parent_of.get(key)
+        if parent is None:
+            ancestors[code], depth[code] = 1 << code, 0
+            return
+        _resolve(parent, seen | {key})
+        pc = index[parent]
+        ancestors[code] = ancestors[pc] | (1 << code)
+        depth[code] = depth[pc] + 1
+
+    for key in index:
+        _resolve(key, frozenset())
+    return ClassHierarchy(
+        names=tuple(names), index=dict(index), ancestors=tuple(ancestors), depth=tuple(depth)
+    )
+
+
+def build_class_rollups(
+    per_sheet: Mapping[str, pd.DataFrame],
+    hierarchy: ClassHierarchy,
+    quality_min: int,
+    show_inferred: bool = False,
+) -> Mapping[int, List[Section]]:
+    """Per (Site > Species) class totals rolled up to each hierarchy level.
+
+    Rows are reduced once to leaf-class totals keyed by integer class code;
+    each level is then a code remap plus one groupby over that small table.
+    Classes missing from the hierarchy roll up as themselves; unmapped
+    compounds use the same labels as the summary sheets (``class_labels``),
+    so inferred classes appear as ``<class> (inferred)`` only with
+    ``show_inferred`` and under ``(unclassified)`` otherwise. Returns
+    ``{level: sections}`` for levels above the leaves.
+    """
+    required = {"Species", "Compound", "Class", "MatchScore"}
+    frames = [
+        pd.DataFrame(
+            {
+                "Site": site,
+                "Species": df["Species"],
+                "Compound": df["Compound"],
+                "Class": class_labels(df, show_inferred),
+                "MatchScore": pd.to_numeric(df["MatchScore"], errors="coerce"),
+            }
+        )
+        for site, df in per_sheet.items()
+        if not df.empty and required.issubset(set(df.columns.astype(str)))
+    ]
+    if not frames:
+        return {}
+    rows = pd.concat(frames, ignore_index=True)
+    rows = rows[rows["MatchScore"].fillna(-1) >= quality_min]
+    species = rows["Species"].astype("string").str.strip()
+    compound = rows["Compound"].astype("string").str.strip()
+    keep = (species.fillna("") != "") & (compound.fillna("") != "")
+    rows = rows.loc[keep].assign(Species=species[keep], Compound=compound[keep])
+    if rows.empty:
+        return {}
+
+    # Encode labels; unknown labels become extra top-level codes after the hierarchy's
+    labels, uniques = pd.factorize(rows["Class"].astype("string").str.strip().fillna(UNCLASSIFIED))
+    names = list(hierarchy.names)
+    label_codes = []
+    for label in uniques.tolist():
+        code = hierarchy.index.get(str(label).lower())
+        if code is None:
+            code = len(names)
+            names.append(str(label))
+        label_codes.append(code)
+    n_extra = len(names) - len(hierarchy.names)
+    rows = rows.assign(_code=np.asarray(label_codes, dtype=np.intp)[labels])
+
+    leaf = (
+        rows.groupby(["Site", "Species", "_code"], sort=False)
+        .agg(
+            Count=("Compound", "size"),
+            Compounds=("Compound", "nunique"),
+            ScoreSum=("MatchScore", "sum"),
+            ScoreN=("MatchScore", "count"),
+        )
+        .reset_index()
+    )
+    site_rank = {site: i for i, site in enumerate(per_sheet)}
+    leaf_codes = leaf["_code"].to_numpy()
+    extra = np.arange(len(hierarchy.names), len(hierarchy.names) + n_extra, dtype=np.intp)
+
+    rollups: MutableMapping[int, List[Section]] = {}
+    for level in range(hierarchy.max_depth):
+        remap = np.concatenate([hierarchy.level_codes(level), extra])
+        agg = (
+            leaf.assign(_code=remap[leaf_codes])
+            .groupby(["Site", "Species", "_code"], sort=False)[
+                ["Count", "Compounds", "ScoreSum", "ScoreN"]
+            ]
+            .sum()
+            .reset_index()
+        )
+        agg = agg.assign(_rank=agg["Site"].map(site_rank)).sort_values(
+            ["_rank", "Species"], kind="mergesort"
+        )
+        sections: List[Section] = []
+        for (site, sp), sub in agg.groupby(["Site", "Species"], sort=False):
+            avg = (sub["ScoreSum"] / sub["ScoreN"].where(sub["ScoreN"] > 0)).round(1)
+            out = pd.DataFrame(
+                {
+                    "Class": [names[c] for c in sub["_code"].tolist()],
+                    "Compounds": sub["Compounds"].astype(int).to_numpy(),
+                    "Count": sub["Count"].astype(int).to_numpy(),
+                    "AvgMatchQuality": avg.to_numpy(),
+                }
+            ).sort_values(["Count", "Class"], ascending=[False, True], kind="mergesort")
+            n_compounds = int(out["Compounds"].sum())
+            n_peaks = int(out["Count"].sum())
+            stats: SectionStats = {
+                "unique_compounds": n_compounds,
+                "total_peaks": n_peaks,
+                "unique_compounds_all": n_compounds,
+                "peaks_all": n_peaks,
+            }
+            sections.append(Section(site=str(site), species=str(sp), df=out, stats=stats))
+        rollups[level] = sections
+    return rollups
@@ -40,12 +40,25 @@ def _first_class_or_mixed(classes: pd.Series) -> str | None:
     return "mixed"
 
 
+def class_labels(df: pd.DataFrame, show_inferred: bool = False) -> pd.Series:
+    """``Class`` as shown in summaries and rollups.
+
+    With ``show_inferred``, compounds missing from classes.yaml show their
+    rule-inferred class as ``<class> (inferred)``; otherwise they stay blank.
+    """
+    if not show_inferred or "InferredClass" not in df.columns:
+        return df["Class"]
+    inferred = (df["InferredClass"].astype("string") + " (inferred)").astype(object)
+    return df["Class"].where(df["Class"].notna(), inferred)
+
+
 def build_summary(
     per_sheet: Mapping[str, pd.DataFrame],
     quality_min: int,
     quality_max: int | None,
     count_min: int,
     count_max: int | None,
+    show_inferred: bool = False,
 ) -> List[Section]:
     """Build per (Site > Species) compound summary sections with flexible filtering.
 
@@ -58,6 +71,7 @@ def build_summary(
         quality_max: Maximum MatchScore (inclusive), None = no upper limit
         count_min: Minimum compound count (inclusive)
         count_max: Maximum compound count (inclusive), None = no upper limit
+        show_inferred: Show rule-inferred classes for unmapped compounds
     """
     sections: List[Section] = []
 
@@ -73,7 +87,7 @@ def build_summary(
             continue
 
         # Filter by quality range and presence of Compound
-        tmp = df.copy()
+        tmp = df.copy(deep=False)
         tmp["MatchScore"] = _safe_numeric(tmp["MatchScore"])  # pandas column access
         tmp = tmp[tmp["MatchScore"].fillna(-1) >= quality_min]
         if quality_max is not None:
@@ -81,6 +95,7 @@ def build_summary(
         tmp = tmp[tmp["Compound"].astype(str).str.strip() != ""]
         if tmp.empty:
             continue
+        tmp["Class"] = class_labels(tmp, show_inferred)
 
         # Group by Species then aggregate by Compound within species
         for species, sub in tmp.groupby("Species", dropna=False):
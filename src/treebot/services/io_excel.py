@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional, cast, Mapping
+from typing import Iterator, Literal, Optional, cast, Mapping
 
 import pandas as pd
 import yaml
@@ -14,11 +16,32 @@ from ..types import SchemaConfig
 SchemaName = Literal["old", "new"]
 
 _schema_cache: SchemaConfig | None = None
+# Preloaded schema snapshot (e.g. UI server) that takes precedence over schema.yaml
+_schema_override: ContextVar[SchemaConfig | None] = ContextVar(
+    "treebot_schema_override", default=None
+)
+
+
+@contextmanager
+def using_schema(schema: SchemaConfig) -> Iterator[None]:
+    """Resolve schema lookups in this context to a preloaded snapshot."""
+    token = _schema_override.set(schema)
+    try:
+        yield
+    finally:
+        _schema_override.reset(token)
+
+
+def active_schema_override() -> SchemaConfig | None:
+    return _schema_override.get()
 
 
 def _load_schema() -> SchemaConfig:
     """Load simplified schema.yaml."""
     global _schema_cache
+    override = _schema_override.get()
+    if override is not None:
+        return override
     if _schema_cache is None:
         schema_path = Path("configs/schema.yaml")
         with open(schema_path, "r", encoding="utf-8") as f:
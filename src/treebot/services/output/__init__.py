@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from .manifest_writer import write_manifest
+from .report_writer import write_csv_report, write_json_report
 
 __all__ = [
+    "write_csv_report",
+    "write_json_report",
     "write_manifest",
 ]
@@ -10,6 +10,7 @@ from ...config import Config
 from .utils import sha256_file
 from ...types import (
     Manifest,
+    ManifestCache,
     ManifestEnvironment,
     ManifestInputs,
     ManifestInputsEntry,
@@ -26,7 +27,16 @@ def write_manifest(
     finished_at: str,
     cfg: Config,
     logger: logging.Logger,
+    class_map_cache: str = "disabled",
+    classes_sha256: str | None = None,
+    schema_input: ManifestInputsEntry | None = None,
 ) -> None:
+    """Write run_manifest.yaml.
+
+    Runs pinned to a config snapshot pass the snapshot's hashes
+    (``classes_sha256``, ``schema_input``) so the manifest records the
+    config the run actually used, not whatever is on disk at the end.
+    """
     import platform
     import sys
     import yaml
@@ -36,9 +46,17 @@ def write_manifest(
             ManifestInputsEntry, {"path": str(input_path), "sha256": sha256_file(input_path)}
         ),
         "classes": cast(
-            ManifestInputsEntry, {"path": str(classes_path), "sha256": sha256_file(classes_path)}
+            ManifestInputsEntry,
+            {
+                "path": str(classes_path),
+                "sha256": classes_sha256
+                if classes_sha256 is not None
+                else sha256_file(classes_path),
+            },
         ),
     }
+    if schema_input is not None:
+        inputs["schema"] = schema_input
 
     params: ManifestParameters = {
         "certainty_threshold": cfg.certainty_threshold,
@@ -55,6 +73,8 @@ def write_manifest(
         "pandas": pd.__version__,
     }
 
+    cache: ManifestCache = {"class_map": class_map_cache}
+
     manifest: Manifest = {
         "pipeline_version": cfg.pipeline_version,
         "started_at": started_at,
@@ -62,6 +82,7 @@ def write_manifest(
         "inputs": inputs,
         "parameters": params,
         "environment": env,
+        "cache": cache,
     }
 
     out_path = run_dir / "run_manifest.yaml"
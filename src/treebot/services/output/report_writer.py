@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Mapping
+
+import pandas as pd
+
+
+def write_json_report(
+    *,
+    run_dir: Path,
+    name: str,
+    payload: Mapping[str, object],
+    logger: logging.Logger,
+) -> Path:
+    """Write a machine-readable report (``<name>``) into the run folder."""
+    out_path = run_dir / name
+    logger.info(f"Writing {name}", extra={"path": str(out_path)})
+    out_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    return out_path
+
+
+def write_csv_report(
+    *,
+    run_dir: Path,
+    name: str,
+    df: pd.DataFrame,
+    logger: logging.Logger,
+) -> Path:
+    """Write a tabular report (``<name>``) into the run folder (UTF-8 with BOM for Excel)."""
+    out_path = run_dir / name
+    logger.info(f"Writing {name}", extra={"path": str(out_path), "rows": len(df)})
+    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    return out_path
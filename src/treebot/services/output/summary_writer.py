@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
 import pandas as pd
 from openpyxl.styles import Alignment, Font
@@ -11,7 +11,12 @@ from openpyxl.worksheet.table import Table, TableStyleInfo
 from ..aggregate.summary import Section
 
 
-def write_sections_to_sheet(std_path: Path, sections: List[Section], sheet_name: str) -> None:
+def write_sections_to_sheet(
+    std_path: Path,
+    sections: List[Section],
+    sheet_name: str,
+    columns: Sequence[str] | None = None,
+) -> None:
     """Append/replace a sheet in an existing standardized workbook.
 
     Each section is labeled 'Site: <site> | Species: <species> (unique_compounds=..., total_compounds=...)'
@@ -22,6 +27,7 @@ def write_sections_to_sheet(std_path: Path, sections: List[Section], sheet_name:
         std_path: Path to the standardized workbook
         sections: List of Section objects to write
         sheet_name: Name of the sheet to create/replace
+        columns: Explicit table columns (e.g. class rollups); default is the compound layout
     """
     with pd.ExcelWriter(std_path, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
         # Start with an empty frame so the sheet exists
@@ -49,7 +55,10 @@ def write_sections_to_sheet(std_path: Path, sections: List[Section], sheet_name:
             start_row = current_row
             # For "Single" sheets, prefer a single RetentionTime column
             single_mode = "single" in sheet_name.lower()
-            if single_mode:
+            if columns is not None:
+                cols = list(columns)
+                df = section.df.reindex(columns=cols)
+            elif single_mode:
                 df = section.df.copy()
                 if "RetentionTime" not in df.columns:
                     if "RetentionMin" in df.columns:
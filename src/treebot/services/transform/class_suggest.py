@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, List, Mapping, MutableMapping, Tuple
+
+import pandas as pd
+
+# Trigrams shared by more than this fraction of keys are too common to narrow
+# the candidate set ("ene", "yl ", ...); they still count toward the score.
+_STOPGRAM_FRACTION = 0.2
+_STOPGRAM_MIN_DF = 32
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Character-trigram inverted index over normalized class-map keys.
+
+    ``top_k`` scores candidates with the Dice coefficient of trigram sets.
+    Only keys sharing at least one selective trigram with the query are
+    scored, so lookups touch a small slice of the map instead of all keys.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self._keys: List[str] = sorted(set(keys))
+        self._grams: List[frozenset[str]] = [_trigrams(k) for k in self._keys]
+        postings: MutableMapping[str, List[int]] = {}
+        for key_id, grams in enumerate(self._grams):
+            for g in grams:
+                postings.setdefault(g, []).append(key_id)
+        self._postings: Mapping[str, List[int]] = postings
+        self._max_df = max(_STOPGRAM_MIN_DF, int(len(self._keys) * _STOPGRAM_FRACTION))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def top_k(self, query: str, k: int = 3, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (key, score) pairs with score >= ``min_score``."""
+        q = _trigrams(query)
+        lists = [self._postings[g] for g in q if g in self._postings]
+        selective = [p for p in lists if len(p) <= self._max_df]
+        candidates: set[int] = set()
+        for plist in selective or lists:
+            candidates.update(plist)
+
+        scored: List[Tuple[float, str]] = []
+        for key_id in candidates:
+            grams = self._grams[key_id]
+            score = 2.0 * len(q & grams) / (len(q) + len(grams))
+            if score >= min_score:
+                scored.append((score, self._keys[key_id]))
+        # Highest score first; ties broken alphabetically for stable reports
+        best = heapq.nsmallest(k, scored, key=lambda t: (-t[0], t[1]))
+        return [(key, round(score, 3)) for score, key in best]
+
+
+def suggest_classes(
+    unmapped: pd.DataFrame,
+    class_map: Mapping[str, str],
+    k: int = 3,
+    min_score: float = 0.3,
+) -> pd.DataFrame:
+    """Curator report rows: top-k class-map keys for each unmapped compound.
+
+    ``unmapped`` needs ``Compound`` and ``count`` columns (as produced by
+    ``derive_compound_and_class``); an optional ``InferredClass`` column is
+    carried through. Returns one row per suggestion, with a single
+    empty-suggestion row for compounds that have no close key.
+    """
+    index = TrigramIndex(class_map.keys())
+    rows: List[dict[str, object]] = []
+    inferred = (
+        unmapped["InferredClass"].tolist()
+        if "InferredClass" in unmapped.columns
+        else [pd.NA] * len(unmapped)
+    )
+    for comp, cnt, inf in zip(
+        unmapped["Compound"].tolist(), unmapped["count"].tolist(), inferred, strict=True
+    ):
+        if not isinstance(comp, str) or not comp.strip():
+            continue
+        base = {"Compound": comp, "Count": int(cnt), "InferredClass": inf}
+        hits = index.top_k(comp, k=k, min_score=min_score)
+        if not hits:
+            rows.append(base)
+        for rank, (key, score) in enumerate(hits, start=1):
+            rows.append(
+                {
+                    **base,
+                    "Rank": rank,
+                    "SuggestedKey": key,
+                    "Score": score,
+                    "SuggestedClass": class_map[key],
+                }
+            )
+    cols = ["Compound", "Count", "InferredClass", "Rank", "SuggestedKey", "Score", "SuggestedClass"]
+    return pd.DataFrame(rows, columns=cols)
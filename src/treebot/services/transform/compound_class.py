@@ -1,50 +1,121 @@
 from __future__ import annotations
 
-from typing import List, Mapping, Tuple
+from typing import Mapping, Tuple
 
+import numpy as np
 import pandas as pd
 
-from ...domain.errors import ErrorCategory, ValidationIssue
-from ...utils.normalize import normalize_compound_name
+from ...domain.errors import ErrorCategory, IssueStore
+from ...utils.normalize import normalize_compound_batch
+from .infer_class import infer_classes
+from .norm_dictionary import NormalizationDictionary
+from .synonyms import SynonymMap
+
+
+def _compound_vocabulary(
+    match1: pd.Series, norm_dict: NormalizationDictionary | None
+) -> Tuple[np.ndarray, list[object]]:
+    """Factorize stripped Match1 and normalize each distinct value once.
+
+    Returns (codes, compounds): blanks get code -1, ``compounds[code]`` is the
+    normalized name of every other row.
+    """
+    raw = match1.astype("string").str.strip()
+    codes, uniques = pd.factorize(raw.mask(raw == ""))
+    unique_raw = pd.Series(uniques.to_numpy(dtype=object), dtype=object)
+    if norm_dict is not None:
+        compounds: list[object] = norm_dict.normalize_unique(unique_raw).tolist()
+    else:
+        compounds = normalize_compound_batch(unique_raw).tolist()
+    return codes, compounds
+
+
+def missing_class_compounds(
+    frames: Mapping[str, pd.DataFrame],
+    class_map: Mapping[str, str],
+    norm_dict: NormalizationDictionary | None = None,
+    synonyms: SynonymMap | None = None,
+) -> pd.DataFrame:
+    """Compounds of several old-schema sheets with no class, without transforming them.
+
+    Match1 of all sheets is factorized together so each distinct name is
+    normalized (and looked up) once. Returns columns Sheet, Compound, Rows.
+    """
+    columns = ["Sheet", "Compound", "Rows"]
+    parts = [df["Match1"] for df in frames.values() if "Match1" in df.columns]
+    names = [name for name, df in frames.items() if "Match1" in df.columns]
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    codes, compounds = _compound_vocabulary(pd.concat(parts, ignore_index=True), norm_dict)
+    canonical = synonyms.canonical if synonyms is not None else {}
+    missing = np.array(
+        [isinstance(c, str) and class_map.get(canonical.get(c, c)) is None for c in compounds]
+        + [False],
+        dtype=bool,
+    )
+    hit = missing[codes]
+    if not hit.any():
+        return pd.DataFrame(columns=columns)
+    sheet_of_row = np.repeat(np.array(names, dtype=object), [len(p) for p in parts])
+    comp_arr = np.array(
+        [canonical.get(c, c) if isinstance(c, str) else c for c in compounds], dtype=object
+    )
+    return (
+        pd.DataFrame({"Sheet": sheet_of_row[hit], "Compound": comp_arr[codes[hit]]})
+        .value_counts(sort=False)
+        .rename("Rows")
+        .reset_index()
+        .sort_values(["Rows", "Sheet", "Compound"], ascending=[False, True, True])
+        .reset_index(drop=True)[columns]
+    )
 
 
 def derive_compound_and_class(
-    df: pd.DataFrame, class_map: Mapping[str, str]
-) -> Tuple[pd.DataFrame, List[ValidationIssue], pd.DataFrame]:
-    out = df.copy()
-    issues: List[ValidationIssue] = []
-
-    # Compound from Match1 (normalized); keep blanks as missing (pd.NA)
-    def _to_compound(val: object) -> object:
-        import pandas as pd  # local import
-
-        if pd.isna(val):
-            return pd.NA
-        s = str(val).strip()
-        if not s:
-            return pd.NA
-        return normalize_compound_name(s)
-
-    out["Compound"] = out["Match1"].map(_to_compound)
-
-    # Class lookup
-    out["Class"] = out["Compound"].map(lambda x: class_map.get(x))
+    df: pd.DataFrame,
+    class_map: Mapping[str, str],
+    norm_dict: NormalizationDictionary | None = None,
+    synonyms: SynonymMap | None = None,
+) -> Tuple[pd.DataFrame, IssueStore, pd.DataFrame]:
+    out = df.copy(deep=False)  # derived columns are assigned, inputs untouched
+    issues = IssueStore()
+
+    # Compound from Match1 (normalized); keep blanks as missing (pd.NA).
+    # Normalize each distinct raw value once and broadcast back through the
+    # factorized codes, so cost scales with vocabulary size, not row count.
+    codes, compounds = _compound_vocabulary(out["Match1"], norm_dict)
+    # Fold synonyms into their canonical names (closure precomputed at load)
+    if synonyms is not None and len(synonyms) and compounds:
+        rows = np.bincount(codes[codes >= 0], minlength=len(compounds))
+        compounds = synonyms.canonicalize_unique(pd.Series(compounds, dtype=object), rows).tolist()
+    # Class lookup per unique compound
+    classes: list[object] = [class_map.get(str(c)) for c in compounds]
+    # Provisional class from naming rules for compounds missing in classes.yaml
+    vocab = pd.Series(compounds, dtype=object)
+    unmapped_vocab = vocab[pd.Series(classes, index=vocab.index, dtype=object).isna()]
+
+    # Trailing sentinel slot: code -1 (missing Match1) indexes the last element
+    comp_arr = np.array(compounds + [pd.NA], dtype=object)
+    class_arr = np.array(classes + [None], dtype=object)
+    inferred_arr = np.full(len(compounds) + 1, None, dtype=object)
+    inferred_arr[unmapped_vocab.index.to_numpy()] = infer_classes(unmapped_vocab).to_numpy()
+    out["Compound"] = pd.Series(comp_arr[codes], index=out.index, dtype=object)
+    out["Class"] = pd.Series(class_arr[codes], index=out.index, dtype=object)
+    out["InferredClass"] = pd.Series(inferred_arr[codes], index=out.index, dtype=object)
+
     missing_class = out["Class"].isna()
-    for i in out.index[missing_class].tolist():
-        issues.append(
-            ValidationIssue(
-                category=ErrorCategory.MAPPING_MISSING,
-                code="CLASS_MISSING",
-                message="Compound missing in classes.yaml",
-                row_index=int(i),
-            )
-        )
+    issues.add_mask(
+        missing_class.to_numpy(),
+        out.index.to_numpy(),
+        ErrorCategory.MAPPING_MISSING,
+        "CLASS_MISSING",
+        "Compound missing in classes.yaml",
+    )
 
     unmapped_compounds = (
-        out.loc[missing_class, ["Compound"]]
+        out.loc[missing_class, ["Compound", "InferredClass"]]
         .assign(count=1)
-        .groupby("Compound", as_index=False)["count"]
-        .sum()
+        .groupby("Compound", as_index=False)
+        .agg(count=("count", "sum"), InferredClass=("InferredClass", "first"))
         .sort_values(["count", "Compound"], ascending=[False, True])
     )
     return out, issues, unmapped_compounds
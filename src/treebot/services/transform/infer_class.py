@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, MutableMapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ClassRule:
+    """One chemical-naming rule.
+
+    ``kind`` is ``"keyword"`` (``pattern`` is a regex matched anywhere in the
+    name) or ``"suffix"`` (``pattern`` is literal name ending). ``classes``
+    are the acceptable classes; the first one is the provisional class.
+    """
+
+    kind: str
+    pattern: str
+    classes: Tuple[str, ...]
+
+    @property
+    def primary(self) -> str:
+        return self.classes[0]
+
+
+# Single rule table shared by the runtime inference below and the audit in
+# scripts/audit_class_mappings.py. Keywords are listed in precedence order
+# (specific families first) and beat suffixes; among suffixes the longest wins.
+CLASS_RULES: Tuple[ClassRule, ...] = (
+    ClassRule("keyword", r"siloxane", ("siloxane",)),
+    ClassRule("keyword", r"\b(?:fluoro|chloro|bromo|iodo)", ("halogen",)),
+    ClassRule("keyword", r"caryophyllene", ("sesquiterpene",)),
+    ClassRule("keyword", r"pinene", ("monoterpene",)),
+    ClassRule("keyword", r"benzene", ("aromatic", "halogen", "monoterpenoid")),
+    ClassRule("keyword", r"\boic acid\b", ("organic.acid",)),
+    ClassRule("keyword", r"\bacid\b", ("organic.acid",)),
+    ClassRule("suffix", "thiol", ("thiol",)),
+    ClassRule("suffix", "al", ("aldehyde",)),
+    ClassRule("suffix", "one", ("ketone", "monoterpenoid")),
+    ClassRule("suffix", "ol", ("alcohol", "monoterpenoid")),
+    ClassRule("suffix", "yne", ("alkyne",)),
+    ClassRule(
+        "suffix",
+        "ene",
+        ("alkene", "monoterpene", "sesquiterpene", "terpene", "aromatic", "monoterpenoid"),
+    ),
+    ClassRule(
+        "suffix",
+        "ane",
+        (
+            "alkane",
+            "monoterpene",
+            "sesquiterpene",
+            "organosilicon",
+            "siloxane",
+            "epoxide",
+            "halogen",
+        ),
+    ),
+)
+
+_KEYWORD_RULES: Tuple[ClassRule, ...] = tuple(r for r in CLASS_RULES if r.kind == "keyword")
+_SUFFIX_RULES: Tuple[ClassRule, ...] = tuple(r for r in CLASS_RULES if r.kind == "suffix")
+
+_TrieNode = MutableMapping[str, object]
+_LABEL = "\0"  # trie slot holding the class for a complete suffix
+
+
+def _build_suffix_trie(rules: Iterable[Tuple[str, str]]) -> _TrieNode:
+    """Trie over reversed suffixes: walking a reversed name finds every suffix in one pass."""
+    root: _TrieNode = {}
+    for suffix, cls in rules:
+        node = root
+        for ch in reversed(suffix):
+            child = node.get(ch)
+            if not isinstance(child, dict):
+                child = {}
+                node[ch] = child
+            node = child
+        node[_LABEL] = cls
+    return root
+
+
+_SUFFIX_TRIE: _TrieNode = _build_suffix_trie((r.pattern, r.primary) for r in _SUFFIX_RULES)
+# One alternation with a named group per rule: a single scan finds every keyword
+_KEYWORD_RE = re.compile(
+    "|".join(f"(?P<k{i}>{r.pattern})" for i, r in enumerate(_KEYWORD_RULES)), re.I
+)
+
+
+def _match_suffix(parent: str) -> Optional[str]:
+    node = _SUFFIX_TRIE
+    found: Optional[str] = None
+    for ch in reversed(parent):
+        child = node.get(ch)
+        if not isinstance(child, dict):
+            break
+        node = child
+        label = node.get(_LABEL)
+        if isinstance(label, str):
+            found = label  # keep walking: longer suffixes are more specific
+    return found
+
+
+def infer_class(compound: str) -> Optional[str]:
+    """Provisional class for a normalized compound name, or None if no rule applies."""
+    best: Optional[int] = None
+    for m in _KEYWORD_RE.finditer(compound):
+        idx = int(str(m.lastgroup)[1:])
+        if best is None or idx < best:
+            best = idx
+    if best is not None:
+        return _KEYWORD_RULES[best].primary
+    parent = compound.split(",", 1)[0].strip()
+    return _match_suffix(parent)
+
+
+def infer_classes(compounds: pd.Series) -> pd.Series:
+    """``infer_class`` over a Series of normalized names (None where no rule applies).
+
+    Each distinct name goes through the keyword scan and suffix trie once;
+    results are broadcast back through the factorized codes.
+    """
+    codes, uniques = pd.factorize(compounds.to_numpy(dtype=object))
+    classes = [infer_class(c) if isinstance(c, str) and c else None for c in uniques]
+    # Trailing sentinel slot: code -1 (missing name) indexes the last element
+    table = np.array([*classes, None], dtype=object)
+    return pd.Series(table[codes], index=compounds.index, dtype=object)
@@ -4,6 +4,6 @@ import pandas as pd
 
 
 def derive_matchscore(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
+    out = df.copy(deep=False)
     out["MatchScore"] = pd.to_numeric(out["Match1.Quality"], errors="coerce")
     return out
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import MutableMapping
+
+import pandas as pd
+
+from ...utils.normalize import normalize_compound_batch, normalizer_ruleset_hash
+
+_FORMAT_VERSION = 1
+_LOCK_TIMEOUT_S = 10.0
+_LOCK_STALE_S = 120.0
+
+
+class NormalizationDictionary:
+    """On-disk raw -> normalized compound dictionary shared across runs.
+
+    - One JSON file per normalizer ruleset (``normalize_<hash>.json``); a rule
+      change produces a new hash, so stale dictionaries are never consulted
+    - Loaded lazily on first lookup; new strings are added in memory
+    - ``save()`` merges with whatever is on disk under a lock file, stamps the
+      entries used by this run, evicts entries unused for ``max_idle_runs``
+      runs, and replaces the file atomically (safe for concurrent runs)
+    """
+
+    def __init__(self, cache_dir: Path, max_idle_runs: int = 20) -> None:
+        self.cache_dir = cache_dir
+        self.max_idle_runs = max_idle_runs
+        self.ruleset = normalizer_ruleset_hash()
+        self.path = cache_dir / f"normalize_{self.ruleset[:16]}.json"
+        self.hits = 0
+        self.misses = 0
+        self._entries: MutableMapping[str, tuple[str, int]] | None = None
+        self._used: set[str] = set()
+        self._new: MutableMapping[str, str] = {}
+
+    def _read_disk(self) -> tuple[int, MutableMapping[str, tuple[str, int]]]:
+        """Return (run counter, entries) from disk; empty when missing/invalid."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0, {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _FORMAT_VERSION
+            or data.get("ruleset") != self.ruleset
+        ):
+            return 0, {}
+        entries: MutableMapping[str, tuple[str, int]] = {}
+        raw_entries = data.get("entries", {})
+        if isinstance(raw_entries, dict):
+            for raw, val in raw_entries.items():
+                if isinstance(val, list) and len(val) == 2:
+                    entries[str(raw)] = (str(val[0]), int(val[1]))
+        return int(data.get("runs", 0)), entries
+
+    def _loaded(self) -> MutableMapping[str, tuple[str, int]]:
+        if self._entries is None:
+            _, self._entries = self._read_disk()
+        return self._entries
+
+    def normalize_unique(self, values: pd.Series) -> pd.Series:
+        """Normalize distinct raw strings, consulting the dictionary first.
+
+        Missing values stay missing. Only strings never seen before are run
+        through ``normalize_compound_batch``.
+        """
+        entries = self._loaded()
+        result: list[object] = []
+        miss_pos: list[int] = []
+        misses: list[str] = []
+        for pos, raw in enumerate(values.tolist()):
+            if not isinstance(raw, str):
+                result.append(pd.NA)
+                continue
+            hit = entries.get(raw)
+            norm = hit[0] if hit is not None else self._new.get(raw)
+            if norm is None:
+                result.append(pd.NA)
+                miss_pos.append(pos)
+                misses.append(raw)
+                continue
+            result.append(norm)
+            self._used.add(raw)
+            self.hits += 1
+
+        if misses:
+            normalized = normalize_compound_batch(pd.Series(misses, dtype=object)).tolist()
+            for pos, raw, norm in zip(miss_pos, misses, normalized, strict=True):
+                result[pos] = norm
+                self._new[raw] = str(norm)
+            self.misses += len(misses)
+        return pd.Series(result, index=values.index, dtype=object)
+
+    def save(self) -> bool:
+        """Merge this run's lookups into the on-disk dictionary.
+
+        Returns False when the lock could not be acquired (the dictionary is
+        an optimization; skipping a save never affects results).
+        """
+        if not self._used and not self._new:
+            return True
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        lock = self.path.with_suffix(".lock")
+        owned = _acquire_lock(lock)
+        if owned is None:
+            return False
+        try:
+            runs, entries = self._read_disk()
+            run = runs + 1
+            for raw, norm in self._new.items():
+                entries[raw] = (norm, run)
+            for raw in self._used:
+                cur = entries.get(raw)
+                if cur is not None:
+                    entries[raw] = (cur[0], run)
+            cutoff = run - self.max_idle_runs
+            kept = {raw: val for raw, val in entries.items() if val[1] > cutoff}
+            payload = {
+                "version": _FORMAT_VERSION,
+                "ruleset": self.ruleset,
+                "runs": run,
+                "entries": {raw: [norm, last] for raw, (norm, last) in kept.items()},
+            }
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+            # Dictionaries built by other rulesets can never be hit again
+            for old in self.cache_dir.glob("normalize_*.json"):
+                if old != self.path:
+                    old.unlink(missing_ok=True)
+            self._entries = kept
+            self._new = {}
+            self._used = set()
+            return True
+        finally:
+            _release_lock(lock, owned)
+
+
+def _acquire_lock(lock: Path) -> str | None:
+    """Create ``lock`` exclusively, holding ``"<pid> <ns>"``; returns that token, or None on timeout."""
+    token = f"{os.getpid()} {time.time_ns()}"
+    deadline = time.monotonic() + _LOCK_TIMEOUT_S
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _break_stale_lock(lock):
+                continue
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(token)
+        return token
+
+
+def _read_lock(lock: Path) -> tuple[str, tuple[int, int]] | None:
+    """(owner token, (inode, mtime_ns)) of ``lock``; None when it is gone."""
+    try:
+        st = lock.stat()
+        return lock.read_text(encoding="utf-8"), (st.st_ino, st.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def _owner_gone(token: str) -> bool:
+    parts = token.split()
+    if os.name != "posix" or len(parts) != 2 or not parts[0].isdigit():
+        return False  # unknown owner (or no safe PID probe): rely on the age check
+    try:
+        os.kill(int(parts[0]), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # exists but belongs to another user
+    return False
+
+
+def _break_stale_lock(lock: Path) -> bool:
+    """Remove ``lock`` if its owner died or it outlived ``_LOCK_STALE_S``.
+
+    Returns True when the caller should retry creating the lock at once. The
+    file is re-read just before unlinking and only removed if it is still the
+    same one (token, inode and mtime), so a lock re-created by a new owner is
+    never deleted.
+    """
+    seen = _read_lock(lock)
+    if seen is None:
+        return True  # released meanwhile
+    token, identity = seen
+    if time.time_ns() - identity[1] <= _LOCK_STALE_S * 1e9 and not _owner_gone(token):
+        return False
+    if _read_lock(lock) == seen:
+        lock.unlink(missing_ok=True)
+    return True
+
+
+def _release_lock(lock: Path, token: str) -> None:
+    """Unlink ``lock`` only while it still holds our token (not broken as stale meanwhile)."""
+    seen = _read_lock(lock)
+    if seen is not None and seen[0] == token:
+        lock.unlink(missing_ok=True)
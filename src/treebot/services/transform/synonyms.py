@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from typing import Mapping, MutableMapping
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ...utils.normalize import normalize_compound_name
+
+
+class SynonymMap:
+    """Flat normalized-name -> canonical-name lookup.
+
+    - The transitive closure is resolved once at load time, so applying the
+      map is a single dictionary lookup per distinct compound
+    - Counts rows folded into each canonical name for the canonicalization
+      report
+    """
+
+    def __init__(self, canonical: Mapping[str, str]) -> None:
+        self.canonical = canonical
+        self._merged: Counter[tuple[str, str]] = Counter()
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    def canonicalize_unique(self, compounds: pd.Series, rows: np.ndarray) -> pd.Series:
+        """Map distinct normalized compounds to their canonical names.
+
+        ``rows`` holds the row count behind each entry of ``compounds``; it is
+        only used for the report. Names without a synonym pass through.
+        """
+        mapped = compounds.map(self.canonical)
+        changed = mapped.notna().to_numpy()
+        for name, canon, n in zip(
+            compounds[changed].tolist(), mapped[changed].tolist(), rows[changed].tolist()
+        ):
+            self._merged[(str(name), str(canon))] += int(n)
+        return mapped.where(changed, compounds)
+
+    def report(self) -> pd.DataFrame:
+        """Rows folded per (Canonical, MergedName), largest first."""
+        df = pd.DataFrame(
+            [(canon, name, n) for (name, canon), n in self._merged.items()],
+            columns=["Canonical", "MergedName", "Rows"],
+        )
+        return df.sort_values(
+            ["Canonical", "Rows", "MergedName"], ascending=[True, False, True]
+        ).reset_index(drop=True)
+
+
+def _closure(groups: list[tuple[str, list[str]]]) -> Mapping[str, str]:
+    """Union-find over synonym groups; return {name: canonical} for non-canonical names.
+
+    Each root is the earliest-declared canonical in its merged group, so the
+    result does not depend on the order in which unions happen.
+    """
+    parent: MutableMapping[str, str] = {}
+    order: MutableMapping[str, int] = {}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    def add(x: str) -> None:
+        if x not in parent:
+            parent[x] = x
+            order[x] = len(order)
+
+    for canon, names in groups:
+        add(canon)
+        for name in names:
+            add(name)
+            ra, rb = find(canon), find(name)
+            if ra != rb:
+                if order[rb] < order[ra]:
+                    ra, rb = rb, ra
+                parent[rb] = ra
+
+    flat: MutableMapping[str, str] = {}
+    for name in parent:
+        root = find(name)
+        if root != name:
+            flat[name] = root
+    return flat
+
+
+def load_synonym_map(path: Path) -> SynonymMap:
+    """Load ``synonyms.yaml`` (``synonyms: {canonical: [name, ...]}``).
+
+    Keys and names are normalized like ``classes.yaml`` keys so they line up
+    with the ``Compound`` column.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    section = raw.get("synonyms", {}) if isinstance(raw, dict) else {}
+    groups: list[tuple[str, list[str]]] = []
+    if isinstance(section, dict):
+        for canon, names in section.items():
+            if not isinstance(canon, str) or not canon.strip():
+                continue
+            if isinstance(names, str):
+                names = [names]
+            if not isinstance(names, list):
+                continue
+            groups.append(
+                (
+                    normalize_compound_name(canon),
+                    [normalize_compound_name(n) for n in names if isinstance(n, str) and n.strip()],
+                )
+            )
+    return SynonymMap(_closure(groups))
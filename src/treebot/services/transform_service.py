@@ -2,26 +2,30 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import List, Mapping
+from typing import Mapping
 
 import pandas as pd
 
-from ..domain.errors import ValidationIssue
+from ..domain.errors import IssueStore
+from .transform.norm_dictionary import NormalizationDictionary
 from .transform.old_to_new import old_to_new as _old_to_new
+from .transform.synonyms import SynonymMap
 
 
 @dataclass(frozen=True)
 class TransformResult:
     df: pd.DataFrame
-    issues: List[ValidationIssue]
+    issues: IssueStore
     unmapped_compounds: pd.DataFrame
 
 
 def transform_old_to_new(
     df_old: pd.DataFrame,
     class_map: Mapping[str, str],
+    norm_dict: NormalizationDictionary | None = None,
+    synonyms: SynonymMap | None = None,
 ) -> TransformResult:
-    final, issues, unmapped = _old_to_new(df_old, class_map)
+    final, issues, unmapped = _old_to_new(df_old, class_map, norm_dict, synonyms)
     return TransformResult(df=final, issues=issues, unmapped_compounds=unmapped)
 
 
@@ -33,6 +37,8 @@ class TransformService:
         self,
         df_old: pd.DataFrame,
         class_map: Mapping[str, str],
+        norm_dict: NormalizationDictionary | None = None,
+        synonyms: SynonymMap | None = None,
     ) -> TransformResult:
         self.logger.info("Transforming old->new", extra={"rows": len(df_old)})
-        return transform_old_to_new(df_old, class_map)
+        return transform_old_to_new(df_old, class_map, norm_dict, synonyms)
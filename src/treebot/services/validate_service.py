@@ -8,28 +8,45 @@ import pandas as pd
 
 from ..services.io_excel import SchemaName
 from .validation.headers import normalize_headers
-from .validation.dates import parse_dates_to_iso
-from .validation.keys import trim_cartridge, forward_fill_columns
+from .validation.dates import DateIssues, parse_dates_to_iso
+from .validation.blanks import BlankMasks
+from .validation.consistency import ConsistencyResult, check_new_schema_consistency
+from .validation.duplicates import DuplicateKeys, find_duplicate_keys
+from .validation.keys import clean_identity_columns, trim_cartridge, forward_fill_columns
 from ..types import ForwardFillCounts, ForwardFillExamples, ForwardFillValues
 from .validation.species_map import (
+    SpeciesLookup,
     apply_species_mapping,
+    fill_species_multi,
     load_species_map as _load_species_map,
-    site_key_from_sheet_name,
 )
-from .validation.class_map import load_class_map
+from .validation.site_resolver import SiteResolver, default_site_resolver
+from .validation.class_map import load_class_map, load_class_map_cached
+from .transform.norm_dictionary import NormalizationDictionary
 
 
 class ValidateService:
     """Lightweight service for header normalization and basic cleanup."""
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self, logger: logging.Logger, sites: SiteResolver | None = None) -> None:
         self.logger = logger
+        self._sites: SiteResolver | None = sites
+
+    @property
+    def sites(self) -> SiteResolver:
+        """Site resolver for this service (memoized decisions feed the resolution report)."""
+        if self._sites is None:
+            self._sites = default_site_resolver()
+        return self._sites
+
+    def site_resolution_report(self) -> pd.DataFrame:
+        return self.sites.report()
 
     def normalize_headers(self, df: pd.DataFrame, schema: SchemaName) -> pd.DataFrame:
         return normalize_headers(df, schema)
 
-    def parse_dates_to_iso(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, list[str]]:
-        """Parse dates to ISO format. Returns (df, warnings)."""
+    def parse_dates_to_iso(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, DateIssues]:
+        """Parse dates to ISO format. Returns (df, issues)."""
         return parse_dates_to_iso(df)
 
     def trim_cartridge(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -52,24 +69,45 @@ class ValidateService:
         cols = [c for c in ["DataFolderName", "CartridgeNum"] if c in df.columns]
         if not cols:
             return (
-                df.copy(),
+                df.copy(deep=False),
                 {"DataFolderName": 0, "CartridgeNum": 0},
                 {"DataFolderName": [], "CartridgeNum": []},
                 {"DataFolderName": [], "CartridgeNum": []},
             )
         return forward_fill_columns(df, cols)
 
+    def clean_identities(
+        self, df: pd.DataFrame, masks: BlankMasks | None = None
+    ) -> tuple[
+        pd.DataFrame,
+        ForwardFillCounts,
+        ForwardFillExamples,
+        ForwardFillValues,
+    ]:
+        """Forward-fill DataFolderName/CartridgeNum and trim CartridgeNum in one pass.
+
+        Same return shape as ``forward_fill_identities``; ``masks`` receives the
+        remaining blanks of both columns.
+        """
+        cols = [c for c in ["DataFolderName", "CartridgeNum"] if c in df.columns]
+        return clean_identity_columns(df, cols, trim=("CartridgeNum",), masks=masks)
+
     def load_class_map(self, path: Path) -> Mapping[str, str]:
         self.logger.info("Loading classes map", extra={"path": str(path)})
         mp = load_class_map(path)
         self.logger.info("Loaded classes map", extra={"entries": len(mp)})
         return mp
 
-    def load_species_map(
-        self, path: Path
-    ) -> tuple[Mapping[tuple[str, str], str], list[tuple[str, str]]]:
+    def load_class_map_cached(self, path: Path, cache_dir: Path) -> tuple[Mapping[str, str], bool]:
+        """Load classes map via the compiled cache; returns (map, cache_hit)."""
+        self.logger.info("Loading classes map", extra={"path": str(path)})
+        mp, hit = load_class_map_cached(path, cache_dir)
+        self.logger.info("Loaded classes map", extra={"entries": len(mp), "cache_hit": hit})
+        return mp, hit
+
+    def load_species_map(self, path: Path) -> tuple[SpeciesLookup, list[tuple[str, str]]]:
         self.logger.info("Loading species map", extra={"path": str(path)})
-        mp, ambiguous = _load_species_map(path)
+        mp, ambiguous = _load_species_map(path, self.sites)
         self.logger.info(
             "Loaded species map",
             extra={"entries": len(mp), "ambiguous_keys": len(ambiguous)},
@@ -83,17 +121,55 @@ class ValidateService:
                 )
         return mp, ambiguous
 
+    def check_consistency(
+        self,
+        df: pd.DataFrame,
+        class_map: Mapping[str, str],
+        sheet: str,
+        norm_dict: NormalizationDictionary | None = None,
+    ) -> ConsistencyResult:
+        """New-schema Compound/Class/MatchScore consistency (report only)."""
+        return check_new_schema_consistency(df, class_map, sheet, norm_dict)
+
+    def find_duplicate_keys(self, frames: Mapping[str, pd.DataFrame]) -> DuplicateKeys:
+        """(DateRun, CartridgeNum) keys used by more than one DataFolderName/sheet."""
+        dups = find_duplicate_keys(frames)
+        if len(dups):
+            for r in dups.report.head(5).itertuples(index=False):
+                self.logger.warning(
+                    "Duplicate key: (DateRun, CartridgeNum) used by several runs",
+                    extra={
+                        "date_run": r.DateRun,
+                        "cartridge": r.CartridgeNum,
+                        "sheets": r.Sheets,
+                        "folders": r.DataFolderNames,
+                    },
+                )
+        return dups
+
     def apply_species_mapping(
         self,
         df: pd.DataFrame,
         sheet_name: str,
-        species_map: Mapping[tuple[str, str], str] | None,
+        species_map: SpeciesLookup | None,
     ) -> tuple[pd.DataFrame, int, list[tuple[int, str, str]]]:
         """Apply species mapping for a given sheet; no overwrite of existing values."""
-        if not species_map:
-            return df.copy(), 0, []
-        site_key = site_key_from_sheet_name(sheet_name)
+        if species_map is None or species_map.empty:
+            return df.copy(deep=False), 0, []
+        site_key = self.sites.resolve(sheet_name)
         if site_key is None:
             # Unknown site -> skip silently
-            return df.copy(), 0, []
+            return df.copy(deep=False), 0, []
         return apply_species_mapping(df, site_key, species_map)
+
+    def apply_species_mapping_all(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        species_map: SpeciesLookup | None,
+        masks: Mapping[str, BlankMasks] | None = None,
+    ) -> Mapping[str, tuple[pd.DataFrame, int, list[tuple[int, str, str]]]]:
+        """Apply species mapping to every sheet with one lookup; sheets without a site key are untouched."""
+        if species_map is None or species_map.empty:
+            return {name: (df.copy(deep=False), 0, []) for name, df in frames.items()}
+        site_keys = {name: key for name in frames if (key := self.sites.resolve(name)) is not None}
+        return fill_species_multi(frames, site_keys, species_map, masks)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Iterable, MutableMapping, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns whose blanks drive per-sheet diagnostics and the species fill
+DIAGNOSTIC_COLUMNS = (
+    "Species",
+    "CartridgeNum",
+    "DataFolderName",
+    "Match1.Quality",
+    "Match2.Quality",
+    "Match3.Quality",
+)
+
+
+def stripped_and_blank(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Stripped text plus the blank mask (missing or whitespace-only).
+
+    Text is an object array: ``str(value).strip()`` for present values (so
+    numeric cartridge numbers keep their text) and None where missing.
+    Missing values are never stringified.
+    """
+    s = pd.Series(values, dtype=object, copy=False)
+    missing = s.isna().to_numpy()
+    text = np.full(len(s), None, dtype=object)
+    text[~missing] = s[~missing].astype(str).str.strip().to_numpy(dtype=object)
+    blank = missing.copy()
+    blank[~missing] = text[~missing] == ""
+    return text, blank
+
+
+def blank_mask(values: np.ndarray) -> np.ndarray:
+    return stripped_and_blank(values)[1]
+
+
+class BlankMasks:
+    """Per-sheet blank masks: one boolean array per column, row-aligned with the frame.
+
+    - Computed once (at ingestion or on first use) and then kept current by the
+      steps that change a column: they ``set`` a mask they already derived or
+      ``clear`` the rows they filled
+    - A mask whose length no longer matches the frame is recomputed
+    """
+
+    def __init__(self) -> None:
+        self._masks: MutableMapping[str, np.ndarray] = {}
+
+    def __contains__(self, col: str) -> bool:
+        return col in self._masks
+
+    def set(self, col: str, mask: np.ndarray) -> None:
+        self._masks[col] = np.asarray(mask, dtype=bool)
+
+    def clear(self, col: str, positions: np.ndarray) -> None:
+        """Rows at ``positions`` were filled in ``col``."""
+        mask = self._masks.get(col)
+        if mask is not None and len(positions):
+            mask[positions] = False
+
+    def compute(self, df: pd.DataFrame, columns: Iterable[str]) -> "BlankMasks":
+        for col in columns:
+            if col in df.columns:
+                self._masks[col] = blank_mask(df[col].to_numpy(dtype=object))
+        return self
+
+    def get(self, df: pd.DataFrame, col: str) -> Optional[np.ndarray]:
+        """Blank mask for ``col`` of ``df``; None if the column is absent."""
+        if col not in df.columns:
+            return None
+        mask = self._masks.get(col)
+        if mask is None or len(mask) != len(df):
+            mask = self._masks[col] = blank_mask(df[col].to_numpy(dtype=object))
+        return mask
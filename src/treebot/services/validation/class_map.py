@@ -1,20 +1,90 @@
 from __future__ import annotations
 
+import json
+import os
+import sys
 from pathlib import Path
 from typing import Mapping, MutableMapping
 
 import yaml
 
-from ...utils.normalize import normalize_compound_name
+from ...utils.normalize import normalize_compound_name, normalizer_ruleset_hash
+from ..output.utils import sha256_file
+
+# libyaml-backed loader when available (much faster on the 1000+ entry map)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_CACHE_FORMAT = 2
 
 
 def load_class_map(path: Path) -> Mapping[str, str]:
     with path.open("r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YAML_LOADER)
     mapping: MutableMapping[str, str] = {}
+    labels: MutableMapping[str, str] = {}
     mp = raw.get("map", {}) if isinstance(raw, dict) else {}
     for k, v in mp.items():
         if not isinstance(k, str) or not isinstance(v, str):
             continue
-        mapping[normalize_compound_name(k)] = v
+        # Intern class labels: ~20 distinct strings shared by 1000+ entries
+        label = labels.setdefault(v, sys.intern(v))
+        mapping[normalize_compound_name(k)] = label
     return mapping
+
+
+def load_class_map_cached(path: Path, cache_dir: Path) -> tuple[Mapping[str, str], bool]:
+    """Load the class map through a compiled on-disk cache.
+
+    The cache file is keyed by the sha256 of ``classes.yaml`` plus the
+    normalizer ruleset hash, so editing either invalidates it. Returns
+    ``(mapping, cache_hit)``; any cache problem (missing, corrupt, written
+    by another version) falls back to a normal load and rewrites the cache.
+    The cache is plain JSON, so a shared cache directory is only ever data.
+    """
+    digest = sha256_file(path)
+    ruleset = normalizer_ruleset_hash()
+    cache_path = cache_dir / f"classes_{digest[:16]}_{ruleset[:16]}.json"
+    try:
+        cached = _read_cache(cache_path, digest, ruleset)
+    except Exception:
+        cached = None
+    if cached is not None:
+        return cached, True
+
+    mapping = load_class_map(path)
+    labels = sorted(set(mapping.values()))
+    index = {label: i for i, label in enumerate(labels)}
+    payload = {
+        "format": _CACHE_FORMAT,
+        "sha256": digest,
+        "ruleset": ruleset,
+        "labels": labels,
+        # Values are indexes into ``labels`` so the loader can share one object per class
+        "map": {k: index[v] for k, v in mapping.items()},
+    }
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, cache_path)
+        # Caches for other class maps / rulesets can never be hit again
+        for old in cache_dir.glob("classes_*"):
+            if old != cache_path and not old.name.endswith(".tmp"):
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return mapping, False
+
+
+def _read_cache(cache_path: Path, digest: str, ruleset: str) -> Mapping[str, str] | None:
+    payload = json.loads(cache_path.read_text(encoding="utf-8"))
+    if not (
+        isinstance(payload, dict)
+        and payload.get("format") == _CACHE_FORMAT
+        and payload.get("sha256") == digest
+        and payload.get("ruleset") == ruleset
+    ):
+        return None
+    labels = [sys.intern(label) for label in payload["labels"]]
+    if not all(isinstance(label, str) for label in labels):
+        return None
+    return {str(k): labels[i] for k, i in payload["map"].items()}
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from ...domain.errors import ErrorCategory, IssueStore
+from ...utils.normalize import normalize_compound_batch
+from ..transform.norm_dictionary import NormalizationDictionary
+
+CONSISTENCY_COLUMNS = ["Sheet", "Check", "Row", "Match1", "Expected", "Actual"]
+_MESSAGES: Mapping[str, str] = {
+    "COMPOUND_MISMATCH": "Compound does not match normalized Match1",
+    "CLASS_MISMATCH": "Class does not match classes.yaml for Compound",
+    "MATCHSCORE_MISMATCH": "MatchScore does not match Match1.Quality",
+}
+
+
+@dataclass(frozen=True)
+class ConsistencyResult:
+    """Mismatch counts per check, the first few mismatching rows, and issues."""
+
+    counts: Mapping[str, int]
+    samples: pd.DataFrame
+    issues: IssueStore
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+
+def _normalized(
+    values: pd.Series, norm_dict: NormalizationDictionary | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Normalized value per row via its distinct raw value: (codes, table).
+
+    ``table`` has a trailing ``None`` slot so code -1 (blank) maps to missing.
+    """
+    raw = values.astype("string").str.strip()
+    codes, uniques = pd.factorize(raw.mask(raw == ""))
+    unique_raw = pd.Series(uniques.to_numpy(dtype=object), dtype=object)
+    if norm_dict is not None:
+        norm = norm_dict.normalize_unique(unique_raw)
+    else:
+        norm = normalize_compound_batch(unique_raw)
+    table = np.array(norm.tolist() + [None], dtype=object)
+    table[pd.isna(table)] = None
+    return codes, table
+
+
+def _differs(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Elementwise ``expected != actual`` where two missing values are equal."""
+    exp_na, act_na = pd.isna(expected), pd.isna(actual)
+    with np.errstate(invalid="ignore"):
+        same = (exp_na & act_na) | (~exp_na & ~act_na & (expected == actual))
+    return ~np.asarray(same, dtype=bool)
+
+
+def check_new_schema_consistency(
+    df: pd.DataFrame,
+    class_map: Mapping[str, str],
+    sheet: str = "",
+    norm_dict: NormalizationDictionary | None = None,
+    max_samples: int = 5,
+) -> ConsistencyResult:
+    """Check stored Compound/Class/MatchScore of a new-schema sheet.
+
+    - Compound: normalized(Compound) must equal normalized(Match1)
+    - Class: must equal classes.yaml[normalized(Compound)] when the compound is mapped
+    - MatchScore: must equal numeric(Match1.Quality)
+
+    Normalization and class lookups run once per distinct value; comparisons
+    are vectorized over the rows.
+    """
+    issues = IssueStore()
+    counts: dict[str, int] = {}
+    samples: list[pd.DataFrame] = []
+    index = df.index.to_numpy()
+    match1 = (
+        df["Match1"].to_numpy(dtype=object)
+        if "Match1" in df.columns
+        else np.full(len(df), None, dtype=object)
+    )
+
+    def _record(check: str, bad: np.ndarray, expected: np.ndarray, actual: np.ndarray) -> None:
+        counts[check] = int(bad.sum())
+        if not counts[check]:
+            return
+        issues.add_mask(bad, index, ErrorCategory.SCHEMA_ERROR, check, _MESSAGES[check], sheet)
+        pos = np.flatnonzero(bad)[:max_samples]
+        samples.append(
+            pd.DataFrame(
+                {
+                    "Sheet": sheet,
+                    "Check": check,
+                    "Row": index[pos],
+                    "Match1": match1[pos],
+                    "Expected": expected[pos],
+                    "Actual": actual[pos],
+                }
+            )
+        )
+
+    if "Compound" in df.columns and "Match1" in df.columns:
+        m_codes, m_table = _normalized(df["Match1"], norm_dict)
+        c_codes, c_table = _normalized(df["Compound"], norm_dict)
+        expected = m_table[m_codes]
+        _record(
+            "COMPOUND_MISMATCH", _differs(expected, c_table[c_codes]), expected, c_table[c_codes]
+        )
+
+        if "Class" in df.columns:
+            # Expected class per distinct normalized Compound; unmapped compounds are skipped
+            class_table = np.array(
+                [class_map.get(c) if isinstance(c, str) else None for c in c_table], dtype=object
+            )
+            expected_cls = class_table[c_codes]
+            stored = df["Class"].astype("string").str.strip().to_numpy(dtype=object)
+            stored[pd.isna(stored)] = None
+            mapped = ~pd.isna(expected_cls)
+            bad = mapped & _differs(expected_cls, stored)
+            _record("CLASS_MISMATCH", bad, expected_cls, stored)
+
+    if "MatchScore" in df.columns and "Match1.Quality" in df.columns:
+        quality = pd.to_numeric(df["Match1.Quality"], errors="coerce").to_numpy(dtype=float)
+        score = pd.to_numeric(df["MatchScore"], errors="coerce").to_numpy(dtype=float)
+        q_na, s_na = np.isnan(quality), np.isnan(score)
+        same = (q_na & s_na) | (~q_na & ~s_na & np.isclose(quality, score, equal_nan=False))
+        _record(
+            "MATCHSCORE_MISMATCH",
+            ~same,
+            quality.astype(object),
+            score.astype(object),
+        )
+
+    report = (
+        pd.concat(samples, ignore_index=True)
+        if samples
+        else pd.DataFrame(columns=CONSISTENCY_COLUMNS)
+    )
+    return ConsistencyResult(counts=counts, samples=report, issues=issues)
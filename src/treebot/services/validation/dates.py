@@ -1,48 +1,130 @@
 from __future__ import annotations
 
-import re
-from typing import Tuple
+import datetime as dt
+from dataclasses import dataclass
+from typing import Mapping, Tuple
 
+import numpy as np
 import pandas as pd
 
 
-_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:\s.+)?$")
+_ISO_DATE_RE = r"^(\d{4})-(\d{2})-(\d{2})(?:\s.+)?$"
+_US_DATE_RE = r"^(\d+)/(\d+)/(\d+)$"
+# Excel serial day numbers: day 0 is 1899-12-30 (Lotus leap-year bug included)
+_EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+_EXCEL_SERIAL_MAX = 2958465  # 9999-12-31
 
+_EMPTY, _BAD = -1, -2  # sentinel codes in the per-unique result
 
-def parse_dates_to_iso(df: pd.DataFrame) -> Tuple[pd.DataFrame, list[str]]:
+
+@dataclass(frozen=True)
+class DateIssues:
+    """Rows whose DateRun is empty or unparseable (row positions, ascending).
+
+    Messages are only formatted on request, for the first ``limit`` rows.
+    """
+
+    empty: np.ndarray
+    unparseable: np.ndarray
+    raw: pd.Series
+
+    def __len__(self) -> int:
+        return len(self.empty) + len(self.unparseable)
+
+    @property
+    def counts(self) -> Mapping[str, int]:
+        return {"empty": len(self.empty), "unparseable": len(self.unparseable)}
+
+    def messages(self, limit: int) -> list[str]:
+        rows = np.sort(np.concatenate([self.empty, self.unparseable]))[: max(limit, 0)]
+        bad = set(self.unparseable.tolist())
+        out: list[str] = []
+        for i in rows.tolist():
+            if i in bad:
+                v = str(self.raw.iloc[i]).strip()
+                out.append(
+                    f"Row {i}: Unparseable DateRun '{v}' (expected M/D/YYYY, ISO or an Excel date)"
+                )
+            else:
+                out.append(f"Row {i}: DateRun is empty")
+        return out
+
+
+def _parse_unique(values: pd.Series) -> pd.Series:
+    """ISO date string per distinct raw value; ``_EMPTY``/``_BAD`` markers otherwise."""
+    out = pd.Series(_BAD, index=values.index, dtype=object)
+
+    is_dt = values.map(lambda v: isinstance(v, (dt.date, np.datetime64))).astype(bool)
+    is_num = values.map(
+        lambda v: isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool)
+    ).astype(bool)
+    is_str = values.map(lambda v: isinstance(v, str)).astype(bool)
+
+    # datetime/date cells
+    if is_dt.any():
+        stamps = pd.to_datetime(values[is_dt], errors="coerce")
+        out[is_dt] = stamps.dt.strftime("%Y-%m-%d").where(stamps.notna(), _BAD)
+
+    # Excel serial numbers
+    if is_num.any():
+        nums = pd.to_numeric(values[is_num], errors="coerce").astype(float)
+        valid = nums.notna() & (nums >= 1) & (nums <= _EXCEL_SERIAL_MAX)
+        days = pd.to_timedelta(np.floor(nums.where(valid, 0)), unit="D")
+        iso = (_EXCEL_EPOCH + days).dt.strftime("%Y-%m-%d")
+        out[is_num] = iso.where(valid, _BAD).where(nums.notna(), _EMPTY)
+
+    # Text: ISO (optionally with a time part) or US M/D/YYYY
+    if is_str.any():
+        text = values[is_str].astype(str).str.strip()
+        empty = (text == "") | (text.str.lower() == "nan")
+        iso_p = text.str.extract(_ISO_DATE_RE)
+        us_p = text.str.extract(_US_DATE_RE)
+        # combine_first keeps the object dtype (fillna would downcast all-NaN columns)
+        y = iso_p[0].combine_first(us_p[2])
+        m = iso_p[1].combine_first(us_p[0])
+        d = iso_p[2].combine_first(us_p[1])
+        has = y.notna()
+        parts = pd.DataFrame(
+            {
+                "year": pd.to_numeric(y, errors="coerce"),
+                "month": pd.to_numeric(m, errors="coerce"),
+                "day": pd.to_numeric(d, errors="coerce"),
+            }
+        )
+        stamps = pd.to_datetime(parts.where(has, pd.NA), errors="coerce")
+        iso = stamps.dt.strftime("%Y-%m-%d")
+        res = iso.where(stamps.notna(), _BAD).where(~empty, _EMPTY)
+        out[is_str] = res
+
+    # Missing values (None/NaN/NaT) are empty
+    out[values.isna()] = _EMPTY
+    return out
+
+
+def parse_dates_to_iso(df: pd.DataFrame) -> Tuple[pd.DataFrame, DateIssues]:
     """
     Parse DateRun column to ISO format (YYYY-MM-DD).
-    Accepts: M/D/YYYY or YYYY-MM-DD
-    Returns: (DataFrame with parsed dates, list of warning messages)
+    Accepts: datetime cells, Excel serial numbers, M/D/YYYY or YYYY-MM-DD
+    Each distinct value is parsed once and broadcast back to its rows.
+    Returns: (DataFrame with parsed dates, issues for empty/unparseable rows)
     """
-    warnings: list[str] = []
-    isos: list[str | None] = []
-
-    for i, v in enumerate(df["DateRun"].astype(str).tolist()):
-        v = v.strip()
-        if not v or v.lower() == "nan":
-            warnings.append(f"Row {i}: DateRun is empty")
-            isos.append(None)
-            continue
-
-        # Accept YYYY-MM-DD (ISO format)
-        m1 = _ISO_DATE_RE.match(v)
-        if m1:
-            yy, mm, dd = int(m1.group(1)), int(m1.group(2)), int(m1.group(3))
-            isos.append(f"{yy:04d}-{mm:02d}-{dd:02d}")
-            continue
-
-        # Accept M/D/YYYY
-        try:
-            m_s, d_s, y_s = v.split("/")
-            mm = int(m_s)
-            dd = int(d_s)
-            yy = int(y_s)
-            isos.append(f"{yy:04d}-{mm:02d}-{dd:02d}")
-        except Exception:
-            warnings.append(f"Row {i}: Unparseable DateRun '{v}' (expected M/D/YYYY or ISO)")
-            isos.append(None)
-
-    df2 = df.copy()
-    df2["DateRun"] = isos
-    return df2, warnings
+    col = df["DateRun"]
+    raw = col.to_numpy(dtype=object)
+    # factorize alone merges equal values of different types (1, 1.0, True);
+    # pair each value code with the cell's Python type so they parse separately
+    values, _ = pd.factorize(raw, use_na_sentinel=False)
+    kinds, types = pd.factorize(col.map(type).to_numpy(dtype=object))
+    codes, _ = pd.factorize(values.astype(np.int64) * len(types) + kinds)
+    _, first = np.unique(codes, return_index=True)
+    parsed = _parse_unique(pd.Series(raw[first], dtype=object)).tolist()
+    table = np.array(parsed, dtype=object)
+    is_iso = np.array([isinstance(r, str) for r in table], dtype=bool)
+    is_empty = np.array([not isinstance(r, str) and r == _EMPTY for r in table], dtype=bool)
+    table[~is_iso] = None
+    result = table[codes]
+    empty = np.flatnonzero(is_empty[codes])
+    bad = np.flatnonzero((~is_iso & ~is_empty)[codes])
+
+    df2 = df.copy(deep=False)  # only DateRun is replaced
+    df2["DateRun"] = result
+    return df2, DateIssues(empty=empty, unparseable=bad, raw=col)
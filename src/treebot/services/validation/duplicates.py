@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from ...domain.errors import ErrorCategory, IssueStore
+from .blanks import blank_mask
+
+DUPLICATE_COLUMNS = ["DateRun", "CartridgeNum", "Sheets", "DataFolderNames", "Rows"]
+DUPLICATE_MESSAGE = "(DateRun, CartridgeNum) used by more than one DataFolderName/sheet"
+
+
+@dataclass(frozen=True)
+class DuplicateKeys:
+    """Keys claimed by more than one (sheet, DataFolderName) and the rows using them."""
+
+    report: pd.DataFrame
+    issues: IssueStore
+
+    def __len__(self) -> int:
+        return len(self.report)
+
+
+def find_duplicate_keys(frames: Mapping[str, pd.DataFrame]) -> DuplicateKeys:
+    """Find (DateRun, CartridgeNum) keys shared by different runs.
+
+    Many rows (peaks) per key are expected; a key is a duplicate when it
+    appears under more than one (sheet, DataFolderName) owner, within a sheet
+    or across sheets. Keys and owners of every sheet are hashed into one
+    uint64 array each; a single hash-based dedup of (key, owner) pairs finds
+    the duplicate keys, and only their rows are materialized for the report.
+    Rows with a blank DateRun or CartridgeNum are ignored. Identity columns
+    are expected already trimmed (``clean_identity_columns``); values are
+    hashed as they are and only the duplicate rows are turned into text.
+    """
+    parts: list[pd.DataFrame] = []
+    for name, df in frames.items():
+        if "DateRun" not in df.columns or "CartridgeNum" not in df.columns:
+            continue
+        dates = df["DateRun"].to_numpy(dtype=object)
+        carts = df["CartridgeNum"].to_numpy(dtype=object)
+        keep = ~(blank_mask(dates) | blank_mask(carts))
+        if not keep.any():
+            continue
+        folders = (
+            df["DataFolderName"].to_numpy(dtype=object)
+            if "DataFolderName" in df.columns
+            else np.full(len(df), None, dtype=object)
+        )
+        parts.append(
+            pd.DataFrame(
+                {
+                    "Sheet": name,
+                    "Row": df.index.to_numpy()[keep],
+                    "DateRun": dates[keep],
+                    "CartridgeNum": carts[keep],
+                    # Missing folder names count as one blank owner
+                    "DataFolderName": pd.Series(folders[keep], dtype=object).fillna(""),
+                },
+            )
+        )
+
+    issues = IssueStore()
+    if not parts:
+        return DuplicateKeys(pd.DataFrame(columns=DUPLICATE_COLUMNS), issues)
+    rows = pd.concat(parts, ignore_index=True)
+    key = pd.util.hash_pandas_object(rows[["DateRun", "CartridgeNum"]], index=False)
+    owner = pd.util.hash_pandas_object(rows[["Sheet", "DataFolderName"]], index=False)
+    pairs = pd.DataFrame({"key": key.to_numpy(), "owner": owner.to_numpy()}).drop_duplicates()
+    owners_per_key = pairs["key"].value_counts()
+    dup_keys = owners_per_key.index[owners_per_key.to_numpy() > 1]
+    if not len(dup_keys):
+        return DuplicateKeys(pd.DataFrame(columns=DUPLICATE_COLUMNS), issues)
+
+    dup = rows.loc[key.isin(dup_keys).to_numpy()]
+    dup = dup.assign(
+        DateRun=dup["DateRun"].astype(str),
+        CartridgeNum=dup["CartridgeNum"].astype(str),
+        DataFolderName=dup["DataFolderName"].astype(str),
+    )
+    for sheet, g in dup.groupby("Sheet", sort=False):
+        issues.add_rows(
+            g["Row"].to_numpy(),
+            ErrorCategory.DUPLICATE_KEY,
+            "DUPLICATE_KEY",
+            DUPLICATE_MESSAGE,
+            str(sheet),
+        )
+    report = dup.groupby(["DateRun", "CartridgeNum"], sort=True).size().rename("Rows").reset_index()
+    report["Sheets"] = _joined(dup, "Sheet")
+    report["DataFolderNames"] = _joined(dup, "DataFolderName")
+    return DuplicateKeys(report[DUPLICATE_COLUMNS], issues)
+
+
+def _joined(dup: pd.DataFrame, col: str) -> list[str]:
+    """Sorted distinct ``col`` values per key (in key order), comma-joined."""
+    u = dup[["DateRun", "CartridgeNum", col]].drop_duplicates()
+    u = u.sort_values(["DateRun", "CartridgeNum", col], kind="mergesort")
+    k = u[["DateRun", "CartridgeNum"]]
+    starts = np.flatnonzero(k.ne(k.shift()).any(axis=1).to_numpy()).tolist()
+    vals = u[col].tolist()
+    return [", ".join(vals[s:e]) for s, e in zip(starts, starts[1:] + [len(vals)], strict=True)]
@@ -5,7 +5,7 @@ from pathlib import Path
 import pandas as pd
 import yaml
 
-from ..io_excel import SchemaName
+from ..io_excel import SchemaName, active_schema_override
 from ...types import SchemaConfig
 from typing import MutableMapping, Mapping, cast
 
@@ -16,6 +16,9 @@ _schema_config: SchemaConfig | None = None
 def _load_schema_config() -> SchemaConfig:
     """Load schema.yaml once and cache it."""
     global _schema_config
+    override = active_schema_override()
+    if override is not None:
+        return override
     if _schema_config is None:
         schema_path = Path(__file__).parent.parent.parent.parent.parent / "configs" / "schema.yaml"
         with open(schema_path, "r", encoding="utf-8") as f:
@@ -1,74 +1,74 @@
 from __future__ import annotations
 
+from typing import Iterable, Optional
+
+import numpy as np
 import pandas as pd
 from ...types import ForwardFillCounts, ForwardFillExamples, ForwardFillValues
+from .blanks import BlankMasks, stripped_and_blank
 
 
 def trim_cartridge(df: pd.DataFrame) -> pd.DataFrame:
     """Remove leading/trailing whitespace from CartridgeNum column."""
-    df2 = df.copy()
+    df2 = df.copy(deep=False)
     df2["CartridgeNum"] = df2["CartridgeNum"].astype(str).str.strip()
     return df2
 
 
-def _forward_fill_series(
-    s: pd.Series,
-) -> tuple[pd.Series, int, list[int], list[str]]:
-    """Forward-fill a Series where empty/whitespace is treated as missing.
+def _clean_column(values: np.ndarray, trim: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Blank detection, trim and forward-fill over one object array.
 
-    Returns (filled_series, filled_count, filled_indices), where filled_count is
-    the number of positions that were empty-like and became non-empty due to the
-    fill, and filled_indices are the index labels where a fill occurred.
+    Returns (out, filled_mask, still_blank_mask). Blank means missing or
+    whitespace-only; leading blanks stay missing (None). With ``trim`` every
+    value is stringified and stripped, otherwise original objects are kept.
     """
-    # Treat empty strings/whitespace as missing for fill purposes
-    empty_like = s.isna() | (s.astype(str).str.strip() == "")
-    s2 = s.copy()
-    s2 = s2.mask(empty_like, other=pd.NA)
-    # Opt into pandas future behavior to avoid downcasting warning during ffill
-    # and keep behavior stable across pandas versions.
-    with pd.option_context("future.no_silent_downcasting", True):
-        s3 = s2.ffill()
-    # Additionally, infer objects to normalize dtype without copying.
-    s3 = s3.infer_objects(copy=False)
-    filled = (empty_like) & (s3.notna())
-    try:
-        idxs = [int(i) for i in s.index[filled].tolist()]
-    except Exception:
-        idxs = []
-
-    # Provide sample filled values for logging (aligned with idxs order)
-    samples: list[str] = []
-    for i in idxs[:5]:
-        try:
-            samples.append(str(s3.loc[i]))
-        except Exception:
-            samples.append("")
+    text, blank = stripped_and_blank(values)
 
-    return s3, int(filled.sum()), idxs, samples
+    # Position of the last non-blank at or before each row (-1 if none yet)
+    pos = np.arange(len(values))
+    src = np.maximum.accumulate(np.where(blank, -1, pos)) if len(values) else pos
 
+    base = text.astype(object) if trim else values.astype(object, copy=True)
+    out = base[np.maximum(src, 0)]
+    missing = src < 0
+    out[missing] = None
+    return out, blank & ~missing, missing
 
-def forward_fill_columns(
-    df: pd.DataFrame, columns: list[str]
+
+def clean_identity_columns(
+    df: pd.DataFrame,
+    columns: list[str],
+    trim: Iterable[str] = ("CartridgeNum",),
+    masks: Optional[BlankMasks] = None,
 ) -> tuple[pd.DataFrame, ForwardFillCounts, ForwardFillExamples, ForwardFillValues]:
-    """Forward-fill selected columns, treating blanks as missing.
+    """Forward-fill and trim identity columns in a single pass per column.
 
-    - Only affects provided columns; no cross-column logic
-    - First non-empty establishes value; top-of-column blanks remain blank
-    - Returns (new_df, counts) where counts[col] = number of cells filled
+    - Blanks are detected once per column on the NumPy object array
+    - Columns in ``trim`` are stringified and stripped in the same pass
+    - Counts, filled index labels and sample values come from that pass
+    - ``masks`` (optional) receives each column's remaining blanks
     """
-    df2 = df.copy()
-    # Accumulate generically, then coerce to fixed-key TypedDicts
+    df2 = df.copy(deep=False)
+    to_trim = set(trim)
     _counts: dict[str, int] = {}
     _examples: dict[str, list[int]] = {}
     _values: dict[str, list[str]] = {}
 
     for col in columns:
-        if col in df2.columns:
-            filled_series, n, idxs, vals = _forward_fill_series(df2[col])
-            df2[col] = filled_series
-            _counts[col] = n
-            _examples[col] = idxs
-            _values[col] = vals
+        if col not in df2.columns:
+            continue
+        out, filled, missing = _clean_column(df2[col].to_numpy(dtype=object), col in to_trim)
+        df2[col] = pd.Series(out, index=df2.index, dtype=object).infer_objects()
+        if masks is not None:
+            masks.set(col, missing)
+        where = np.flatnonzero(filled)
+        try:
+            idxs = [int(i) for i in df2.index[where].tolist()]
+        except Exception:
+            idxs = []
+        _counts[col] = len(where)
+        _examples[col] = idxs
+        _values[col] = [str(out[p]) for p in where[:5]]
 
     counts: ForwardFillCounts = {
         "DataFolderName": _counts.get("DataFolderName", 0),
@@ -83,3 +83,15 @@ def forward_fill_columns(
         "CartridgeNum": _values.get("CartridgeNum", []),
     }
     return df2, counts, examples, example_values
+
+
+def forward_fill_columns(
+    df: pd.DataFrame, columns: list[str]
+) -> tuple[pd.DataFrame, ForwardFillCounts, ForwardFillExamples, ForwardFillValues]:
+    """Forward-fill selected columns, treating blanks as missing.
+
+    - Only affects provided columns; no cross-column logic
+    - First non-empty establishes value; top-of-column blanks remain blank
+    - Returns (new_df, counts) where counts[col] = number of cells filled
+    """
+    return clean_identity_columns(df, columns, trim=())
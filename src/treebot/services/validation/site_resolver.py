@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping, MutableMapping, Optional
+
+import pandas as pd
+import yaml
+
+_SITES_PATH = Path(__file__).parent.parent.parent.parent.parent / "configs" / "sites.yaml"
+_END = "\0"  # trie node marker holding the site key of an alias ending there
+
+
+def norm_site_token(s: str) -> str:
+    return re.sub(r"[^a-z]", "", s.lower())
+
+
+@dataclass(frozen=True)
+class SiteResolution:
+    value: str
+    token: str
+    site_key: Optional[str]
+    method: str  # "exact" | "prefix" | "fuzzy" | "unresolved"
+    distance: int = 0
+
+
+def _bounded_levenshtein(a: str, b: str, bound: int) -> int:
+    """Edit distance, or ``bound + 1`` as soon as it must exceed ``bound``."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        for j, cb in enumerate(b, start=1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > bound:
+            return bound + 1
+        prev = cur
+    return prev[-1]
+
+
+class SiteResolver:
+    """Resolve sheet names / mapping values to site keys.
+
+    - Exact alias token first, then the longest alias that prefixes the token
+      (``StuntRanch-B`` -> ``stunt``), then a bounded edit distance fallback
+      that must pick a single site
+    - Every decision is memoized per raw value and kept for ``report()``
+    """
+
+    def __init__(
+        self, aliases: Mapping[str, str], max_distance: int = 2, min_prefix: int = 4
+    ) -> None:
+        self._exact: Mapping[str, str] = dict(aliases)
+        self.max_distance = max_distance
+        self.min_prefix = min_prefix
+        self._trie: MutableMapping[str, object] = {}
+        for token, key in self._exact.items():
+            node = self._trie
+            for ch in token:
+                node = node.setdefault(ch, {})  # type: ignore[assignment]
+            node[_END] = key
+        self._memo: MutableMapping[str, SiteResolution] = {}
+
+    def resolve(self, value: str) -> Optional[str]:
+        return self.resolution(value).site_key
+
+    def resolution(self, value: str) -> SiteResolution:
+        hit = self._memo.get(value)
+        if hit is None:
+            hit = self._memo[value] = self._decide(value)
+        return hit
+
+    def _decide(self, value: str) -> SiteResolution:
+        token = norm_site_token(value)
+        key = self._exact.get(token)
+        if key is not None:
+            return SiteResolution(value, token, key, "exact")
+        if not token:
+            return SiteResolution(value, token, None, "unresolved")
+
+        # Longest alias that is a prefix of the token
+        node: Mapping[str, object] = self._trie
+        best: Optional[str] = None
+        for depth, ch in enumerate(token, start=1):
+            nxt = node.get(ch)
+            if not isinstance(nxt, dict):
+                break
+            node = nxt
+            end = node.get(_END)
+            if isinstance(end, str) and depth >= self.min_prefix:
+                best = end
+        if best is not None:
+            return SiteResolution(value, token, best, "prefix")
+
+        # Typos: closest alias within the bound, only if a single site is that close
+        bound = self.max_distance if len(token) >= 6 else min(1, self.max_distance)
+        if len(token) < self.min_prefix:
+            bound = 0
+        best_dist = bound + 1
+        keys: set[str] = set()
+        for alias, site in self._exact.items():
+            dist = _bounded_levenshtein(token, alias, min(bound, best_dist))
+            if dist < best_dist:
+                best_dist, keys = dist, {site}
+            elif dist == best_dist and dist <= bound:
+                keys.add(site)
+        if best_dist <= bound and len(keys) == 1:
+            return SiteResolution(value, token, keys.pop(), "fuzzy", best_dist)
+        return SiteResolution(value, token, None, "unresolved")
+
+    def report(self) -> pd.DataFrame:
+        """One row per distinct value resolved so far."""
+        return pd.DataFrame(
+            [
+                {
+                    "Value": r.value,
+                    "Token": r.token,
+                    "SiteKey": r.site_key,
+                    "Method": r.method,
+                    "Distance": r.distance,
+                }
+                for r in self._memo.values()
+            ],
+            columns=["Value", "Token", "SiteKey", "Method", "Distance"],
+        )
+
+
+def load_site_aliases(path: Path = _SITES_PATH) -> Mapping[str, str]:
+    """Alias token -> site key from ``sites.yaml`` (``sites: {key: [alias, ...]}``).
+
+    Parsed files are cached by modification time and size, so edits to
+    ``sites.yaml`` are picked up by the next resolver.
+    """
+    st = path.stat()
+    return _load_site_aliases(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_site_aliases(path: Path, mtime_ns: int, size: int) -> Mapping[str, str]:
+    with path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    section = raw.get("sites", {}) if isinstance(raw, dict) else {}
+    aliases: MutableMapping[str, str] = {}
+    if isinstance(section, dict):
+        for key, names in section.items():
+            if not isinstance(key, str) or not norm_site_token(key):
+                continue
+            site = norm_site_token(key)
+            aliases[site] = site
+            for name in names if isinstance(names, list) else []:
+                token = norm_site_token(str(name))
+                if token:
+                    aliases.setdefault(token, site)
+    return aliases
+
+
+def default_site_resolver() -> SiteResolver:
+    """Fresh resolver over the current ``configs/sites.yaml`` (one per run)."""
+    return SiteResolver(load_site_aliases())
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Iterable, Mapping, Optional, Tuple, MutableMapping
 
+import numpy as np
 import pandas as pd
 
+from .blanks import BlankMasks
+from .site_resolver import SiteResolver, default_site_resolver
+
 
 # Canonical headers we support from the mapping workbook
 _HEADER_ALIASES: Mapping[str, str] = {
@@ -38,53 +43,48 @@ def _rename_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _strip_to_str(x: object) -> Optional[str]:
-    if x is None:
-        return None
-    s = str(x).strip()
-    return s if s else None
-
-
-def _norm_site_token(s: str) -> str:
-    return re.sub(r"[^a-z]", "", s.lower())
-
-
-# Site tokens to canonical site keys used for joining
-_SITE_TOKEN_TO_KEY: Mapping[str, str] = {
-    # Emerson Oaks
-    "emerson": "emerson",
-    "emersonoaks": "emerson",
-    # Stunt Ranch
-    "stunt": "stunt",
-    "stuntranch": "stunt",
-    # Rancho
-    "rancho": "rancho",
-    # Fort Ord
-    "fortord": "fortord",
-    "for tord": "fortord",
-    # Blue Oak
-    "blueoak": "blueoak",
-    # Point Reyes
-    "pointreyes": "pointreyes",
-    # Angelo
-    "angelo": "angelo",
-    # Lassen
-    "lassen": "lassen",
-    # Sagehen
-    "sagehen": "sagehen",
-    # Yosemite
-    "yosemite": "yosemite",
-}
+_LOOKUP_INDEX = ["SiteKey", "CartridgeNum"]
+
+
+@dataclass(frozen=True)
+class SpeciesLookup:
+    """Species lookup tables built by ``load_species_map``.
+
+    - ``table``: (SiteKey, CartridgeNum) -> PlantSpecies (unique index) for
+      keys with a single species (dated or not), plus the undated species of
+      reused keys as their fallback
+    - ``dated``: SiteKey, CartridgeNum, Date, PlantSpecies rows sorted by Date,
+      only for keys mapped to more than one species; a row resolves to the
+      latest entry dated on or before its DateRun, else to ``table``
+    """
+
+    table: pd.Series
+    dated: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return bool(self.table.empty and self.dated.empty)
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self.dated)
+
 
+def _strip_to_str(s: pd.Series) -> pd.Series:
+    """Trimmed strings with null/blank cells as missing."""
+    out = s.astype("string").str.strip()
+    return out.mask(out == "")
 
-def site_key_from_sheet_name(sheet_name: str) -> Optional[str]:
-    token = _norm_site_token(sheet_name)
-    return _SITE_TOKEN_TO_KEY.get(token)
 
+def site_key_from_sheet_name(
+    sheet_name: str, resolver: SiteResolver | None = None
+) -> Optional[str]:
+    return (resolver or default_site_resolver()).resolve(sheet_name)
 
-def site_key_from_mapping_value(site_value: str) -> Optional[str]:
-    token = _norm_site_token(site_value)
-    return _SITE_TOKEN_TO_KEY.get(token)
+
+def site_key_from_mapping_value(
+    site_value: str, resolver: SiteResolver | None = None
+) -> Optional[str]:
+    return (resolver or default_site_resolver()).resolve(site_value)
 
 
 def _iter_mapping_frames(path: Path) -> Iterable[pd.DataFrame]:
@@ -105,89 +105,225 @@ def _iter_mapping_frames(path: Path) -> Iterable[pd.DataFrame]:
             yield pd.read_csv(path, sep="\t")
 
 
-def load_species_map(path: Path) -> Tuple[Mapping[Tuple[str, str], str], list[Tuple[str, str]]]:
-    """Load (Site, CartridgeNum) -> PlantSpecies mapping from workbook.
+def empty_species_lookup() -> SpeciesLookup:
+    index = pd.MultiIndex.from_arrays([[], []], names=_LOOKUP_INDEX)
+    return SpeciesLookup(
+        table=pd.Series([], index=index, dtype=object, name="PlantSpecies"),
+        dated=pd.DataFrame(columns=[*_LOOKUP_INDEX, "Date", "PlantSpecies"]),
+    )
+
+
+def load_species_map(
+    path: Path, resolver: SiteResolver | None = None
+) -> Tuple[SpeciesLookup, list[Tuple[str, str]]]:
+    """Load (Site, CartridgeNum[, Date]) -> PlantSpecies lookup tables from workbook.
 
     - Accepts multiple sheets; applies header aliasing (old -> canonical)
-    - Normalizes Site to a site key; trims strings
-    - Returns (map, ambiguous_keys)
-    - Ambiguous keys are (site_key, cartridge) pairs with conflicting PlantSpecies
+    - Trims strings and drops rows with a blank Site/CartridgeNum/PlantSpecies
+    - Resolves each distinct Site value to a site key once with ``resolver``
+      (the run's resolver, so its decisions land in site_resolution.csv;
+      default: a fresh one over ``configs/sites.yaml``); unresolved sites are dropped
+    - Keys with a single species go to the static table whether or not the
+      rows are dated, so they fill every run date (and rows without DateRun)
+    - Keys with several species (cartridges reused across seasons) resolve by
+      date: their dated rows go to the dated table, and a single undated
+      species (if any) stays in the static table as the fallback
+    - Returns (lookup, ambiguous_keys): (site_key, cartridge) pairs with
+      conflicting undated species and no dated entries, or two species on the
+      same date; those entries are left out of the lookup
     """
-    mapping: MutableMapping[Tuple[str, str], str] = {}
-    conflicts: MutableMapping[Tuple[str, str], set[str]] = {}
-
+    cols = ["Site", "CartridgeNum", "PlantSpecies"]
+    frames = []
     for raw in _iter_mapping_frames(path):
         df = _rename_columns(raw)
         # Only proceed if required columns exist
-        if not {"Site", "CartridgeNum", "PlantSpecies"}.issubset(set(df.columns)):
+        if set(cols).issubset(set(df.columns)):
+            frames.append(df[[*cols, "Date"]] if "Date" in df.columns else df[cols])
+    if not frames:
+        return empty_species_lookup(), []
+
+    sub = pd.concat(frames, ignore_index=True)
+    dates = (
+        pd.to_datetime(sub["Date"], errors="coerce").dt.normalize()
+        if "Date" in sub.columns
+        else pd.Series(pd.NaT, index=sub.index, dtype="datetime64[ns]")
+    )
+    sub = pd.DataFrame({c: _strip_to_str(sub[c]) for c in cols}).assign(Date=dates)
+    sub = sub.dropna(subset=cols)
+    codes, sites = pd.factorize(sub["Site"])
+    resolve = (resolver or default_site_resolver()).resolve
+    site_keys = [resolve(str(s)) for s in sites]
+    sub = sub.assign(SiteKey=pd.Series(site_keys, dtype=object).to_numpy()[codes]).dropna(
+        subset=["SiteKey"]
+    )
+    if sub.empty:
+        return empty_species_lookup(), []
+    sub = sub.astype({"CartridgeNum": object, "PlantSpecies": object})
+
+    # Only keys with more than one species need the date; the rest map directly
+    n_all = sub.groupby(_LOOKUP_INDEX, sort=False)["PlantSpecies"].transform("nunique")
+    reused = (n_all > 1).to_numpy()
+    has_date = sub["Date"].notna().to_numpy()
+
+    # Dated entries: one species per (site, cartridge, date), sorted for as-of joins
+    dated = sub[reused & has_date]
+    day_keys = [*_LOOKUP_INDEX, "Date"]
+    n_day = dated.groupby(day_keys, sort=False)["PlantSpecies"].nunique()
+    day_conflicts = n_day[n_day > 1].index
+    dated = dated.drop_duplicates(day_keys)
+    if len(day_conflicts):
+        dated = dated[~dated.set_index(day_keys).index.isin(day_conflicts)]
+    dated = dated[[*day_keys, "PlantSpecies"]].sort_values("Date", kind="mergesort")
+
+    undated = sub[~reused | ~has_date]
+    n_species = undated.groupby(_LOOKUP_INDEX, sort=False)["PlantSpecies"].nunique()
+    conflicted = n_species[n_species > 1].index
+    table = undated.drop_duplicates(_LOOKUP_INDEX).set_index(_LOOKUP_INDEX)["PlantSpecies"]
+    if len(conflicted):
+        table = table[~table.index.isin(conflicted)]
+
+    # Conflicting undated keys are only ambiguous when no dated entry can resolve them
+    dated_keys = pd.MultiIndex.from_frame(dated[_LOOKUP_INDEX])
+    ambiguous: list[Tuple[str, str]] = [
+        (str(s), str(c)) for s, c in conflicted[~conflicted.isin(dated_keys)]
+    ]
+    ambiguous += list(dict.fromkeys((str(s), str(c)) for s, c, _ in day_conflicts))
+    return SpeciesLookup(table=table, dated=dated.reset_index(drop=True)), ambiguous
+
+
+def _resolve_dated(
+    dated: pd.DataFrame, sites: np.ndarray, carts: np.ndarray, run_dates: np.ndarray
+) -> np.ndarray:
+    """As-of join: species of the latest entry dated on/before each DateRun (None if none)."""
+    out = np.full(len(sites), None, dtype=object)
+    left = pd.DataFrame(
+        {
+            "SiteKey": sites,
+            "CartridgeNum": carts,
+            "Date": pd.to_datetime(pd.Series(run_dates), format="%Y-%m-%d", errors="coerce"),
+            "_pos": np.arange(len(sites)),
+        }
+    ).dropna(subset=["Date"])
+    if left.empty or dated.empty:
+        return out
+    joined = pd.merge_asof(
+        left.sort_values("Date", kind="mergesort"),
+        dated.astype({"Date": left["Date"].dtype}),
+        on="Date",
+        by=_LOOKUP_INDEX,
+        direction="backward",
+    )
+    hit = joined["PlantSpecies"].notna().to_numpy()
+    out[joined["_pos"].to_numpy()[hit]] = joined["PlantSpecies"].to_numpy(dtype=object)[hit]
+    return out
+
+
+def fill_species_multi(
+    frames: Mapping[str, pd.DataFrame],
+    site_keys: Mapping[str, str],
+    species_map: SpeciesLookup,
+    masks: Optional[Mapping[str, BlankMasks]] = None,
+) -> dict[str, Tuple[pd.DataFrame, int, list[Tuple[int, str, str]]]]:
+    """Fill missing Species for several sheets with one lookup.
+
+    Candidate rows (empty Species, non-empty CartridgeNum) from every sheet
+    with a site key are stacked into one key array. Dated entries are
+    resolved against each row's DateRun with one sorted as-of join; the rest
+    use a single ``Index.get_indexer`` against the undated table. Hits are
+    written back per sheet with a masked assignment.
+
+    - ``site_keys`` come from the caller's resolver (``ValidateService.sites``
+      for a run), so sheet names resolve once per run against current ``sites.yaml``
+    - Does not overwrite existing non-empty Species values
+    - ``masks`` (optional, per sheet) supplies the Species/CartridgeNum blanks
+      and has filled Species rows cleared
+    - Returns {sheet: (new_df, filled_count, examples[(row_index, cartridge, species)])}
+    """
+    names: list[str] = []
+    positions: list[np.ndarray] = []
+    sites: list[np.ndarray] = []
+    carts: list[np.ndarray] = []
+    run_dates: list[np.ndarray] = []
+    for name, df in frames.items():
+        site_key = site_keys.get(name)
+        if site_key is None or "CartridgeNum" not in df.columns:
             continue
-        sub = df[["Site", "CartridgeNum", "PlantSpecies"]].copy()
-        # Trim and normalize
-        sub["Site"] = sub["Site"].map(_strip_to_str)
-        sub["CartridgeNum"] = sub["CartridgeNum"].map(_strip_to_str)
-        sub["PlantSpecies"] = sub["PlantSpecies"].map(_strip_to_str)
-        sub = sub.dropna(subset=["Site", "CartridgeNum", "PlantSpecies"])
-
-        for _, row in sub.iterrows():
-            site_raw = str(row["Site"])  # already non-null
-            site_key = site_key_from_mapping_value(site_raw)
-            if site_key is None:
-                continue
-            cart = str(row["CartridgeNum"])  # already non-null
-            sp = str(row["PlantSpecies"])  # already non-null
-            key = (site_key, cart)
-            if key not in mapping:
-                mapping[key] = sp
-                conflicts.setdefault(key, set()).add(sp)
-            else:
-                # Track potential conflicts
-                conflicts.setdefault(key, set()).add(sp)
-
-    ambiguous: list[Tuple[str, str]] = []
-    # Remove ambiguous keys with differing species
-    for key, vals in conflicts.items():
-        if len(vals) > 1:
-            ambiguous.append(key)
-            if key in mapping:
-                del mapping[key]
-
-    return mapping, ambiguous
+        sheet_masks = masks.get(name) if masks is not None else None
+        if sheet_masks is None:
+            sheet_masks = BlankMasks()
+        empty_species = sheet_masks.get(df, "Species")
+        if empty_species is None:
+            empty_species = np.ones(len(df), dtype=bool)
+        empty_cart = sheet_masks.get(df, "CartridgeNum")
+        if empty_cart is None:
+            continue
+        pos = np.flatnonzero(empty_species & ~empty_cart)
+        names.append(name)
+        positions.append(pos)
+        sites.append(np.full(len(pos), site_key, dtype=object))
+        # Only candidate rows are stringified/trimmed into lookup keys
+        cand = pd.Series(df["CartridgeNum"].to_numpy(dtype=object)[pos], dtype=object)
+        carts.append(cand.astype(str).str.strip().to_numpy(dtype=object))
+        if "DateRun" in df.columns:
+            run_dates.append(df["DateRun"].to_numpy(dtype=object)[pos])
+        else:
+            run_dates.append(np.full(len(pos), None, dtype=object))
+
+    hits: MutableMapping[str, Tuple[np.ndarray, np.ndarray]] = {}
+    if names and not species_map.empty:
+        all_sites, all_carts = np.concatenate(sites), np.concatenate(carts)
+        keys = pd.MultiIndex.from_arrays([all_sites, all_carts])
+        found = species_map.table.index.get_indexer(keys)
+        values = np.concatenate(
+            [species_map.table.to_numpy(dtype=object), np.array([None], dtype=object)]
+        )
+        resolved = values[found]  # -1 picks the trailing None
+        if not species_map.dated.empty:
+            dated = _resolve_dated(
+                species_map.dated, all_sites, all_carts, np.concatenate(run_dates)
+            )
+            resolved = np.where(pd.notna(dated), dated, resolved)
+        offset = 0
+        for name, pos in zip(names, positions, strict=True):
+            part = resolved[offset : offset + len(pos)]
+            offset += len(pos)
+            ok = pd.notna(part)
+            hits[name] = (pos[ok], part[ok])
+    results: dict[str, Tuple[pd.DataFrame, int, list[Tuple[int, str, str]]]] = {}
+    for name, df in frames.items():
+        out = df.copy(deep=False)  # Species is replaced, never written in place
+        if "CartridgeNum" not in out.columns:
+            results[name] = (out, 0, [])
+            continue
+        if "Species" not in out.columns:
+            out["Species"] = pd.NA
+        sheet_masks = masks.get(name) if masks is not None else None
+        if sheet_masks is not None:
+            sheet_masks.get(out, "Species")
+        pos, species = hits.get(name, (np.empty(0, dtype=np.intp), np.empty(0, dtype=object)))
+        if len(pos):
+            filled = out["Species"].to_numpy(dtype=object, copy=True)
+            filled[pos] = species
+            out["Species"] = filled
+            if sheet_masks is not None:
+                sheet_masks.clear("Species", pos)
+        cart_col = out["CartridgeNum"]
+        examples = [
+            (int(out.index[p]), str(cart_col.iloc[p]).strip(), str(sp))
+            for p, sp in zip(pos[:5].tolist(), species[:5].tolist(), strict=True)
+        ]
+        results[name] = (out, int(len(pos)), examples)
+    return results
 
 
 def apply_species_mapping(
     df: pd.DataFrame,
     site_key: str,
-    species_map: Mapping[Tuple[str, str], str],
+    species_map: SpeciesLookup,
 ) -> Tuple[pd.DataFrame, int, list[Tuple[int, str, str]]]:
-    """Fill Species for rows missing it using (site_key, CartridgeNum) map.
+    """Fill Species for rows missing it using the (site_key, CartridgeNum[, DateRun]) lookup.
 
     - Does not overwrite existing non-empty Species values
     - Returns (new_df, filled_count, examples[(row_index, cartridge, species)])
     """
-    if "CartridgeNum" not in df.columns:
-        return df.copy(), 0, []
-
-    out = df.copy()
-    if "Species" not in out.columns:
-        out["Species"] = pd.NA
-
-    # Identify rows where Species is empty and CartridgeNum is present
-    s_species = out["Species"]
-    s_cart = out["CartridgeNum"].astype(str)
-    empty_species = s_species.isna() | (s_species.astype(str).str.strip() == "")
-    have_cart = s_cart.str.strip() != ""
-    candidates = out.index[empty_species & have_cart].tolist()
-
-    filled_examples: list[Tuple[int, str, str]] = []
-    filled_count = 0
-    for idx in candidates:
-        cart_val = s_cart.at[idx].strip()
-        key = (site_key, cart_val)
-        sp = species_map.get(key)
-        if sp is not None:
-            out.at[idx, "Species"] = sp
-            if filled_count < 5:
-                filled_examples.append((int(idx), cart_val, sp))
-            filled_count += 1
-
-    return out, filled_count, filled_examples
+    return fill_species_multi({"": df}, {"": site_key}, species_map)[""]
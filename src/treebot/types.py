@@ -16,11 +16,15 @@ class ManifestInputsEntry(TypedDict):
     sha256: str
 
 
-class ManifestInputs(TypedDict):
+class _ManifestInputsRequired(TypedDict):
     results: ManifestInputsEntry
     classes: ManifestInputsEntry
 
 
+class ManifestInputs(_ManifestInputsRequired, total=False):
+    schema: ManifestInputsEntry  # only for runs pinned to a config snapshot
+
+
 class ManifestParameters(TypedDict):
     certainty_threshold: int
     frequency_min: int
@@ -36,6 +40,10 @@ class ManifestEnvironment(TypedDict):
     pandas: str
 
 
+class ManifestCache(TypedDict):
+    class_map: str  # "hit" | "miss" | "snapshot" | "disabled"
+
+
 class Manifest(TypedDict):
     pipeline_version: str
     started_at: str
@@ -43,6 +51,7 @@ class Manifest(TypedDict):
     inputs: ManifestInputs
     parameters: ManifestParameters
     environment: ManifestEnvironment
+    cache: ManifestCache
 
 
 class ConfigOverrides(TypedDict, total=False):
@@ -54,6 +63,8 @@ class ConfigOverrides(TypedDict, total=False):
     make_per_species_sheets: bool
     max_errors: int
     pipeline_stage: str
+    profile_normalization: bool
+    show_inferred_classes: bool
 
 
 class YamlConfig(TypedDict, total=False):
@@ -65,6 +76,8 @@ class YamlConfig(TypedDict, total=False):
     make_per_species_sheets: bool
     max_errors: int
     pipeline_stage: str
+    profile_normalization: bool
+    show_inferred_classes: bool
 
 
 class ForwardFillCounts(TypedDict):
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, cast
+
+import yaml
+
+from ..services.output.utils import sha256_file
+from ..services.validation.class_map import load_class_map
+from ..types import SchemaConfig
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable class map + schema pair; runs keep the snapshot they started with."""
+
+    version: int
+    class_map: Mapping[str, str]
+    classes_sha256: str
+    schema: SchemaConfig
+    schema_sha256: str
+
+
+_Stamp = tuple[int, int]  # (mtime_ns, size)
+
+
+def _stamp(path: Path) -> _Stamp:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigSnapshotStore:
+    """Versioned in-memory snapshots of ``classes.yaml`` and ``schema.yaml``.
+
+    - ``current()`` stats both files; unchanged (mtime, size) returns the
+      cached snapshot without reading anything
+    - A changed stamp is confirmed by content hash; only a real content
+      change re-parses and re-normalizes, producing a new version
+    - The swap happens under a lock, and snapshots are never mutated, so
+      in-flight runs are unaffected by reloads
+    """
+
+    def __init__(
+        self,
+        classes_path: Path,
+        schema_path: Path = Path("configs/schema.yaml"),
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.classes_path = classes_path
+        self.schema_path = schema_path
+        self.logger = logger or logging.getLogger("treebot.ui.config_store")
+        self._lock = threading.Lock()
+        self._snapshot: ConfigSnapshot | None = None
+        self._stamps: tuple[_Stamp, _Stamp] | None = None
+
+    def serves(self, classes_path: Path) -> bool:
+        return classes_path.resolve() == self.classes_path.resolve()
+
+    def current(self) -> ConfigSnapshot:
+        with self._lock:
+            stamps = (_stamp(self.classes_path), _stamp(self.schema_path))
+            snap = self._snapshot
+            if snap is not None and stamps == self._stamps:
+                return snap
+
+            classes_sha = sha256_file(self.classes_path)
+            schema_sha = sha256_file(self.schema_path)
+            if snap is None or classes_sha != snap.classes_sha256:
+                class_map: Mapping[str, str] = MappingProxyType(
+                    dict(load_class_map(self.classes_path))
+                )
+            else:
+                class_map = snap.class_map
+            if snap is None or schema_sha != snap.schema_sha256:
+                schema = cast(
+                    SchemaConfig,
+                    yaml.safe_load(self.schema_path.read_text(encoding="utf-8")),
+                )
+            else:
+                schema = snap.schema
+
+            if snap is None or class_map is not snap.class_map or schema is not snap.schema:
+                snap = ConfigSnapshot(
+                    version=(snap.version + 1) if snap is not None else 1,
+                    class_map=class_map,
+                    classes_sha256=classes_sha,
+                    schema=schema,
+                    schema_sha256=schema_sha,
+                )
+                self._snapshot = snap
+                self.logger.info(
+                    "Loaded config snapshot",
+                    extra={"version": snap.version, "classes": len(class_map)},
+                )
+            self._stamps = stamps
+            return snap
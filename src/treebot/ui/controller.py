@@ -7,6 +7,8 @@ from typing import Optional
 
 from ..config import Config
 from ..main import run_pipeline
+from ..services.io_excel import using_schema
+from .config_store import ConfigSnapshotStore
 
 
 logger = logging.getLogger("treebot.ui.controller")
@@ -17,17 +19,25 @@ class UiRunResult:
     code: int
     run_dir: Optional[Path]
     error: Optional[str] = None
+    # Set when strict mode aborted the run (exit code 2)
+    blocking_report: Optional[Path] = None
 
 
 def _list_run_dirs(base: Path) -> list[Path]:
     if not base.exists():
         return []
-    return sorted([p for p in base.iterdir() if p.is_dir()])
+    # Skip hidden folders such as the shared ".cache"
+    return sorted([p for p in base.iterdir() if p.is_dir() and not p.name.startswith(".")])
 
 
 class UiController:
-    def __init__(self, base_logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        base_logger: Optional[logging.Logger] = None,
+        snapshots: Optional[ConfigSnapshotStore] = None,
+    ) -> None:
         self.logger = base_logger or logging.getLogger("treebot.ui")
+        self.snapshots = snapshots
 
     def _latest_run_dir(self, out_base: Path, before: list[Path]) -> Optional[Path]:
         after = _list_run_dirs(out_base)
@@ -55,9 +65,30 @@ class UiController:
                     "out": str(out_dir),
                 },
             )
-            code = run_pipeline(input_path, classes_path, out_dir, cfg2, mapping_path)
+            if self.snapshots is not None and self.snapshots.serves(classes_path):
+                # Pin this run to the current snapshot; later reloads do not affect it
+                snap = self.snapshots.current()
+                with using_schema(snap.schema):
+                    code = run_pipeline(
+                        input_path,
+                        classes_path,
+                        out_dir,
+                        cfg2,
+                        mapping_path,
+                        class_map=snap.class_map,
+                        classes_sha256=snap.classes_sha256,
+                        schema_input={
+                            "path": str(self.snapshots.schema_path),
+                            "sha256": snap.schema_sha256,
+                        },
+                    )
+            else:
+                code = run_pipeline(input_path, classes_path, out_dir, cfg2, mapping_path)
             run_dir = self._latest_run_dir(out_dir, before)
-            return UiRunResult(code=code, run_dir=run_dir)
+            blocking = run_dir / "blocking_report.csv" if run_dir is not None else None
+            if code != 2 or blocking is None or not blocking.exists():
+                blocking = None
+            return UiRunResult(code=code, run_dir=run_dir, blocking_report=blocking)
         except Exception as exc:
             self.logger.exception("UI pipeline error: %s", exc)
             return UiRunResult(code=3, run_dir=None, error=str(exc))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from multiprocessing import freeze_support
 from pathlib import Path
 from typing import Optional
 import socket
@@ -9,6 +10,9 @@ from nicegui import ui
 from nicegui import app as ngapp
 
 from ..utils.logging_setup import setup_logging
+from ..utils.normalize import disable_process_pool
+from ..utils.pandas_mode import enable_copy_on_write
+from .config_store import ConfigSnapshotStore
 from .controller import UiController
 from .views import build_main_view
 from .app import _cleanup_logging
@@ -31,11 +35,16 @@ def _run_server(port: int) -> None:
 
 
 def main() -> None:
+    # Process-wide pandas mode, set before any pipeline thread starts
+    enable_copy_on_write()
+    # Spawned workers would re-import this module; normalize in-process instead
+    disable_process_pool()
     # Setup base logging to file/JSON to mirror service behavior if desired
     # Note: per-run logging is configured inside the pipeline when it executes
     setup_logging(Path("runs") / "ui_logs")
 
-    controller = UiController()
+    # Keep classes.yaml/schema.yaml parsed in memory across runs (reloaded on change)
+    controller = UiController(snapshots=ConfigSnapshotStore(Path("configs/classes.yaml")))
     build_main_view(controller)
 
     # Choose port with fallbacks if busy
@@ -75,5 +84,7 @@ def main() -> None:
         )
 
 
-if __name__ in {"__main__", "__mp_main__"}:
+if __name__ == "__main__":
+    # Frozen (.exe) builds: let spawned helper processes exit instead of starting the UI
+    freeze_support()
     main()
@@ -151,6 +151,23 @@ def build_main_view(controller: UiController) -> None:
                         ).classes("bg-blue-600 text-white px-4 py-2")
 
                     # Manifest button intentionally hidden per UX request
+        elif result.blocking_report is not None:
+            status.text = (
+                "⛔ Blocking checks failed (strict mode); no workbook was written.\n\n"
+                f"See {result.blocking_report}"
+            )
+            status.classes("text-lg font-semibold text-red-600")
+            result_row.classes(remove="hidden")
+            with result_row:
+                ui.button(
+                    "📋 Open Blocking Report",
+                    on_click=lambda p=result.blocking_report: open_path(p),
+                ).classes("bg-red-600 text-white px-4 py-2")
+                if result.run_dir:
+                    ui.button(
+                        "📂 Open Output Folder",
+                        on_click=lambda rd=result.run_dir: open_path(rd),
+                    ).classes("px-4 py-2")
         else:
             status.text = f"⚠ Processing completed with issues.\n\nThe pipeline encountered problems (exit code {result.code}). Check the output folder for logs and partial results."
             status.classes("text-lg font-semibold text-orange-600")
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import re
+import time
 import unicodedata
-from typing import Final, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Final, Iterator, Mapping, MutableMapping
+
+import pandas as pd
 
 
 # Map common Greek letters to ASCII tokens
@@ -17,10 +27,21 @@ _GREEK_MAP: Final[Mapping[str, str]] = {
 }
 
 
-def _fold_greek(text: str) -> str:
-    for k, v in _GREEK_MAP.items():
-        text = text.replace(k, v)
-    return text
+# Single translate table for the Greek fold (one pass instead of a replace per letter)
+_GREEK_TABLE: Final[Mapping[int, str]] = str.maketrans(dict(_GREEK_MAP))
+
+# Unicode normal form applied to non-ASCII input
+_UNICODE_FORM: Final = "NFKC"
+# Fixed stages run before the rule table, in order. Part of the ruleset hash:
+# update this when the code of any stage changes.
+_PRE_STAGES: Final = ("ascii_skip", f"unicode:{_UNICODE_FORM}", "greek_fold", "lower", "strip")
+
+
+def _fold_unicode(text: str) -> str:
+    """NFKC + Greek fold; pure-ASCII input is already in normal form and skipped."""
+    if text.isascii():
+        return text
+    return unicodedata.normalize(_UNICODE_FORM, text).translate(_GREEK_TABLE)
 
 
 def normalize_text(value: str) -> str:
@@ -34,8 +55,7 @@ def normalize_text(value: str) -> str:
     - normalize comma/hyphen spacing
     - strip trailing punctuation/hyphens
     """
-    s = unicodedata.normalize("NFKC", value)
-    s = _fold_greek(s)
+    s = _fold_unicode(value)
     s = s.lower().strip()
     s = re.sub(r"\s+", " ", s)
     s = re.sub(r"\s*,\s*", ", ", s)
@@ -171,6 +191,156 @@ _TOKEN_TYPO_MAP: Final[Mapping[str, str]] = {
 # embedded-safe corrections here. Token-bounded fixes remain separate.
 
 
+@dataclass(frozen=True)
+class _Rule:
+    """One rewrite step of the compound pipeline.
+
+    Literal rules (``regex is None``) use plain substring replacement; regex
+    rules use the precompiled pattern. The same table drives the scalar and
+    the Series normalizers so both apply identical steps in identical order.
+    """
+
+    name: str
+    find: str
+    repl: str
+    regex: re.Pattern[str] | None = None
+
+
+def _regex_rule(name: str, pattern: str, repl: str) -> _Rule:
+    return _Rule(name=name, find=pattern, repl=repl, regex=re.compile(pattern))
+
+
+_COMPOUND_RULES: Final[tuple[_Rule, ...]] = (
+    # Strip leading punctuation (hyphens, dashes, en-dash, em-dash, commas, spaces)
+    _regex_rule("leading_punct", r"^[\s,–—-]+", ""),
+    # Fix common typos: TWO-PASS APPROACH
+    # Pass 1: Embedded-safe corrections (simple string replacement)
+    # These typos are safe to fix anywhere in a word (e.g., 'trilfluoro' in 'trifluoromethyl')
+    *(
+        _Rule(name=f"embedded:{typo}", find=typo, repl=correct)
+        for typo, correct in _EMBEDDED_TYPO_MAP.items()
+    ),
+    # Pass 2: Token-bounded corrections (regex with word boundaries)
+    # These typos should only match complete tokens to prevent cascading
+    # (e.g., 'camphenon' → 'camphenone', but not inside 'camphenone')
+    *(
+        _regex_rule(f"token:{typo}", rf"(?<![a-z0-9]){re.escape(typo)}(?![a-z0-9])", correct)
+        for typo, correct in _TOKEN_TYPO_MAP.items()
+    ),
+    # Fix scoped puran→pyran (only in contexts like "2h-puran")
+    _regex_rule("scoped_puran", r"\b(\d+h)-puran\b", r"\1-pyran"),
+    # Remove bare stereochem markers in parentheses
+    _Rule(
+        name="stereochem", find=_STEREOCHEM_PAREN_RE.pattern, repl="", regex=_STEREOCHEM_PAREN_RE
+    ),
+    # Unify missing hyphens before functional groups (e.g., -3one → -3-one)
+    # Safe: only fires on "-<digits><suffix>" at a token boundary
+    # Note: methylene before ylene to match the full suffix first
+    _regex_rule(
+        "hyphen_unification",
+        r"-(\d+)(methylene|one|ol|al|yl|ylene|ylidene|oic|oate|amine|amide|enone|dione|diol)(?=\s|,|;|:|$|[\)\]-])",
+        r"-\1-\2",
+    ),
+    # Collapse whitespace
+    _regex_rule("collapse_whitespace", r"\s+", " "),
+    # Normalize separators
+    _regex_rule("comma_spacing", r"\s*,\s*", ", "),
+    _regex_rule("hyphen_spacing", r"\s*-\s*", "-"),
+    # Fix erroneous trailing bracket after stereochem pattern at end:
+    # ", ( ... )]$" (missing opening '[' earlier). Remove the final ']'.
+    _regex_rule("trailing_bracket", r"(, \([^)]+\))\]$", r"\1"),
+    # Strip trailing run tokens after brackets/parens (e.g., "...)-96", "] 72")
+    _regex_rule("trailing_run_token", r"([)\]])(?:-|_|\s)?\d{1,3}$", r"\1"),
+    # Strip lone trailing zero after a letter at end (e.g., "methylene0")
+    _regex_rule("trailing_zero", r"([a-z])0$", r"\1"),
+    # Strip trailing punctuation/hyphens
+    _regex_rule("trailing_punct", r"[\s\-\.,;:]+$", ""),
+)
+
+
+class NormalizationProfiler:
+    """Per-rule hit counts and cumulative time for the compound normalizer.
+
+    A rule "hits" when it changes the string. Activate with
+    ``profile_normalization(profiler)``; normalizer calls inside the block
+    (scalar or Series) are recorded.
+    """
+
+    def __init__(self) -> None:
+        self.values = 0
+        self._hits: MutableMapping[str, int] = {}
+        self._ns: MutableMapping[str, int] = {}
+
+    def _add(self, name: str, hits: int, ns: int) -> None:
+        self._hits[name] = self._hits.get(name, 0) + hits
+        self._ns[name] = self._ns.get(name, 0) + ns
+
+    def report(self) -> dict[str, object]:
+        """JSON-ready report; rules listed in pipeline order."""
+        names = [*_PREFIX_STAGES, *(rule.name for rule in _COMPOUND_RULES)]
+        rules = [
+            {
+                "order": i,
+                "rule": name,
+                "group": name.split(":", 1)[0],
+                "hits": self._hits.get(name, 0),
+                "time_ms": round(self._ns.get(name, 0) / 1e6, 3),
+            }
+            for i, name in enumerate(names)
+        ]
+        return {
+            "ruleset": normalizer_ruleset_hash(),
+            "values": self.values,
+            "total_time_ms": round(sum(self._ns.values()) / 1e6, 3),
+            "dead_rules": [r["rule"] for r in rules if r["hits"] == 0],
+            "rules": rules,
+        }
+
+
+_PREFIX_STAGES: Final[tuple[str, ...]] = ("unicode_fold", "lower_strip")
+_ACTIVE_PROFILER: ContextVar[NormalizationProfiler | None] = ContextVar(
+    "treebot_normalization_profiler", default=None
+)
+
+
+@contextmanager
+def profile_normalization(profiler: NormalizationProfiler) -> Iterator[NormalizationProfiler]:
+    """Record per-rule statistics for normalizer calls made inside the block."""
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+
+
+def _normalize_profiled(value: str, prof: NormalizationProfiler) -> str:
+    clock = time.perf_counter_ns
+    t = clock()
+    s = _fold_unicode(value)
+    prof._add("unicode_fold", int(s != value), clock() - t)
+    t = clock()
+    new = s.lower().strip()
+    prof._add("lower_strip", int(new != s), clock() - t)
+    s = new
+    for rule in _COMPOUND_RULES:
+        t = clock()
+        if rule.regex is None:
+            new = s.replace(rule.find, rule.repl)
+        else:
+            new = rule.regex.sub(rule.repl, s)
+        prof._add(rule.name, int(new != s), clock() - t)
+        s = new
+    prof.values += 1
+    return s
+
+
+def _profile_series_step(
+    prof: NormalizationProfiler, name: str, before: pd.Series, after: pd.Series, ns: int
+) -> None:
+    changed = (after != before) & after.notna()
+    prof._add(name, int(changed.sum()), ns)
+
+
 def normalize_compound_name(value: str) -> str:
     """Normalization tailored for compound names.
 
@@ -190,58 +360,136 @@ def normalize_compound_name(value: str) -> str:
     - Strip trailing instrument run tokens: ...)-96, ...] 72, ...methylene0
     - Strip trailing punctuation/hyphens
     """
-    s = unicodedata.normalize("NFKC", value)
-    s = _fold_greek(s)
+    prof = _ACTIVE_PROFILER.get()
+    if prof is not None:
+        return _normalize_profiled(value, prof)
+    s = _fold_unicode(value)
     s = s.lower().strip()
+    for rule in _COMPOUND_RULES:
+        if rule.regex is None:
+            s = s.replace(rule.find, rule.repl)
+        else:
+            s = rule.regex.sub(rule.repl, s)
+    return s
 
-    # Strip leading punctuation (hyphens, dashes, en-dash, em-dash, commas, spaces)
-    s = re.sub(r"^[\s,–—-]+", "", s)
 
-    # Fix common typos: TWO-PASS APPROACH
-    # Pass 1: Embedded-safe corrections (simple string replacement)
-    # These typos are safe to fix anywhere in a word (e.g., 'trilfluoro' in 'trifluoromethyl')
-    for typo, correct in _EMBEDDED_TYPO_MAP.items():
-        s = s.replace(typo, correct)
+def normalize_compound_series(values: pd.Series) -> pd.Series:
+    """Vectorized companion to ``normalize_compound_name``.
 
-    # Pass 2: Token-bounded corrections (regex with word boundaries)
-    # These typos should only match complete tokens to prevent cascading
-    # (e.g., 'camphenon' → 'camphenone', but not inside 'camphenone')
-    for typo, correct in _TOKEN_TYPO_MAP.items():
-        pat = rf"(?<![a-z0-9]){re.escape(typo)}(?![a-z0-9])"
-        s = re.sub(pat, correct, s)
+    Applies the same pipeline with ``Series.str`` operations and the
+    precompiled rule table. Missing values stay missing; the result is
+    element-wise identical to mapping ``normalize_compound_name``.
+    """
+    prof = _ACTIVE_PROFILER.get()
+    clock = time.perf_counter_ns
+    t = clock()
+    s = values.copy()
+    # Unicode stages only for non-ASCII entries (ASCII is already NFKC-normal)
+    non_ascii = values.map(lambda v: isinstance(v, str) and not v.isascii()).astype(bool)
+    if non_ascii.any():
+        s[non_ascii] = values[non_ascii].str.normalize(_UNICODE_FORM).str.translate(_GREEK_TABLE)
+    if prof is not None:
+        prof.values += int(values.notna().sum())
+        _profile_series_step(prof, "unicode_fold", values, s, clock() - t)
+        t = clock()
+    new = s.str.lower().str.strip()
+    if prof is not None:
+        _profile_series_step(prof, "lower_strip", s, new, clock() - t)
+    s = new
+    for rule in _COMPOUND_RULES:
+        t = clock()
+        if rule.regex is None:
+            new = s.str.replace(rule.find, rule.repl, regex=False)
+        else:
+            new = s.str.replace(rule.regex, rule.repl, regex=True)
+        if prof is not None:
+            _profile_series_step(prof, rule.name, s, new, clock() - t)
+        s = new
+    return s
 
-    # Fix scoped puran→pyran (only in contexts like "2h-puran")
-    s = re.sub(r"\b(\d+h)-puran\b", r"\1-pyran", s)
 
-    # Remove bare stereochem markers in parentheses
-    s = _STEREOCHEM_PAREN_RE.sub("", s)
+# Below this many values the pool start-up (and Windows spawn) costs more than it saves
+_PARALLEL_MIN_VALUES: Final = 50_000
+# Lower bound per task so pickling a chunk stays small next to normalizing it
+_MIN_CHUNK: Final = 5_000
+# Cleared by long-lived hosts (the UI server) that must not spawn worker processes
+_process_pool_enabled = True
 
-    # Unify missing hyphens before functional groups (e.g., -3one → -3-one)
-    # Safe: only fires on "-<digits><suffix>" at a token boundary
-    # Note: methylene before ylene to match the full suffix first
-    s = re.sub(
-        r"-(\d+)(methylene|one|ol|al|yl|ylene|ylidene|oic|oate|amine|amide|enone|dione|diol)(?=\s|,|;|:|$|[\)\]-])",
-        r"-\1-\2",
-        s,
-    )
 
-    # Collapse whitespace
-    s = re.sub(r"\s+", " ", s)
+def disable_process_pool() -> None:
+    """Keep ``normalize_compound_batch`` in-process for the rest of this process.
 
-    # Normalize separators
-    s = re.sub(r"\s*,\s*", ", ", s)
-    s = re.sub(r"\s*-\s*", "-", s)
+    Spawned workers re-import the launching ``__main__``; a server process
+    (the UI) calls this at start-up so a large vocabulary never starts
+    copies of it.
+    """
+    global _process_pool_enabled
+    _process_pool_enabled = False
 
-    # Fix erroneous trailing bracket after stereochem pattern at end:
-    # ", ( ... )]$" (missing opening '[' earlier). Remove the final ']'.
-    s = re.sub(r"(, \([^)]+\))\]$", r"\1", s)
 
-    # Strip trailing run tokens after brackets/parens (e.g., "...)-96", "] 72")
-    s = re.sub(r"([)\]])(?:-|_|\s)?\d{1,3}$", r"\1", s)
+def _normalize_chunk(values: list[object]) -> list[object]:
+    return list(normalize_compound_series(pd.Series(values, dtype=object)).tolist())
 
-    # Strip lone trailing zero after a letter at end (e.g., "methylene0")
-    s = re.sub(r"([a-z])0$", r"\1", s)
 
-    # Strip trailing punctuation/hyphens
-    s = re.sub(r"[\s\-\.,;:]+$", "", s)
-    return s
+def normalize_compound_batch(
+    values: pd.Series,
+    workers: int | None = None,
+    min_parallel: int = _PARALLEL_MIN_VALUES,
+) -> pd.Series:
+    """Normalize a (distinct) vocabulary, across worker processes when large.
+
+    Small inputs, single-core machines, profiled runs and processes that
+    called ``disable_process_pool`` use ``normalize_compound_series``
+    in-process. Otherwise the values are split
+    into ~4 chunks per worker (at least ``_MIN_CHUNK`` each) and results are
+    concatenated in input order, so output is identical to the serial path.
+    """
+    n = len(values)
+    workers = workers or os.cpu_count() or 1
+    if (
+        n < min_parallel
+        or workers < 2
+        or not _process_pool_enabled
+        or _ACTIVE_PROFILER.get() is not None
+    ):
+        return normalize_compound_series(values)
+    size = max(_MIN_CHUNK, -(-n // (workers * 4)))
+    items = values.tolist()
+    chunks = [items[i : i + size] for i in range(0, n, size)]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            merged = [v for part in pool.map(_normalize_chunk, chunks) for v in part]
+    except (BrokenProcessPool, OSError):
+        return _pool_unavailable(values)
+    return pd.Series(merged, index=values.index, dtype=object)
+
+
+def _pool_unavailable(values: pd.Series) -> pd.Series:
+    """Serial result when worker processes cannot be started (same output)."""
+    return normalize_compound_series(values)
+
+
+def _compute_ruleset_hash() -> str:
+    h = hashlib.sha256()
+    # Fixed stages plus the Unicode database version (NFKC output depends on it)
+    h.update(f"stages\0{'|'.join(_PRE_STAGES)}\0{unicodedata.unidata_version}\n".encode())
+    for k, v in _GREEK_MAP.items():
+        h.update(f"greek\0{k}\0{v}\n".encode())
+    for rule in _COMPOUND_RULES:
+        kind = "literal" if rule.regex is None else "regex"
+        h.update(f"{kind}\0{rule.name}\0{rule.find}\0{rule.repl}\n".encode())
+    return h.hexdigest()
+
+
+_RULESET_HASH: Final[str] = _compute_ruleset_hash()
+
+
+def normalizer_ruleset_hash() -> str:
+    """Stable fingerprint of the compound normalizer rules.
+
+    Covers the fixed pre-rule stages (Unicode normal form and Unicode
+    database version, Greek fold, lowercase/strip), the Greek fold map and
+    every typo/regex rule (name, pattern, replacement, order). Any rule change yields a new hash, so artifacts
+    keyed by it are invalidated automatically.
+    """
+    return _RULESET_HASH
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pandas as pd
+
+
+def enable_copy_on_write() -> None:
+    """Turn on pandas copy-on-write for the whole process.
+
+    Call once at process start (CLI / UI entry points), before any pipeline
+    thread runs: the option is process-global, so toggling it around a run
+    would race with concurrent runs. Pipeline steps take a shallow
+    ``copy(deep=False)`` and only assign whole columns, so they are correct
+    either way; copy-on-write only lets unchanged columns be shared between
+    steps instead of copied. pandas 3 always behaves this way.
+    """
+    if int(pd.__version__.split(".", 1)[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.config import Config
+from treebot.main import run_pipeline
+
+
+def _write_inputs(tmp_path: Path) -> tuple[Path, Path]:
+    row = {
+        "DataFolderName": "DF1",
+        "DateRun": "4/3/2025",
+        "CartridgeNum": "1",
+        "RetentionTime": 1.0,
+        "Match1": "Benzene",
+        "Match1.Quality": 72,
+        "Match2": "x",
+        "Match2.Quality": 10,
+        "Match3": "y",
+        "Match3.Quality": 5,
+        "Comments": "",
+    }
+    results = tmp_path / "results.xlsx"
+    pd.DataFrame([row, {**row, "DataFolderName": "DF2"}]).to_excel(results, index=False)
+    classes = tmp_path / "classes.yaml"
+    classes.write_text("map:\n  benzene: aromatic\n", encoding="utf-8")
+    return results, classes
+
+
+def test_duplicate_keys_strict_fail(tmp_path: Path) -> None:
+    results, classes = _write_inputs(tmp_path)
+    code = run_pipeline(results, classes, tmp_path / "runs", Config(strict_fail=True))
+    assert code == 2
+    reports = list((tmp_path / "runs").glob("*/duplicates.csv"))
+    assert len(reports) == 1
+    assert pd.read_csv(reports[0]).loc[0, "DataFolderNames"] == "DF1, DF2"
+    blocking = pd.read_csv(next((tmp_path / "runs").glob("*/blocking_report.csv")))
+    assert blocking["Check"].tolist() == ["DUPLICATE_KEY"]
+    assert not list((tmp_path / "runs").glob("*/standardized_*.xlsx"))
+
+
+def test_duplicate_keys_reported_when_not_strict(tmp_path: Path) -> None:
+    results, classes = _write_inputs(tmp_path)
+    code = run_pipeline(results, classes, tmp_path / "runs", Config(strict_fail=False))
+    assert code == 0
+    assert list((tmp_path / "runs").glob("*/duplicates.csv"))
+    assert list((tmp_path / "runs").glob("*/standardized_*.xlsx"))
@@ -56,6 +56,7 @@ map:
     assert df_out.loc[0, "Class"] == "PFAS"
     assert df_out.loc[0, "MatchScore"] == 72
     assert df_out.loc[0, "DateRun"] == "2025-04-03"
+    assert "InferredClass" not in df_out.columns
 
 
 def test_new_schema_mismatch_no_validation(tmp_path: Path) -> None:
@@ -94,7 +95,9 @@ map:
     )
 
     code = run_pipeline(results_xlsx, classes_yaml, tmp_path / "runs")
-    # New schema rows are passed through without class/matchscore validation in the MVP
+    # New schema rows are passed through; mismatches are reported, not blocking
     assert code == 0
     outs = list((tmp_path / "runs").glob("*/standardized_*.xlsx"))
     assert outs
+    reports = list((tmp_path / "runs").glob("*/consistency_report.csv"))
+    assert pd.read_csv(reports[0])["Check"].tolist() == ["CLASS_MISMATCH"]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.app.steps.blocking import BLOCKING_COLUMNS, run_blocking_checks
+from treebot.config import Config
+from treebot.domain.errors import IssueStore
+from treebot.main import run_pipeline
+from treebot.services.io_excel import SkippedSheet
+from treebot.services.validation.duplicates import DuplicateKeys
+
+
+def _write_inputs(tmp_path: Path) -> tuple[Path, Path]:
+    rows = [
+        {
+            "DataFolderName": "DF1",
+            "DateRun": "4/3/2025",
+            "CartridgeNum": "1",
+            "RetentionTime": 1.0,
+            "Match1": name,
+            "Match1.Quality": 72,
+            "Match2": "x",
+            "Match2.Quality": 10,
+            "Match3": "y",
+            "Match3.Quality": 5,
+            "Comments": "",
+        }
+        for name in ["Benzene", "Unobtainium", "Unobtainium"]
+    ]
+    results = tmp_path / "results.xlsx"
+    pd.DataFrame(rows).to_excel(results, index=False)
+    classes = tmp_path / "classes.yaml"
+    classes.write_text(
+        'map:\n  benzene: aromatic\n  "unobtainium, 2-methyl": alkane\n', encoding="utf-8"
+    )
+    return results, classes
+
+
+def test_strict_fail_stops_before_outputs(tmp_path: Path) -> None:
+    results, classes = _write_inputs(tmp_path)
+    code = run_pipeline(results, classes, tmp_path / "runs", Config(strict_fail=True))
+    assert code == 2
+    reports = list((tmp_path / "runs").glob("*/blocking_report.csv"))
+    assert len(reports) == 1
+    report = pd.read_csv(reports[0])
+    assert report.to_dict("records") == [
+        {
+            "Check": "CLASS_MISSING",
+            "Sheet": "Sheet1",
+            "Item": "unobtainium",
+            "Rows": 2,
+            "Suggestion": "unobtainium, 2-methyl -> alkane",
+        }
+    ]
+    assert not list((tmp_path / "runs").glob("*/standardized_*.xlsx"))
+    # Curator suggestions are still written for the aborted run
+    curator = pd.read_csv(next((tmp_path / "runs").glob("*/curator_report.csv")))
+    assert curator.loc[0, "Compound"] == "unobtainium"
+    assert curator.loc[0, "SuggestedClass"] == "alkane"
+
+
+def test_missing_class_not_blocking_without_strict(tmp_path: Path) -> None:
+    results, classes = _write_inputs(tmp_path)
+    code = run_pipeline(results, classes, tmp_path / "runs", Config(strict_fail=False))
+    assert code == 0
+    assert list((tmp_path / "runs").glob("*/standardized_*.xlsx"))
+    assert not list((tmp_path / "runs").glob("*/blocking_report.csv"))
+
+
+def test_unreadable_sheet_is_its_own_check() -> None:
+    empty = pd.DataFrame(columns=["DateRun", "CartridgeNum", "Sheets", "Rows"])
+    blocking = run_blocking_checks(
+        [],
+        [
+            SkippedSheet(name="Broken", reason="read_error: bad zip"),
+            SkippedSheet(name="Odd", reason="no_schema: unknown headers"),
+            SkippedSheet(name="Notes", reason="no_table_header"),
+        ],
+        {},
+        {},
+        DuplicateKeys(empty, IssueStore()),
+    )
+    assert list(blocking.rows.columns) == BLOCKING_COLUMNS
+    assert blocking.rows[["Check", "Sheet"]].values.tolist() == [
+        ["READ_ERROR", "Broken"],
+        ["HEADERS", "Odd"],
+    ]
+    assert blocking.counts() == {"READ_ERROR": 1, "HEADERS": 1}
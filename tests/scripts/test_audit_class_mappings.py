@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from treebot.services.transform.infer_class import CLASS_RULES
+
+_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "audit_class_mappings.py"
+
+
+@pytest.fixture(scope="module")
+def audit() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("audit_class_mappings", _SCRIPT)
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    # Registered so pool workers can unpickle the chunk function by module name
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_audit_rules_come_from_runtime_table(audit: ModuleType) -> None:
+    assert len(audit.RULES) == len(CLASS_RULES)
+    assert audit.expected_classes("2-heptanol") == {"alcohol", "monoterpenoid"}
+    assert audit.expected_classes("1-chlorobutane") >= {"halogen", "alkane"}
+
+
+MAPPINGS = {"limonene": "monoterpene", "2-heptanol": "alkane", "hexanal": "aldehyde"}
+
+
+def test_incremental_rechecks_only_changed_entries(audit: ModuleType, tmp_path: Path) -> None:
+    cache = tmp_path / "class_audit.json"
+    issues, diff = audit.audit_incremental(MAPPINGS, cache, workers=1)
+    assert diff["rechecked"] == 3
+    assert [c for c, _, _ in issues] == ["2-heptanol"]
+
+    _, diff = audit.audit_incremental(MAPPINGS, cache, workers=1)
+    assert diff["rechecked"] == 0
+    assert diff["added"] == [] and diff["new_issues"] == []
+
+    edited = {**MAPPINGS, "2-heptanol": "alcohol", "octane": "alkane"}
+    del edited["hexanal"]
+    issues, diff = audit.audit_incremental(edited, cache, workers=1)
+    assert diff["rechecked"] == 2
+    assert issues == []
+    assert diff["added"] == ["octane"]
+    assert diff["removed"] == ["hexanal"]
+    assert diff["changed"] == [{"compound": "2-heptanol", "from": "alkane", "to": "alcohol"}]
+    assert diff["resolved_issues"] == ["2-heptanol"]
+
+
+def test_full_and_rules_change_still_diff_against_previous_audit(
+    audit: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "class_audit.json"
+    audit.audit_incremental(MAPPINGS, cache, workers=1)
+
+    _, diff = audit.audit_incremental(MAPPINGS, cache, workers=1, full=True)
+    assert diff["rechecked"] == 3
+    assert (diff["added"], diff["removed"], diff["new_issues"]) == ([], [], [])
+
+    monkeypatch.setattr(audit, "RULES_VERSION", "changed")
+    _, diff = audit.audit_incremental(MAPPINGS, cache, workers=1)
+    assert diff["rechecked"] == 3
+    assert (diff["added"], diff["new_issues"]) == ([], [])
+    assert json.loads(cache.read_text(encoding="utf-8"))["rules_version"] == "changed"
+
+
+def test_parallel_path_matches_serial(
+    audit: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mappings = {f"{i}-{name}": cls for i in range(50) for name, cls in MAPPINGS.items()}
+    serial, _ = audit.audit_incremental(mappings, tmp_path / "serial.json", workers=1)
+    monkeypatch.setattr(audit, "_PARALLEL_MIN", 1)
+    parallel, diff = audit.audit_incremental(mappings, tmp_path / "parallel.json", workers=2)
+    assert diff["rechecked"] == len(mappings)
+    assert parallel == serial
+    assert len(serial) == 50
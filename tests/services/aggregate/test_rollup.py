@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from treebot.services.aggregate.rollup import (
+    ROLLUP_COLUMNS,
+    build_class_rollups,
+    load_class_hierarchy,
+)
+from treebot.services.output.summary_writer import write_sections_to_sheet
+
+
+def _hierarchy(tmp_path: Path, text: str) -> Path:
+    p = tmp_path / "class_hierarchy.yaml"
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def test_ancestor_bitsets_and_level_codes(tmp_path: Path) -> None:
+    h = load_class_hierarchy(
+        _hierarchy(
+            tmp_path,
+            "parents:\n"
+            "  monoterpene: terpene\n"
+            "  sesquiterpene: terpene\n"
+            "  terpene: hydrocarbon\n"
+            "  alkane: hydrocarbon\n",
+        )
+    )
+    mono, terp, hydro = (h.index[n] for n in ("monoterpene", "terpene", "hydrocarbon"))
+    assert h.ancestors[mono] == (1 << mono) | (1 << terp) | (1 << hydro)
+    assert h.max_depth == 2
+    assert h.level_codes(0)[mono] == hydro
+    assert h.level_codes(1)[mono] == terp
+    assert h.level_codes(1)[h.index["alkane"]] == h.index["alkane"]
+
+
+def test_cycle_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        load_class_hierarchy(_hierarchy(tmp_path, "parents:\n  a: b\n  b: a\n"))
+
+
+def test_rollups_per_level(tmp_path: Path) -> None:
+    h = load_class_hierarchy(
+        _hierarchy(
+            tmp_path,
+            "parents:\n  monoterpene: terpene\n  sesquiterpene: terpene\n  terpene: hydrocarbon\n",
+        )
+    )
+    df = pd.DataFrame(
+        {
+            "Species": ["artcal"] * 5,
+            "Compound": ["limonene", "limonene", "caryophyllene", "benzene", "xyz"],
+            "Class": ["monoterpene", "monoterpene", "sesquiterpene", "aromatic", None],
+            "MatchScore": [90, 80, 70, 95, 85],
+        }
+    )
+    rollups = build_class_rollups({"SiteA": df}, h, quality_min=0)
+    assert sorted(rollups) == [0, 1]
+
+    (lvl0,) = rollups[0]
+    assert (lvl0.site, lvl0.species) == ("SiteA", "artcal")
+    assert lvl0.df.to_dict("records") == [
+        {"Class": "hydrocarbon", "Compounds": 2, "Count": 3, "AvgMatchQuality": 80.0},
+        {"Class": "(unclassified)", "Compounds": 1, "Count": 1, "AvgMatchQuality": 85.0},
+        {"Class": "aromatic", "Compounds": 1, "Count": 1, "AvgMatchQuality": 95.0},
+    ]
+    assert lvl0.stats["total_peaks"] == 5
+    assert rollups[1][0].df["Class"].tolist()[0] == "terpene"
+
+    std = tmp_path / "standardized.xlsx"
+    pd.DataFrame({"x": [1]}).to_excel(std, index=False)
+    write_sections_to_sheet(std, rollups[0], "Class Rollup L0", columns=ROLLUP_COLUMNS)
+    ws = load_workbook(std)["Class Rollup L0"]
+    assert [c.value for c in ws[2]] == ROLLUP_COLUMNS
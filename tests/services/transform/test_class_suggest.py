@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from treebot.services.transform.class_suggest import TrigramIndex, suggest_classes
+
+
+def test_trigram_index_ranks_closest_keys_first() -> None:
+    index = TrigramIndex(["alpha-pinene", "beta-pinene", "limonene", "benzene", "toluene"])
+    hits = index.top_k("alpha-pinen", k=2)
+    assert [key for key, _ in hits] == ["alpha-pinene", "beta-pinene"]
+    assert hits[0][1] > hits[1][1]
+    assert index.top_k("zzzz") == []
+
+
+def test_suggest_classes_builds_curator_rows() -> None:
+    class_map = {"alpha-pinene": "monoterpene", "benzene": "aromatic"}
+    unmapped = pd.DataFrame({"Compound": ["alpha pinene", "qqqq"], "count": [4, 1]})
+
+    report = suggest_classes(unmapped, class_map, k=1)
+
+    assert list(report.columns) == [
+        "Compound",
+        "Count",
+        "InferredClass",
+        "Rank",
+        "SuggestedKey",
+        "Score",
+        "SuggestedClass",
+    ]
+    first = report.iloc[0]
+    assert (first["Compound"], first["Count"], first["SuggestedKey"]) == (
+        "alpha pinene",
+        4,
+        "alpha-pinene",
+    )
+    assert first["SuggestedClass"] == "monoterpene"
+    # No close key: one row with empty suggestion columns
+    last = report.iloc[-1]
+    assert last["Compound"] == "qqqq"
+    assert pd.isna(last["SuggestedKey"])
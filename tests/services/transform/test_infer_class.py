@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from treebot.services.aggregate.rollup import ClassHierarchy, build_class_rollups
+from treebot.services.aggregate.summary import build_summary
+from treebot.services.transform.compound_class import derive_compound_and_class
+from treebot.services.transform.infer_class import infer_class, infer_classes
+
+
+def test_infer_class_keywords_beat_suffixes() -> None:
+    assert infer_class("alpha-pinene") == "monoterpene"
+    assert infer_class("octamethylcyclotetrasiloxane") == "siloxane"
+    assert infer_class("benzene, 1-chloro") == "halogen"
+    assert infer_class("hexadecanoic acid") == "organic.acid"
+
+
+def test_infer_class_longest_suffix_of_parent_name() -> None:
+    assert infer_class("1-heptanethiol") == "thiol"
+    assert infer_class("2-heptanol") == "alcohol"
+    assert infer_class("hexanal, 2-ethyl") == "aldehyde"
+    assert infer_class("3-octanone") == "ketone"
+    assert infer_class("tetradecane") == "alkane"
+    assert infer_class("n-methylformamide") is None
+
+
+def test_infer_classes_matches_scalar_rules() -> None:
+    names = pd.Series(
+        [
+            "alpha-pinene",
+            "benzene, 1, 2-dichloro",
+            "hexadecanoic acid",
+            "1-heptanethiol",
+            "hexanal, 2-ethyl",
+            "tetradecane",
+            "n-methylformamide",
+            "",
+            None,
+        ],
+        dtype=object,
+    )
+    expected = [infer_class(n) if isinstance(n, str) and n else None for n in names]
+    assert infer_classes(names).tolist() == expected
+
+
+def test_inferred_class_is_opt_in_in_summary_and_rollup() -> None:
+    df = pd.DataFrame(
+        {
+            "Match1": ["2-Heptanol", "2-Heptanol", "Benzene"],
+            "Species": ["artcal"] * 3,
+            "RetentionTime": [1.0, 1.1, 2.0],
+            "MatchScore": [90, 91, 92],
+        }
+    )
+    out, _, unmapped = derive_compound_and_class(df, {"benzene": "aromatic"})
+    assert out["InferredClass"].tolist() == ["alcohol", "alcohol", None]
+    assert unmapped["InferredClass"].tolist() == ["alcohol"]
+
+    def summary_classes(show: bool) -> dict[str, object]:
+        (sec,) = build_summary(
+            {"Site": out}, 0, None, count_min=1, count_max=None, show_inferred=show
+        )
+        return dict(zip(sec.df["Compound"], sec.df["Compound Class"]))
+
+    def rollup_classes(show: bool) -> list[str]:
+        h = ClassHierarchy(
+            names=("aromatic", "hydrocarbon"),
+            index={"aromatic": 0, "hydrocarbon": 1},
+            ancestors=(0b11, 0b10),
+            depth=(1, 0),
+        )
+        (sec,) = build_class_rollups({"Site": out}, h, 0, show_inferred=show)[0]
+        return sorted(sec.df["Class"].tolist())
+
+    # Default: unmapped compounds stay unclassified in both views
+    assert pd.isna(summary_classes(False)["2-heptanol"])
+    assert rollup_classes(False) == ["(unclassified)", "hydrocarbon"]
+    # Opt-in: both views show the same inferred label
+    assert summary_classes(True) == {"2-heptanol": "alcohol (inferred)", "benzene": "aromatic"}
+    assert rollup_classes(True) == ["alcohol (inferred)", "hydrocarbon"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from treebot.services.transform import norm_dictionary
+from treebot.services.transform.norm_dictionary import NormalizationDictionary
+from treebot.utils import normalize
+from treebot.utils.normalize import normalize_compound_name, normalizer_ruleset_hash
+
+
+def _raw(*values: str) -> pd.Series:
+    return pd.Series(list(values), dtype=object)
+
+
+def test_dictionary_persists_across_runs(tmp_path: Path) -> None:
+    first = NormalizationDictionary(tmp_path)
+    out = first.normalize_unique(_raw("Alpha-Pinene", "Benzen"))
+    assert out.tolist() == ["alpha-pinene", "benzene"]
+    assert (first.hits, first.misses) == (0, 2)
+    assert first.save()
+
+    data = json.loads(first.path.read_text(encoding="utf-8"))
+    assert data["ruleset"] == normalizer_ruleset_hash()
+    assert data["runs"] == 1
+
+    second = NormalizationDictionary(tmp_path)
+    out2 = second.normalize_unique(_raw("Benzen", "Camphenon"))
+    assert out2.tolist() == ["benzene", normalize_compound_name("Camphenon")]
+    assert (second.hits, second.misses) == (1, 1)
+
+
+def test_dictionary_ignores_other_rulesets(tmp_path: Path) -> None:
+    d = NormalizationDictionary(tmp_path)
+    d.path.parent.mkdir(parents=True, exist_ok=True)
+    d.path.write_text(
+        json.dumps(
+            {"version": 1, "ruleset": "stale", "runs": 3, "entries": {"Benzen": ["WRONG", 3]}}
+        ),
+        encoding="utf-8",
+    )
+    assert d.normalize_unique(_raw("Benzen")).tolist() == ["benzene"]
+    assert d.misses == 1
+
+
+def test_dictionary_evicts_idle_entries(tmp_path: Path) -> None:
+    d = NormalizationDictionary(tmp_path, max_idle_runs=2)
+    d.normalize_unique(_raw("Old Name", "Kept Name"))
+    d.save()
+    for _ in range(2):
+        nxt = NormalizationDictionary(tmp_path, max_idle_runs=2)
+        nxt.normalize_unique(_raw("Kept Name"))
+        nxt.save()
+    entries = json.loads(d.path.read_text(encoding="utf-8"))["entries"]
+    assert set(entries) == {"Kept Name"}
+
+
+def test_concurrent_saves_merge(tmp_path: Path) -> None:
+    a = NormalizationDictionary(tmp_path)
+    b = NormalizationDictionary(tmp_path)
+    a.normalize_unique(_raw("From A"))
+    b.normalize_unique(_raw("From B"))
+    assert a.save()
+    assert b.save()
+    entries = json.loads(a.path.read_text(encoding="utf-8"))["entries"]
+    assert set(entries) == {"From A", "From B"}
+    assert not list(tmp_path.glob("*.lock"))
+
+
+def test_live_lock_is_kept_and_dead_owner_lock_broken(tmp_path: Path) -> None:
+    lock = tmp_path / "normalize.lock"
+    lock.write_text(f"{os.getpid()} 0")
+    assert not norm_dictionary._break_stale_lock(lock)
+    assert lock.exists()
+
+    if os.name == "posix":
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        child.wait()
+        lock.write_text(f"{child.pid} 0")
+        assert norm_dictionary._break_stale_lock(lock)
+        assert not lock.exists()
+
+
+def test_stale_lock_recreated_meanwhile_is_not_removed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lock = tmp_path / "normalize.lock"
+    lock.write_text("")
+    os.utime(lock, (0, 0))
+    real_read = norm_dictionary._read_lock
+    reads = iter([real_read(lock), ("123 456", (1, 2))])
+    # A new owner re-creates the lock between the staleness check and the unlink
+    monkeypatch.setattr(norm_dictionary, "_read_lock", lambda _lock: next(reads))
+    assert norm_dictionary._break_stale_lock(lock)
+    assert lock.exists()
+
+
+def test_save_breaks_old_lock(tmp_path: Path) -> None:
+    d = NormalizationDictionary(tmp_path)
+    d.normalize_unique(_raw("Benzen"))
+    lock = d.path.with_suffix(".lock")
+    lock.write_text("")
+    os.utime(lock, (0, 0))
+    assert d.save()
+    assert not lock.exists()
+
+
+def test_ruleset_hash_covers_fixed_stages(monkeypatch: pytest.MonkeyPatch) -> None:
+    base = normalize._compute_ruleset_hash()
+    monkeypatch.setattr(normalize, "_PRE_STAGES", ("ascii_skip", "unicode:NFC", "lower"))
+    assert normalize._compute_ruleset_hash() != base
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.services.transform.compound_class import derive_compound_and_class
+from treebot.services.transform.synonyms import SynonymMap, load_synonym_map
+
+
+def _write(tmp_path: Path, text: str) -> Path:
+    p = tmp_path / "synonyms.yaml"
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def test_closure_merges_groups_transitively(tmp_path: Path) -> None:
+    path = _write(
+        tmp_path,
+        "synonyms:\n"
+        "  isoprene: ['1,3-butadiene, 2-methyl']\n"
+        "  hemiterpene: ['2-methylbuta-1,3-diene', isoprene]\n"
+        "  Alpha-Pinene: [a-pinene]\n",
+    )
+    syn = load_synonym_map(path)
+    assert dict(syn.canonical) == {
+        "1, 3-butadiene, 2-methyl": "isoprene",
+        "hemiterpene": "isoprene",
+        "2-methylbuta-1, 3-diene": "isoprene",
+        "a-pinene": "alpha-pinene",
+    }
+
+
+def test_canonicalization_applied_before_class_lookup() -> None:
+    df = pd.DataFrame(
+        {"Match1": ["1,3-Butadiene, 2-methyl", "isoprene", "2-methylbuta-1,3-diene", "benzene"]}
+    )
+    syn = SynonymMap(
+        {"1, 3-butadiene, 2-methyl": "isoprene", "2-methylbuta-1, 3-diene": "isoprene"}
+    )
+    out, issues, _ = derive_compound_and_class(df, {"isoprene": "terpene"}, synonyms=syn)
+    assert out["Compound"].tolist() == ["isoprene", "isoprene", "isoprene", "benzene"]
+    assert out["Class"].tolist()[:3] == ["terpene"] * 3
+    assert len(issues) == 1
+
+    report = syn.report()
+    assert report.to_dict("records") == [
+        {"Canonical": "isoprene", "MergedName": "1, 3-butadiene, 2-methyl", "Rows": 1},
+        {"Canonical": "isoprene", "MergedName": "2-methylbuta-1, 3-diene", "Rows": 1},
+    ]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+import pytest
 
+from treebot.domain.errors import ErrorCategory, IssueStore
 from treebot.services.transform_service import transform_old_to_new
+from treebot.utils.normalize import normalize_compound_series
 
 
 def test_transform_maps_species_and_class() -> None:
@@ -58,3 +62,91 @@ def test_transform_unmapped_class_records_issue() -> None:
     res = transform_old_to_new(df_old, class_map)
     assert any(i.code == "CLASS_MISSING" for i in res.issues)
     assert not res.unmapped_compounds.empty
+
+
+def test_derive_compound_normalizes_unique_values_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from treebot.services.transform import compound_class
+
+    calls: list[str] = []
+
+    def _counting(values: pd.Series) -> pd.Series:
+        calls.extend(values.tolist())
+        return normalize_compound_series(values)
+
+    monkeypatch.setattr(compound_class, "normalize_compound_batch", _counting)
+    df = pd.DataFrame(
+        {"Match1": ["Alpha-Pinene", " Alpha-Pinene ", None, "", "Benzen", "Alpha-Pinene"] * 50}
+    )
+    class_map = {"alpha-pinene": "monoterpene"}
+
+    out, issues, unmapped = compound_class.derive_compound_and_class(df, class_map)
+
+    assert sorted(calls) == ["Alpha-Pinene", "Benzen"]
+    assert out["Compound"].tolist()[:6] == [
+        "alpha-pinene",
+        "alpha-pinene",
+        pd.NA,
+        pd.NA,
+        "benzene",
+        "alpha-pinene",
+    ]
+    assert out["Class"].tolist()[:2] == ["monoterpene", "monoterpene"]
+    assert out["Class"].isna().sum() == 150
+    assert len(issues) == 150
+    assert unmapped.to_dict("records") == [
+        {"Compound": "benzene", "count": 50, "InferredClass": "aromatic"}
+    ]
+
+
+def test_class_missing_issues_are_columnar_and_capped() -> None:
+    from treebot.services.transform import compound_class
+
+    df = pd.DataFrame({"Match1": ["Benzen", "Alpha-Pinene", None] * 4}, index=range(10, 22))
+    _, issues, _ = compound_class.derive_compound_and_class(df, {"alpha-pinene": "monoterpene"})
+
+    assert len(issues) == 8
+    assert issues.counts() == {"CLASS_MISSING": 8}
+    head = issues.head(3)
+    assert [i.row_index for i in head] == [10, 12, 13]
+    assert all(i.category == ErrorCategory.MAPPING_MISSING for i in head)
+
+    run = IssueStore()
+    run.extend(issues, sheet="Lassen")
+    first = next(iter(run))
+    assert first.details == {"sheet": "Lassen"} and len(run) == 8
+
+
+def test_issue_head_spans_blocks_without_materializing_all_rows() -> None:
+    store = IssueStore()
+    store.add_rows(np.array([4, 7]), ErrorCategory.MAPPING_MISSING, "A", "a")
+    store.add_rows(np.arange(5_000_000), ErrorCategory.MAPPING_MISSING, "B", "b")
+
+    head = store.head(3)
+    assert [(i.code, i.row_index) for i in head] == [("A", 4), ("A", 7), ("B", 0)]
+    assert store.head(0) == [] and len(store) == 5_000_002
+
+
+def test_missing_class_compounds_across_sheets() -> None:
+    from treebot.services.transform.compound_class import missing_class_compounds
+
+    frames = {
+        "A": pd.DataFrame({"Match1": ["Benzene", "Xylol", None, "Xylol"]}),
+        "B": pd.DataFrame({"Match1": ["xylol", "Benzene"]}),
+    }
+    missing = missing_class_compounds(frames, {"benzene": "aromatic"})
+    assert missing.to_dict("records") == [
+        {"Sheet": "A", "Compound": "xylol", "Rows": 2},
+        {"Sheet": "B", "Compound": "xylol", "Rows": 1},
+    ]
+
+
+def test_transform_leaves_input_frame_untouched() -> None:
+    # Steps take shallow copies and assign whole columns; the caller's frame must not change
+    df = pd.DataFrame({"Match1": ["Benzene", None], "Match1.Quality": ["72", None]})
+    before = df.copy()
+    # Correct with the pandas default and with copy-on-write (as the entry points enable it)
+    for cow in (False, True):
+        with pd.option_context("mode.copy_on_write", cow):
+            res = transform_old_to_new(df, {"benzene": "aromatic"})
+        assert res.df.loc[0, "Class"] == "aromatic"
+        pd.testing.assert_frame_equal(df, before)
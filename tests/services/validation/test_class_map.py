@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from treebot.services.validation.class_map import load_class_map, load_class_map_cached
+
+
+def _write_classes(path: Path, body: str) -> None:
+    path.write_text('version: "1"\nmap:\n' + body, encoding="utf-8")
+
+
+def test_load_class_map_normalizes_keys(tmp_path: Path) -> None:
+    p = tmp_path / "classes.yaml"
+    _write_classes(p, '  "Benzen": "aromatic"\n  "β-Pinene": "monoterpene"\n')
+    assert load_class_map(p) == {"benzene": "aromatic", "beta-pinene": "monoterpene"}
+
+
+def test_cached_class_map_hits_until_file_changes(tmp_path: Path) -> None:
+    p = tmp_path / "classes.yaml"
+    cache = tmp_path / ".cache"
+    _write_classes(p, '  "Benzen": "aromatic"\n  "Toluene": "aromatic"\n')
+
+    first, hit1 = load_class_map_cached(p, cache)
+    second, hit2 = load_class_map_cached(p, cache)
+    assert (hit1, hit2) == (False, True)
+    assert second == first == {"benzene": "aromatic", "toluene": "aromatic"}
+    # Shared class labels survive the round trip as one object
+    assert second["benzene"] is second["toluene"]
+
+    _write_classes(p, '  "Benzen": "aromatic"\n  "Limonene": "monoterpene"\n')
+    third, hit3 = load_class_map_cached(p, cache)
+    assert not hit3
+    assert third == {"benzene": "aromatic", "limonene": "monoterpene"}
+
+
+def test_corrupt_cache_falls_back_to_yaml(tmp_path: Path) -> None:
+    p = tmp_path / "classes.yaml"
+    cache = tmp_path / ".cache"
+    _write_classes(p, '  "Benzen": "aromatic"\n')
+    load_class_map_cached(p, cache)
+    for f in cache.glob("classes_*.json"):
+        f.write_bytes(b"\x80not json")
+    mp, hit = load_class_map_cached(p, cache)
+    assert not hit
+    assert mp == {"benzene": "aromatic"}
+    # The rebuilt cache is usable again
+    assert load_class_map_cached(p, cache) == (mp, True)
+
+
+def test_incompatible_cache_payload_is_rebuilt(tmp_path: Path) -> None:
+    p = tmp_path / "classes.yaml"
+    cache = tmp_path / ".cache"
+    _write_classes(p, '  "Benzen": "aromatic"\n')
+    load_class_map_cached(p, cache)
+    (f,) = cache.glob("classes_*.json")
+    payload = json.loads(f.read_text(encoding="utf-8"))
+    payload["map"] = {"benzene": 7}
+    f.write_text(json.dumps(payload), encoding="utf-8")
+    mp, hit = load_class_map_cached(p, cache)
+    assert not hit
+    assert mp == {"benzene": "aromatic"}
+
+
+def test_stale_class_caches_are_pruned(tmp_path: Path) -> None:
+    p = tmp_path / "classes.yaml"
+    cache = tmp_path / ".cache"
+    _write_classes(p, '  "Benzen": "aromatic"\n')
+    load_class_map_cached(p, cache)
+    (cache / "classes_old_old.pickle").write_bytes(b"legacy")
+    _write_classes(p, '  "Toluene": "aromatic"\n')
+    load_class_map_cached(p, cache)
+    assert len(list(cache.glob("classes_*"))) == 1
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from treebot.services.validation.consistency import check_new_schema_consistency
+
+
+def test_new_schema_consistency_counts_and_samples() -> None:
+    df = pd.DataFrame(
+        {
+            "Match1": ["Benzene", " benzene", "Toluene", "Limonene", None],
+            "Compound": ["benzene", "benzene", "xylene", "limonene", None],
+            "Class": ["aromatic", "terpene", "aromatic", "", None],
+            "Match1.Quality": [90, 80, 70, "60", None],
+            "MatchScore": [90, 80, 71, 60.0, None],
+        },
+        index=[2, 3, 4, 5, 6],
+    )
+    class_map = {"benzene": "aromatic", "xylene": "aromatic", "limonene": "terpene"}
+
+    res = check_new_schema_consistency(df, class_map, sheet="New1")
+
+    assert res.counts == {"COMPOUND_MISMATCH": 1, "CLASS_MISMATCH": 2, "MATCHSCORE_MISMATCH": 1}
+    assert len(res) == 4
+    rows = res.samples.set_index("Check")
+    assert rows.loc["COMPOUND_MISMATCH", "Row"] == 4
+    assert rows.loc["COMPOUND_MISMATCH", "Expected"] == "toluene"
+    assert rows.loc["CLASS_MISMATCH", "Row"].tolist() == [3, 5]
+    assert {i.category.value for i in res.issues} == {"SCHEMA_ERROR"}
+
+
+def test_consistent_sheet_has_no_issues() -> None:
+    df = pd.DataFrame(
+        {
+            "Match1": ["Benzene"],
+            "Compound": ["benzene"],
+            "Class": ["aromatic"],
+            "Match1.Quality": [90],
+            "MatchScore": [90],
+        }
+    )
+    res = check_new_schema_consistency(df, {"benzene": "aromatic"})
+    assert not len(res) and res.samples.empty
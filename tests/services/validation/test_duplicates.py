@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from treebot.services.validation.duplicates import find_duplicate_keys
+
+
+def test_duplicate_keys_within_and_across_sheets() -> None:
+    a = pd.DataFrame(
+        {
+            "DataFolderName": ["DF1", "DF1", "DF2", "DF3", "DF4"],
+            "DateRun": ["2025-04-03", "2025-04-03", "2025-04-03", "2025-04-04", None],
+            "CartridgeNum": ["1", "1", "1", "2", "3"],
+        }
+    )
+    b = pd.DataFrame(
+        {
+            "DataFolderName": ["DF9", "DF4"],
+            "DateRun": ["2025-04-04", "2025-05-01"],
+            "CartridgeNum": ["2", "3"],
+        },
+        index=[7, 8],
+    )
+    dups = find_duplicate_keys({"A": a, "B": b})
+
+    # Peaks of one run share a key; only keys claimed by several runs count
+    assert dups.report.to_dict("records") == [
+        {
+            "DateRun": "2025-04-03",
+            "CartridgeNum": "1",
+            "Sheets": "A",
+            "DataFolderNames": "DF1, DF2",
+            "Rows": 3,
+        },
+        {
+            "DateRun": "2025-04-04",
+            "CartridgeNum": "2",
+            "Sheets": "A, B",
+            "DataFolderNames": "DF3, DF9",
+            "Rows": 2,
+        },
+    ]
+    assert len(dups.issues) == 5
+    assert sorted(f"{(i.details or {}).get('sheet')}{i.row_index}" for i in dups.issues) == [
+        "A0",
+        "A1",
+        "A2",
+        "A3",
+        "B7",
+    ]
+
+
+def test_no_duplicates() -> None:
+    df = pd.DataFrame({"DataFolderName": ["DF1"], "DateRun": ["2025-04-03"], "CartridgeNum": ["1"]})
+    dups = find_duplicate_keys({"A": df})
+    assert len(dups) == 0 and len(dups.issues) == 0
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from treebot.services.validation.blanks import BlankMasks, stripped_and_blank
+from treebot.services.validation.keys import clean_identity_columns
+from treebot.services.validation.species_map import fill_species_multi, load_species_map
+
+
+def test_clean_identity_columns_fills_and_trims_in_one_pass() -> None:
+    df = pd.DataFrame(
+        {
+            "DataFolderName": ["", "DF1", None, "  ", "DF2", ""],
+            "CartridgeNum": [None, " 7 ", "", 8, " ", None],
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+    out, counts, examples, values = clean_identity_columns(df, ["DataFolderName", "CartridgeNum"])
+
+    assert out["DataFolderName"].tolist()[1:] == ["DF1", "DF1", "DF1", "DF2", "DF2"]
+    assert pd.isna(out.loc[10, "DataFolderName"])
+    assert out["CartridgeNum"].tolist()[1:] == ["7", "7", "8", "8", "8"]
+    assert pd.isna(out.loc[10, "CartridgeNum"])
+    assert counts == {"DataFolderName": 3, "CartridgeNum": 3}
+    assert examples["CartridgeNum"] == [12, 14, 15]
+    assert values["CartridgeNum"] == ["7", "8", "8"]
+    # Input frame is left untouched
+    assert df.loc[11, "CartridgeNum"] == " 7 "
+
+
+def test_blank_masks_follow_fill_steps(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame({"Site": ["Lassen"], "CartridgeNum": ["7"], "PlantSpecies": ["abicon"]}).to_csv(
+        path, index=False
+    )
+    df = pd.DataFrame({"CartridgeNum": ["", " 7 ", ""], "Species": [None, " ", "kept"]})
+    masks = BlankMasks().compute(df, ["Species"])
+    out, *_ = clean_identity_columns(df, ["CartridgeNum"], masks=masks)
+    assert masks.get(out, "CartridgeNum").tolist() == [True, False, False]  # type: ignore[union-attr]
+
+    lookup, _ = load_species_map(path)
+    filled = fill_species_multi({"Lassen": out}, {"Lassen": "lassen"}, lookup, {"Lassen": masks})
+    out2 = filled["Lassen"][0]
+    assert out2["Species"].tolist()[1:] == ["abicon", "kept"]
+    assert masks.get(out2, "Species").tolist() == [True, False, False]  # type: ignore[union-attr]
+    assert masks.get(out2, "Missing") is None
+
+
+def test_stripped_and_blank_keeps_missing_unstringified() -> None:
+    values = np.array([" a ", None, np.nan, pd.NA, 5, "  ", "x" * 500], dtype=object)
+    text, blank = stripped_and_blank(values)
+    assert text.dtype == object
+    assert text.tolist()[:6] == ["a", None, None, None, "5", ""]
+    assert blank.tolist() == [False, True, True, True, False, True, False]
@@ -11,3 +11,46 @@ def test_parse_dates_to_iso_valid() -> None:
     assert not issues
     assert df2.loc[0, "DateRun"] == "2025-04-03"
     assert df2.loc[1, "DateRun"] == "2020-12-25"
+
+
+def test_parse_dates_to_iso_mixed_cells_and_issues() -> None:
+    import datetime as dt
+
+    df = pd.DataFrame(
+        {
+            "DateRun": [
+                dt.datetime(2025, 4, 3, 10, 30),
+                45750,  # Excel serial for 2025-04-03
+                "2025-04-03",
+                "4/3/2025",
+                "2/30/2025",
+                None,
+                " ",
+                "4/3/2025",
+            ]
+        },
+        dtype=object,
+    )
+    df2, issues = parse_dates_to_iso(df)
+    assert df2["DateRun"].tolist()[:4] == ["2025-04-03"] * 4
+    assert df2.loc[7, "DateRun"] == "2025-04-03"
+    assert df2["DateRun"].iloc[4:7].isna().all()
+    assert issues.counts == {"empty": 2, "unparseable": 1}
+    assert issues.messages(2) == [
+        "Row 4: Unparseable DateRun '2/30/2025' (expected M/D/YYYY, ISO or an Excel date)",
+        "Row 5: DateRun is empty",
+    ]
+
+
+def test_parse_dates_to_iso_keeps_equal_values_of_different_types_apart() -> None:
+    import warnings
+
+    df = pd.DataFrame({"DateRun": [45750, True, 45750.0, "junk", 1, "x"]}, dtype=object)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # no pandas downcasting warnings
+        df2, issues = parse_dates_to_iso(df)
+    assert df2["DateRun"].tolist() == ["2025-04-03", None, "2025-04-03", None, "1899-12-31", None]
+    assert issues.counts == {"empty": 0, "unparseable": 3}
+    assert issues.messages(1) == [
+        "Row 1: Unparseable DateRun 'True' (expected M/D/YYYY, ISO or an Excel date)"
+    ]
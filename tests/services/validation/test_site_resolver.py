@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.services.validate_service import ValidateService
+from treebot.services.validation.site_resolver import (
+    SiteResolver,
+    default_site_resolver,
+    load_site_aliases,
+)
+
+
+def test_exact_prefix_and_fuzzy_resolution() -> None:
+    r = default_site_resolver()
+    assert r.resolve("Emerson Oaks 2024") == "emerson"
+    assert r.resolve("StuntRanch-B") == "stunt"
+    assert r.resolve("Yosemitte") == "yosemite"
+    assert r.resolve("Pt Reyes") is None
+    assert r.resolve("") is None
+
+    report = r.report().set_index("Value")
+    assert report.loc["Emerson Oaks 2024", "Method"] == "exact"
+    assert report.loc["StuntRanch-B", "Method"] == "prefix"
+    assert report.loc["Yosemitte", "Method"] == "fuzzy"
+    assert report.loc["Yosemitte", "Distance"] == 1
+    assert report.loc["Pt Reyes", "Method"] == "unresolved"
+
+
+def test_fuzzy_requires_a_single_closest_site() -> None:
+    r = SiteResolver({"oakhill": "a", "oakmill": "b"})
+    assert r.resolve("oakpill") is None
+    assert r.resolve("oakhil") == "a"
+
+
+def test_decisions_are_memoized() -> None:
+    r = SiteResolver(load_site_aliases())
+    first = r.resolution("Sagehen Creek")
+    assert r.resolution("Sagehen Creek") is first
+    assert len(r.report()) == 1
+
+
+def test_sites_yaml_edits_are_picked_up(tmp_path: Path) -> None:
+    sites = tmp_path / "sites.yaml"
+    sites.write_text("sites:\n  lassen: [Lassen NF]\n", encoding="utf-8")
+    assert SiteResolver(load_site_aliases(sites)).resolve("Pt Reyes") is None
+    sites.write_text("sites:\n  lassen: [Lassen NF]\n  reyes: [Point Reyes, Pt Reyes]\n")
+    os.utime(sites, ns=(0, sites.stat().st_mtime_ns + 1))
+    assert SiteResolver(load_site_aliases(sites)).resolve("Pt Reyes") == "reyes"
+
+
+def test_species_fill_uses_the_service_resolver(tmp_path: Path) -> None:
+    mapping = tmp_path / "mapping.csv"
+    pd.DataFrame({"Site": ["Pt Reyes"], "CartridgeNum": ["1"], "PlantSpecies": ["umbcal"]}).to_csv(
+        mapping, index=False
+    )
+    val = ValidateService(logging.getLogger("test"), SiteResolver({"ptreyes": "reyes"}))
+    lookup, _ = val.load_species_map(mapping)
+    frames = {"PtReyes": pd.DataFrame({"CartridgeNum": ["1"], "Species": [None]})}
+    out = val.apply_species_mapping_all(frames, lookup)
+    assert out["PtReyes"][0]["Species"].tolist() == ["umbcal"]
+    assert set(val.site_resolution_report()["Value"]) == {"Pt Reyes", "PtReyes"}
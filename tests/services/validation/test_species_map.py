@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.services.validation.species_map import (
+    apply_species_mapping,
+    fill_species_multi,
+    load_species_map,
+)
+
+
+def test_load_species_map_lookup_and_conflicts(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {
+            "Reserve": ["Emerson Oaks", "emerson", "Stunt Ranch", "Stunt", "Nowhere", "Lassen", ""],
+            "Cartridge": ["1", " 1 ", "2", "2", "3", "4", "5"],
+            "Plant.Species": ["artcal", "artcal", "salmel", "quelob", "x", None, "y"],
+        }
+    ).to_csv(path, index=False)
+
+    lookup, ambiguous = load_species_map(path)
+
+    assert ambiguous == [("stunt", "2")]
+    assert list(lookup.table.index.names) == ["SiteKey", "CartridgeNum"]
+    assert lookup.table.to_dict() == {("emerson", "1"): "artcal"}
+    assert lookup.dated.empty
+
+
+def test_apply_species_mapping_with_lookup(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {"Site": ["Lassen", "Lassen"], "CartridgeNum": [1, 2], "PlantSpecies": ["abicon", "pinjef"]}
+    ).to_csv(path, index=False)
+    lookup, _ = load_species_map(path)
+
+    df = pd.DataFrame({"CartridgeNum": ["1", "2", "3"], "Species": [None, "kept", None]})
+    out, filled, examples = apply_species_mapping(df, "lassen", lookup)
+
+    assert out["Species"].tolist()[:2] == ["abicon", "kept"]
+    assert pd.isna(out["Species"].iloc[2])
+    assert (filled, examples) == (1, [(0, "1", "abicon")])
+
+
+def test_fill_species_multi_matches_per_sheet(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {
+            "Site": ["Lassen", "Lassen", "Sagehen"],
+            "CartridgeNum": ["1", "2", "1"],
+            "PlantSpecies": ["abicon", "pinjef", "pincon"],
+        }
+    ).to_csv(path, index=False)
+    lookup, _ = load_species_map(path)
+    frames = {
+        "Lassen": pd.DataFrame({"CartridgeNum": ["2", " 1", "", "2"]}, index=[5, 6, 7, 8]),
+        "Sagehen": pd.DataFrame({"CartridgeNum": ["1", "1"], "Species": ["", "kept"]}),
+        "Unknown": pd.DataFrame({"CartridgeNum": ["1"]}),
+    }
+    site_keys = {"Lassen": "lassen", "Sagehen": "sagehen"}
+
+    multi = fill_species_multi(frames, site_keys, lookup)
+
+    for name, key in site_keys.items():
+        single = apply_species_mapping(frames[name], key, lookup)
+        assert multi[name][1:] == single[1:]
+        pd.testing.assert_frame_equal(multi[name][0], single[0])
+    out, filled, examples = multi["Lassen"]
+    assert out["Species"].tolist()[:2] == ["pinjef", "abicon"]
+    assert (filled, examples[0]) == (3, (5, "2", "pinjef"))
+    assert multi["Sagehen"][0]["Species"].tolist() == ["pincon", "kept"]
+    assert multi["Unknown"][1] == 0
+
+
+def test_dated_entries_resolve_reused_cartridges(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {
+            "Site": ["Lassen"] * 4,
+            "CartridgeNum": ["7", "7", "8", "8"],
+            "PlantSpecies": ["abicon", "pinjef", "caldec", "tsumer"],
+            "Date": ["4/1/2024", "5/1/2025", "", ""],
+        }
+    ).to_csv(path, index=False)
+    lookup, ambiguous = load_species_map(path)
+    # Undated conflict on cartridge 8 stays ambiguous; cartridge 7 is resolved by date
+    assert ambiguous == [("lassen", "8")]
+    assert len(lookup.dated) == 2
+
+    df = pd.DataFrame(
+        {
+            "CartridgeNum": ["7", "7", "7", "7", "8"],
+            "DateRun": ["2024-06-01", "2025-05-01", "2024-03-01", None, "2024-06-01"],
+        }
+    )
+    out, filled, _ = apply_species_mapping(df, "lassen", lookup)
+    assert out["Species"].tolist()[:2] == ["abicon", "pinjef"]
+    assert out["Species"].iloc[2:].isna().all()
+    assert filled == 2
+
+
+def test_single_species_dated_entry_fills_any_run_date(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {
+            "Site": ["Lassen"],
+            "CartridgeNum": ["9"],
+            "PlantSpecies": ["abicon"],
+            "Date": ["5/1/2025"],
+        }
+    ).to_csv(path, index=False)
+    lookup, ambiguous = load_species_map(path)
+    assert ambiguous == []
+    assert lookup.dated.empty
+
+    df = pd.DataFrame(
+        {"CartridgeNum": ["9", "9", "9"], "DateRun": ["2025-04-01", None, "2025-06-01"]}
+    )
+    out, filled, _ = apply_species_mapping(df, "lassen", lookup)
+    assert out["Species"].tolist() == ["abicon"] * 3
+    assert filled == 3
+
+
+def test_reused_cartridge_falls_back_to_undated_species(tmp_path: Path) -> None:
+    path = tmp_path / "mapping.csv"
+    pd.DataFrame(
+        {
+            "Site": ["Lassen"] * 2,
+            "CartridgeNum": ["7", "7"],
+            "PlantSpecies": ["abicon", "pinjef"],
+            "Date": ["", "5/1/2025"],
+        }
+    ).to_csv(path, index=False)
+    lookup, ambiguous = load_species_map(path)
+    assert ambiguous == []
+
+    df = pd.DataFrame(
+        {"CartridgeNum": ["7", "7", "7"], "DateRun": ["2025-06-01", "2025-04-01", None]}
+    )
+    out, filled, _ = apply_species_mapping(df, "lassen", lookup)
+    # Dated entry from its date on; the undated species before it and without a DateRun
+    assert out["Species"].tolist() == ["pinjef", "abicon", "abicon"]
+    assert filled == 3
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from treebot.config import Config
+from treebot.ui.config_store import ConfigSnapshotStore
+from treebot.ui.controller import UiController
+
+_SCHEMA = Path("configs/schema.yaml")
+
+
+def _store(tmp_path: Path, classes: str) -> ConfigSnapshotStore:
+    classes_yaml = tmp_path / "classes.yaml"
+    classes_yaml.write_text(classes, encoding="utf-8")
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(_SCHEMA.read_text(encoding="utf-8"), encoding="utf-8")
+    return ConfigSnapshotStore(classes_yaml, schema)
+
+
+def test_snapshot_reused_until_content_changes(tmp_path: Path) -> None:
+    store = _store(tmp_path, "map:\n  Benzene: aromatic\n")
+    first = store.current()
+    assert first.version == 1
+    assert dict(first.class_map) == {"benzene": "aromatic"}
+    assert store.current() is first
+
+    # Touch without changing content: hash check keeps the same snapshot
+    os.utime(store.classes_path, ns=(0, 0))
+    assert store.current() is first
+
+    store.classes_path.write_text("map:\n  Benzene: aromatic\n  Toluene: aromatic\n")
+    second = store.current()
+    assert second.version == 2
+    assert second.schema is first.schema
+    assert "toluene" in second.class_map
+    # In-flight holders of the old snapshot are unaffected
+    assert dict(first.class_map) == {"benzene": "aromatic"}
+
+
+def test_controller_runs_on_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    old = pd.DataFrame(
+        [
+            {
+                "DataFolderName": "DF1",
+                "DateRun": "4/3/2025",
+                "CartridgeNum": "1",
+                "RetentionTime": 1.0,
+                "Match1": "Benzene",
+                "Match1.Quality": 72,
+                "Match2": "x",
+                "Match2.Quality": 10,
+                "Match3": "y",
+                "Match3.Quality": 5,
+                "Comments": "",
+            }
+        ]
+    )
+    results = tmp_path / "results.xlsx"
+    old.to_excel(results, index=False)
+    store = _store(tmp_path, "map:\n  benzene: aromatic\n")
+    snap = store.current()
+    # classes.yaml is edited while the run holds the old snapshot
+    store.classes_path.write_text("map:\n  benzene: alkane\n", encoding="utf-8")
+    monkeypatch.setattr(store, "current", lambda: snap)
+
+    res = UiController(snapshots=store).run(
+        results, store.classes_path, tmp_path / "runs", Config()
+    )
+    assert res.code == 0 and res.run_dir is not None
+    manifest = yaml.safe_load((res.run_dir / "run_manifest.yaml").read_text(encoding="utf-8"))
+    assert manifest["cache"]["class_map"] == "snapshot"
+    assert manifest["inputs"]["classes"]["sha256"] == snap.classes_sha256
+    assert manifest["inputs"]["schema"] == {
+        "path": str(store.schema_path),
+        "sha256": snap.schema_sha256,
+    }
+    out = pd.read_excel(next(res.run_dir.glob("standardized_*.xlsx")))
+    assert out.loc[0, "Class"] == "aromatic"
@@ -52,3 +52,36 @@ map:
     res = ctrl.run(results, classes_yaml, tmp_path / "runs", Config())
     assert res.code == 0
     assert res.run_dir is not None
+
+
+def test_ui_controller_reports_blocking_report_on_strict_abort(tmp_path: Path) -> None:
+    old = pd.DataFrame(
+        [
+            {
+                "DataFolderName": "DF1",
+                "DateRun": "4/3/2025",
+                "CartridgeNum": "1",
+                "RetentionTime": 1.0,
+                "Match1": "Unobtainium",
+                "Match1.Quality": 72,
+                "Match2": "x",
+                "Match2.Quality": 10,
+                "Match3": "y",
+                "Match3.Quality": 5,
+                "Comments": "",
+            }
+        ]
+    )
+    results = tmp_path / "results.xlsx"
+    write_excel(old, results)
+    classes_yaml = tmp_path / "classes.yaml"
+    classes_yaml.write_text('version: "1"\nmap:\n  benzene: aromatic\n', encoding="utf-8")
+
+    ctrl = UiController()
+    # Default config: class coverage does not block
+    res = ctrl.run(results, classes_yaml, tmp_path / "runs", Config())
+    assert (res.code, res.blocking_report) == (0, None)
+
+    res = ctrl.run(results, classes_yaml, tmp_path / "runs", Config(strict_fail=True))
+    assert res.code == 2
+    assert res.blocking_report is not None and res.blocking_report.exists()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from treebot.config import Config
+from treebot.main import run_pipeline
+from treebot.utils.normalize import (
+    NormalizationProfiler,
+    normalize_compound_name,
+    normalize_compound_series,
+    profile_normalization,
+)
+
+
+def _rule(report: dict[str, object], name: str) -> dict[str, object]:
+    rules = report["rules"]
+    assert isinstance(rules, list)
+    return next(r for r in rules if r["rule"] == name)
+
+
+def test_profiler_counts_rule_hits() -> None:
+    prof = NormalizationProfiler()
+    with profile_normalization(prof):
+        assert normalize_compound_name("Benzen") == "benzene"
+        assert normalize_compound_name("Limonene (R)") == "limonene"
+    # Outside the block nothing is recorded
+    normalize_compound_name("Benzen")
+
+    report = prof.report()
+    assert report["values"] == 2
+    assert _rule(report, "token:benzen")["hits"] == 1
+    assert _rule(report, "stereochem")["hits"] == 1
+    assert _rule(report, "embedded:cabox")["hits"] == 0
+    dead = report["dead_rules"]
+    assert isinstance(dead, list) and "embedded:cabox" in dead
+
+
+def test_series_profile_matches_scalar_profile() -> None:
+    names = ["Benzen", "beta-Pinene-3one", "Cabox, ester)-96", "plain"]
+    scalar = NormalizationProfiler()
+    with profile_normalization(scalar):
+        for n in names:
+            normalize_compound_name(n)
+    vector = NormalizationProfiler()
+    with profile_normalization(vector):
+        normalize_compound_series(pd.Series(names, dtype=object))
+
+    def hits(p: NormalizationProfiler) -> list[object]:
+        rules = p.report()["rules"]
+        assert isinstance(rules, list)
+        return [r["hits"] for r in rules]
+
+    assert hits(scalar) == hits(vector)
+
+
+def test_pipeline_writes_profile_report(tmp_path: Path) -> None:
+    old = pd.DataFrame(
+        [
+            {
+                "DataFolderName": "DF1",
+                "DateRun": "4/3/2025",
+                "CartridgeNum": "1",
+                "RetentionTime": 1.0,
+                "Match1": "Benzen",
+                "Match1.Quality": 90,
+                "Match2": "x",
+                "Match2.Quality": 1,
+                "Match3": "y",
+                "Match3.Quality": 1,
+                "Comments": "",
+            }
+        ]
+    )
+    results = tmp_path / "results.xlsx"
+    old.to_excel(results, index=False)
+    classes = tmp_path / "classes.yaml"
+    classes.write_text('map:\n  "benzene": "aromatic"\n', encoding="utf-8")
+
+    code = run_pipeline(results, classes, tmp_path / "runs", Config(profile_normalization=True))
+    assert code == 0
+    reports = list((tmp_path / "runs").glob("*/normalization_profile.json"))
+    assert reports
+    report = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert _rule(report, "token:benzen")["hits"] == 1
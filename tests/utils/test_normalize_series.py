@@ -0,0 +1,106 @@
+"""Property checks: the vectorized normalizer matches the scalar one exactly."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+import treebot.utils.normalize as normalize_mod
+from treebot.utils.normalize import (
+    _EMBEDDED_TYPO_MAP,
+    _GREEK_MAP,
+    _TOKEN_TYPO_MAP,
+    normalize_compound_batch,
+    normalize_compound_name,
+    normalize_compound_series,
+)
+
+_CLASSES_YAML = Path(__file__).resolve().parents[2] / "configs" / "classes.yaml"
+
+
+def _assert_equivalent(values: list[str]) -> None:
+    vectorized = normalize_compound_series(pd.Series(values, dtype=object)).tolist()
+    for raw, got in zip(values, vectorized, strict=True):
+        assert got == normalize_compound_name(raw), f"mismatch for {raw!r}"
+
+
+def test_series_matches_scalar_on_class_map_keys() -> None:
+    data = yaml.safe_load(_CLASSES_YAML.read_text(encoding="utf-8"))
+    keys = [str(k) for k in data["map"]]
+    assert keys
+    _assert_equivalent(keys)
+
+
+def test_series_matches_scalar_on_fuzzed_corpus() -> None:
+    # Fragments chosen to exercise every rule: typo keys, Greek letters,
+    # stereochem tags, separators, trailing run tokens, and NFKC-sensitive text
+    fragments = [
+        *_EMBEDDED_TYPO_MAP,
+        *_TOKEN_TYPO_MAP,
+        *_GREEK_MAP,
+        "(r)",
+        "(cis)",
+        "-3one",
+        "-12methylene",
+        " , ",
+        "  -  ",
+        ")-96",
+        "] 72",
+        "methylene0",
+        "2h-puran",
+        "Ａｌｐｈａ",
+        "ﬁ",
+        "—",
+        "–",
+        "\t",
+        "ABC",
+        "1",
+        "0",
+        "[",
+        "]",
+        "(",
+        ")",
+        ",",
+        ";",
+        ".",
+    ]
+    rng = random.Random(20240101)
+    corpus = ["".join(rng.choices(fragments, k=rng.randint(0, 8))) for _ in range(3000)]
+    _assert_equivalent(corpus)
+
+
+def test_batch_process_pool_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    def no_fallback(values: pd.Series) -> pd.Series:
+        raise AssertionError("process pool did not run")
+
+    # The serial fallback would hide a pool that never ran
+    monkeypatch.setattr(normalize_mod, "_pool_unavailable", no_fallback)
+    data = yaml.safe_load(_CLASSES_YAML.read_text(encoding="utf-8"))
+    values = pd.Series([str(k) for k in data["map"]] * 6 + [None], dtype=object)
+    serial = normalize_compound_series(values)
+    parallel = normalize_compound_batch(values, workers=2, min_parallel=1)
+    assert parallel.index.equals(values.index)
+    assert parallel.iloc[:-1].tolist() == serial.iloc[:-1].tolist()
+    assert pd.isna(parallel.iloc[-1])
+
+
+def test_batch_stays_in_process_when_pool_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    def no_pool(*args: object, **kwargs: object) -> None:
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(normalize_mod, "_process_pool_enabled", True)
+    monkeypatch.setattr(normalize_mod, "ProcessPoolExecutor", no_pool)
+    normalize_mod.disable_process_pool()
+    values = pd.Series(["Benzen", "a-Pinene"] * 10, dtype=object)
+    out = normalize_compound_batch(values, workers=2, min_parallel=1)
+    assert out.tolist() == normalize_compound_series(values).tolist()
+
+
+def test_series_keeps_missing_values() -> None:
+    out = normalize_compound_series(pd.Series(["Beta-Pinene", None], dtype=object))
+    assert out.iloc[0] == "beta-pinene"
+    assert pd.isna(out.iloc[1])